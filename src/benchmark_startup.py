@@ -0,0 +1,74 @@
+# benchmark_startup.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+import json
+import subprocess
+
+# ============================================================================
+# Konfiguration
+# ============================================================================
+
+SCRIPTS = os.getenv("STARTUP_SCRIPTS", "train,compare_scenarios,evaluate_policy").split(",")
+REPEATS = int(os.getenv("STARTUP_REPEATS", "5"))
+HEAVY_MODULES = ["matplotlib", "pandas", "gymnasium", "pygame"]
+
+# "vorher" lädt wie das frühere utils/__init__.py und envs/__init__.py alle
+# Untermodule sofort, "nachher" importiert nur das Skript selbst
+EAGER_IMPORTS = ("import utils, envs; "
+                 "[getattr(utils, name) for name in utils.__all__]; "
+                 "[getattr(envs, name) for name in envs.__all__]; ")
+
+PROBE = """
+import sys, time, json
+sys.path.insert(0, {src!r})
+start = time.perf_counter()
+{preload}import {script}
+duration = time.perf_counter() - start
+print(json.dumps({{"seconds": duration, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+# ============================================================================
+# Messung
+# ============================================================================
+
+# Importzeit eines Skripts in einem frischen Interpreter (Minimum über REPEATS Läufe)
+def measure_import(script, eager=False, repeats=REPEATS):
+    src = os.path.abspath(os.path.dirname(__file__))
+    code = PROBE.format(src=src, script=script, heavy=HEAVY_MODULES,
+                        preload=EAGER_IMPORTS if eager else "")
+    env = dict(os.environ, MPLBACKEND="Agg")
+
+    runs = []
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True,
+                                check=True, env=env).stdout
+        runs.append(json.loads(output.strip().splitlines()[-1]))
+
+    return {"seconds": min(run["seconds"] for run in runs), "loaded": runs[0]["loaded"]}
+
+
+# Tabelle vorher/nachher je Skript
+def print_startup_report(results):
+    print(f"\n{'Skript':<22}{'vorher (ms)':>13}{'nachher (ms)':>14}{'Faktor':>9}  Geladen nachher")
+    print("-" * 80)
+    for script, (before, after) in results.items():
+        factor = before["seconds"] / after["seconds"]
+        loaded = ", ".join(after["loaded"]) or "-"
+        print(f"{script:<22}{before['seconds'] * 1000:>13.0f}{after['seconds'] * 1000:>14.0f}"
+              f"{factor:>8.1f}x  {loaded}")
+
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+if __name__ == "__main__":
+    print(f"Importzeit in frischen Interpretern (Minimum aus {REPEATS} Läufen)")
+    results = {script: (measure_import(script, eager=True), measure_import(script))
+               for script in SCRIPTS}
+    print_startup_report(results)
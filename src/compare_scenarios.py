@@ -6,25 +6,24 @@
 
 import sys
 import os
+import io
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Projektstruktur für Import anpassen
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
-# Drittanbieter
-import numpy as np
-from collections import defaultdict
-
 # Lokale Module
-from config import (EVAL_MAX_STEPS, LOOP_THRESHOLD, REWARDS, EXPORT_PDF, EXPORT_PATH,
-                    EVAL_EPISODES, SEED)
+from config import EXPORT_PDF, EXPORT_PATH, RunConfig, TRAJECTORY_PATH
 
 # Utils
-from utils.common import set_all_seeds, obs_to_state, check_success, setup_export
-from utils.environment import initialize_environment_for_scenario
-from utils.qlearning import load_q_table
-from utils.evaluation import calculate_metrics, check_loop_detection
-from utils.visualization import (create_comparison_table, create_success_rate_comparison,
-                                create_stacked_failure_chart)
+from utils.common import set_all_seeds, setup_export
+from utils.qlearning import load_q_table, load_q_table_metadata
+from utils.evaluation import calculate_metrics
+from utils.evaluation_engine import (evaluate_greedy, evaluate_chunk, merge_records, count_chunks,
+                                     scenario_stream, confidence_intervals)
+from utils.trajectory import TrajectoryRecorder
+
 
 # ============================================================================
 # Szenarien-Definition
@@ -33,27 +32,22 @@ from utils.visualization import (create_comparison_table, create_success_rate_co
 SCENARIOS = {
     "static": {
         "env_mode": "static",
-        "q_table_path": "q_table_static.npy",
         "environment": "grid"
     },
     "random_start": {
         "env_mode": "random_start",
-        "q_table_path": "q_table_random_start.npy",
         "environment": "grid"
     },
     "random_goal": {
         "env_mode": "random_goal",
-        "q_table_path": "q_table_random_goal.npy",
         "environment": "grid"
     },
     "random_obstacles": {
         "env_mode": "random_obstacles",
-        "q_table_path": "q_table_random_obstacles.npy",
         "environment": "grid"
     },
     "container": {
         "env_mode": "container",
-        "q_table_path": "q_table_container.npy",
         "environment": "container"
     }
 }
@@ -63,79 +57,94 @@ SCENARIOS = {
 # Evaluation
 # ============================================================================
 
-# Evaluation eines einzelnen Szenarios
-def evaluate_single_scenario(scenario_name, scenario_config):
-    print(f"Evaluiere Szenario: {scenario_name}")
-
-    env, grid_size = initialize_environment_for_scenario(scenario_config)
-    Q = load_q_table(scenario_config["env_mode"])
-
+# Evaluation eines einzelnen Szenarios (run_config: RunConfig, Standardwerte aus config.py);
+# liefert die Episodendatensätze (utils/evaluation_engine.py) und die Kennzahlen.
+# records: bereits parallel berechnete Datensätze (evaluate_scenarios_parallel)
+def evaluate_single_scenario(scenario_name, scenario_config, run_config=None, exact=None, records=None,
+                             adaptive=None):
+    run_config = run_config if run_config is not None else RunConfig()
+    exact = exact if exact is not None else run_config.exact_evaluation
+    adaptive = adaptive if adaptive is not None else run_config.adaptive_evaluation
+    env_mode = scenario_config["env_mode"]
+    print(f"Evaluiere Szenario{' adaptiv' if adaptive else ' exakt' if exact else ''}: {scenario_name}")
+
+    Q = load_q_table(env_mode)
+    if Q is None:
+        return None, None
+
+    # Form und Trainingsangaben aus dem Kopf der Q-Tabelle
+    metadata = load_q_table_metadata(env_mode)
+    print(f"  Q-Tabelle: {metadata['n_states']}x{metadata['n_actions']}, "
+          f"Episoden: {metadata.get('episodes_run', 'unbekannt')}, Seed: {metadata.get('seed', 'unbekannt')}")
+
+    if records is None:
+        recorder = None
+        if run_config.record_trajectories:
+            recorder = TrajectoryRecorder(os.path.join(TRAJECTORY_PATH, f"compare_{scenario_name}"),
+                                          metadata={"source": "compare_scenarios", "scenario": scenario_name,
+                                                    "env_mode": env_mode, "exact": exact, "adaptive": adaptive})
+        records = evaluate_greedy(Q, env_mode, run_config.with_overrides(env_mode=env_mode), exact,
+                                  stream=scenario_stream(scenario_name), adaptive=adaptive, recorder=recorder)
+        if recorder is not None:
+            recorder.close()
+    metrics = calculate_metrics(records)
+    print(f"  {'Konfigurationen' if exact and not adaptive else 'Episoden'}: {len(records['outcome'])}, "
+          f"Erfolg: {metrics['success_rate']:.1%}, Timeout: {metrics['timeout_rate']:.1%}, "
+          f"Schleifen: {metrics['loop_abort_rate']:.1%}, Hindernisse: {metrics['obstacle_rate']:.1%}")
+
+    # Stichproben mit 95%-Intervallen (Wilson für die Erfolgsrate)
+    if adaptive or not exact:
+        intervals = confidence_intervals(records)
+        print(f"  95%-KI Erfolg: [{intervals['success_ci'][0]:.1%}, {intervals['success_ci'][1]:.1%}], "
+              f"Ø Reward: [{intervals['reward_ci'][0]:.2f}, {intervals['reward_ci'][1]:.2f}]")
+
+    return records, metrics
+
+
+# Ein Episoden-Chunk eines Szenarios im Worker-Prozess; die Q-Tabelle wird
+# speicherabgebildet geladen und über den Page-Cache zwischen Workern geteilt
+def evaluate_scenario_chunk(scenario_name, env_mode, run_config, chunk):
+    with redirect_stdout(io.StringIO()):
+        Q = load_q_table(env_mode)
     if Q is None:
         return None
+    return evaluate_chunk(Q, env_mode, run_config, run_config.eval_episodes, chunk, scenario_stream(scenario_name))
 
-    results = {
-        "success_count": 0,
-        "timeout_count": 0,
-        "loop_abort_count": 0,
-        "obstacle_count": 0,
-        "episode_rewards": [],
-        "steps_to_goal": [],
-        "success_per_episode": []
-    }
-
-    for episode in range(EVAL_EPISODES):
-        obs, _ = env.reset()
-        state = obs_to_state(obs, scenario_config["env_mode"], grid_size)
-        episode_reward = 0
-        steps = 0
-        visited_states = {}
 
-        terminated_by_environment = False
-        while steps < EVAL_MAX_STEPS:
-            action = np.argmax(Q[state])
-            obs, reward, terminated, _, _ = env.step(action)
-            next_state = obs_to_state(obs, scenario_config["env_mode"], grid_size)
-            episode_reward += reward
-            steps += 1
+# Stichprobe aller Szenarien, in Chunks (Szenario, Episodenbereich) auf einen Prozess-Pool verteilt.
+# Jeder Chunk hat einen eigenen Zufallsstrom; die Chunks werden in fester Reihenfolge
+# zusammengeführt, daher ist das Ergebnis unabhängig von der Anzahl der Worker.
+def evaluate_scenarios_parallel(run_config, workers=None):
+    workers = workers if workers is not None else RunConfig.worker_count(run_config.eval_workers)
+    n_chunks = count_chunks(run_config.eval_episodes)
+    parts = {}
 
-            if check_success(reward, scenario_config["env_mode"]):
-                results["success_count"] += 1
-                results["steps_to_goal"].append(steps)
-                break
+    print(f"Parallele Evaluation: {len(SCENARIOS)} Szenarien x {n_chunks} Chunks auf {workers} Worker-Prozessen")
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(evaluate_scenario_chunk, name, scenario_config["env_mode"],
+                               run_config.with_overrides(env_mode=scenario_config["env_mode"]), chunk): (name, chunk)
+                   for name, scenario_config in SCENARIOS.items() for chunk in range(n_chunks)}
+        for future in as_completed(futures):
+            parts[futures[future]] = future.result()
 
-            if check_loop_detection(visited_states, next_state, scenario_config["env_mode"]):
-                results["loop_abort_count"] += 1
-                break
-
-            if terminated:
-                results["obstacle_count"] += 1
-                terminated_by_environment = True
-                break
-
-            state = next_state
-        else:
-            if not terminated_by_environment:
-                results["timeout_count"] += 1
-
-        results["episode_rewards"].append(episode_reward)
-        results["success_per_episode"].append(
-            1 if results["success_count"] > len(results["success_per_episode"]) else 0)
-
-    total = results["success_count"] + results["timeout_count"] + results["loop_abort_count"] + results["obstacle_count"]
-    print(f"  Erfolg: {results['success_count']}, Timeout: {results['timeout_count']}, "
-          f"Schleifen: {results['loop_abort_count']}, Hindernisse: {results['obstacle_count']}, Total: {total}")
-
-    return results
+    all_records = {}
+    for name in SCENARIOS:
+        scenario_parts = [parts[(name, chunk)] for chunk in range(n_chunks)]
+        if all(part is not None for part in scenario_parts):
+            all_records[name] = merge_records(scenario_parts)
+    return all_records
 
 
 # ============================================================================
 # Hauptfunktion
 # ============================================================================
 
-# Vergleich aller Szenarien
-def compare_all_scenarios():
+# Vergleich aller Szenarien (run_config: RunConfig, Standardwerte aus config.py)
+def compare_all_scenarios(run_config=None):
+    run_config = run_config if run_config is not None else RunConfig()
+
     # Seed für Reproduzierbarkeit setzen
-    set_all_seeds()
+    set_all_seeds(run_config.seed)
 
     print("Starte Szenarien-Vergleich...")
     setup_export()
@@ -143,16 +152,28 @@ def compare_all_scenarios():
     all_results = {}
     all_metrics = {}
 
+    # Die exakte Evaluation dauert Millisekunden und die adaptive ist sequenziell;
+    # parallelisiert wird nur die feste Stichprobe (ohne Aufzeichnung, ein Recorder je Szenario)
+    sharded = {}
+    if (run_config.parallel_evaluation and not run_config.exact_evaluation and not run_config.adaptive_evaluation
+            and not run_config.record_trajectories):
+        sharded = evaluate_scenarios_parallel(run_config)
+
     for scenario_name, scenario_config in SCENARIOS.items():
-        results = evaluate_single_scenario(scenario_name, scenario_config)
+        results, metrics = evaluate_single_scenario(scenario_name, scenario_config, run_config,
+                                                    records=sharded.get(scenario_name))
         all_results[scenario_name] = results
-        all_metrics[scenario_name] = calculate_metrics(results, EVAL_EPISODES)
+        all_metrics[scenario_name] = metrics
 
+    # matplotlib und pandas erst hier laden (auch nicht in den Worker-Prozessen)
+    from utils.visualization import (create_comparison_table, create_success_rate_comparison,
+                                    create_stacked_failure_chart)
     create_comparison_table(all_metrics)
     create_success_rate_comparison(all_metrics)
     create_stacked_failure_chart(all_metrics)
 
-    print(f"\n✅ Vergleich abgeschlossen. Parameter aus config.py: EVAL_MAX_STEPS={EVAL_MAX_STEPS}, LOOP_THRESHOLD={LOOP_THRESHOLD}")
+    print(f"\n✅ Vergleich abgeschlossen. Parameter: EVAL_MAX_STEPS={run_config.eval_max_steps}, "
+          f"LOOP_THRESHOLD={run_config.loop_threshold}")
 
     return all_results, all_metrics
 
@@ -162,4 +183,4 @@ def compare_all_scenarios():
 # ============================================================================
 
 if __name__ == "__main__":
-    compare_all_scenarios()
\ No newline at end of file
+    compare_all_scenarios(RunConfig.from_env())
\ No newline at end of file
@@ -1,5 +1,8 @@
 # config.py
 
+import os
+from dataclasses import dataclass, field, fields, replace
+
 # ============================================================================
 # Basis-Parameter
 # ============================================================================
@@ -32,6 +35,12 @@ CONTAINER_OBSTACLES = [(1, 3), (1, 2), (3, 1)]
 ENV_MODE = "static"  # Optionen: static, random_start, random_goal, random_obstacles, container
 SEED = 42  # Random seed für Reproduzierbarkeit
 
+# Abbruchgrenzen der Umgebungen
+GRID_MAX_STEPS = 50  # Timeout der GridEnvironment
+GRID_LOOP_THRESHOLD = 6  # Besuche je Zustand bis Schleifenabbruch (GridEnvironment)
+CONTAINER_MAX_STEPS = 300  # Timeout der ContainerShipEnv
+CONTAINER_LOOP_COUNT = 3  # Besuche je Zustand bis Schleifenabbruch (ContainerShipEnv)
+
 # ============================================================================
 # Rewardsystem
 # ============================================================================
@@ -62,12 +71,78 @@ EPISODES = 500  # Trainings-Episoden
 MAX_STEPS = 100  # Max. Schritte pro Episode
 LOOP_THRESHOLD = 10  # Schleifenwiederholungen für Abbruch (initial: 6)
 
+# ============================================================================
+# Lernverfahren
+# ============================================================================
+
+LEARNER = "qlearning"  # Optionen: qlearning, replay, dyna, prioritized
+BATCH_ENVS = 0  # > 0: vektorisiertes Batch-Training mit BATCH_ENVS parallelen Episoden (nur qlearning)
+WARM_START = False  # Q-Tabelle vor dem Training mit Q* initialisieren
+REPLAY_CAPACITY = 10000  # Kapazität des Replay-Puffers (Übergänge)
+REPLAY_BATCH_SIZE = 32  # Replay-Updates pro echtem Schritt
+PLANNING_STEPS = 10  # Planungsupdates pro echtem Schritt (Dyna-Q, Prioritized Sweeping)
+PRIORITY_THRESHOLD = 1e-4  # Mindest-Bellman-Fehler für die Prioritätswarteschlange
+TARGET_SUCCESS_RATE = 0.8  # Zielerfolgsrate für Sample-Effizienz-Vergleich
+SUCCESS_WINDOW = 50  # Fenster der gleitenden Erfolgsrate
+MULTI_SEED_COUNT = 10  # Anzahl gleichzeitig trainierter Seeds (train_seeds.py)
+Q_DTYPE = "float64"  # Datentyp der Q-Tabelle im Training: float64, float32, float16
+Q_EXPORT_DTYPE = "float64"  # Speicherformat: float64, float32, float16, int16, int8 (quantisiert mit Skala)
+
+# ============================================================================
+# Hyperparameter-Sweep
+# ============================================================================
+
+# Wertebereiche je Parameter (Gitter: alle Kombinationen, Zufallssuche: SWEEP_SAMPLES Ziehungen)
+SWEEP_GRID = {
+    "alpha": [0.05, 0.1, 0.2, 0.5],
+    "gamma": [0.9, 0.95, 0.99],
+    "epsilon": [0.05, 0.1, 0.2],
+    "episodes": [500],
+    "max_steps": [100],
+    "seed": [42, 43, 44]
+}
+SWEEP_SAMPLES = 0  # > 0: Zufallssuche statt vollständigem Gitter
+SWEEP_BATCH_ENVS = 64  # Parallele Episoden je Lauf (train_batched)
+SWEEP_RESULTS_PATH = "exports/sweep_results.csv"
+
+# ============================================================================
+# Konvergenz und Schedules
+# ============================================================================
+
+EARLY_STOPPING = True  # Training bei Konvergenz vorzeitig beenden
+MIN_EPISODES = 100  # Mindestanzahl Episoden vor Early Stopping
+CONVERGENCE_DELTA = 1e-3  # Max. |ΔQ| pro Episode
+CONVERGENCE_POLICY_CHANGES = 0  # Max. Zustände mit geänderter Greedy-Aktion pro Episode
+CONVERGENCE_SUCCESS_RATE = 0.8  # Min. gleitende Erfolgsrate (Fenster: SUCCESS_WINDOW)
+CONVERGENCE_PATIENCE = 50  # Episoden in Folge, in denen alle Kriterien gelten
+
+EPSILON_SCHEDULE = "constant"  # Optionen: constant, linear, exponential
+EPSILON_MIN = 0.01  # Untergrenze der Explorationsrate
+EPSILON_DECAY = 0.995  # Faktor pro Episode (exponential)
+ALPHA_SCHEDULE = "constant"  # Optionen: constant, linear, exponential
+ALPHA_MIN = 0.01  # Untergrenze der Lernrate
+ALPHA_DECAY = 0.999  # Faktor pro Episode (exponential)
+
 # ============================================================================
 # Evaluation Parameter
 # ============================================================================
 
 EVAL_EPISODES = 500  # Anzahl Episoden für Evaluation
 EVAL_MAX_STEPS = 50  # Max. Schritte pro Episode in Evaluation (initial: 100)
+EVAL_CHUNK_EPISODES = 250  # Episoden je Chunk mit eigenem Zufallsstrom (paralleles Sharding)
+
+# Adaptive Evaluation: Batches bis die 95%-Konfidenzintervalle eng genug sind oder das Budget erreicht ist
+ADAPTIVE_EVALUATION = False
+ADAPTIVE_BATCH_EPISODES = 100  # Episoden je Batch
+ADAPTIVE_MAX_EPISODES = 5000  # Episodenbudget je Szenario
+SUCCESS_RATE_PRECISION = 0.02  # Ziel-Halbbreite des Wilson-Intervalls der Erfolgsrate
+REWARD_PRECISION = 0.5  # Ziel-Halbbreite des Intervalls des mittleren Rewards
+EXACT_EVALUATION = True  # Greedy-Policy exakt über alle Startkonfigurationen statt EVAL_EPISODES Stichproben
+
+# Aufzeichnung einzelner Schritte (Episode, Schritt, Zustand, Aktion, Reward, Ergebnis-Code)
+RECORD_TRAJECTORIES = False
+TRAJECTORY_PATH = "exports/trajectories"  # Je Lauf ein Unterordner mit Spaltendateien und Episodenindex
+TRAJECTORY_CHUNK_STEPS = 65536  # Schritte je vorallokiertem Puffer vor dem Schreiben
 
 # ============================================================================
 # Dateipfade
@@ -79,6 +154,8 @@ def get_q_table_path(env_mode):
 
 RESULTS_PATH = "results/"
 PLOTS_PATH = "plots/"
+ARTIFACT_CACHE_PATH = "cache/"  # Inhaltsadressierter Cache trainierter Läufe
+USE_ARTIFACT_CACHE = True  # Unveränderte Läufe aus dem Cache laden statt neu zu trainieren
 
 # ============================================================================
 # Visualisierung Parameter
@@ -93,6 +170,12 @@ FRAME_DELAY = 0.4  # Verzögerung zwischen Frames (Sekunden)
 ARROW_SCALE = 0.3  # Größe der Policy-Pfeile
 SHOW_GRID_LINES = True  # Grid-Linien in Visualisierungen
 
+VIDEO_FORMAT = "gif"  # gif oder mp4 (mp4 benötigt imageio-ffmpeg)
+VIDEO_FPS = 2.5  # Bilder pro Sekunde in exportierten Videos (entspricht FRAME_DELAY)
+VIDEO_EPISODES = 10  # Aufgezeichnete Episoden je Szenario
+VIDEO_PATH = "exports/videos"  # Zielordner der Videos
+VIDEO_SCENARIOS = "static,random_start,random_goal,random_obstacles,container"  # Kommagetrennt
+
 FIGURE_SIZE = (10, 6)  # Plot-Größe
 DPI_SETTING = 100  # Auflösung für gespeicherte Plots
 
@@ -103,9 +186,163 @@ DPI_SETTING = 100  # Auflösung für gespeicherte Plots
 EXPORT_PDF = True  # PDF-Export für Visualisierungen
 EXPORT_PATH = "exports/"  # Pfad für exportierte Dateien
 
+# ============================================================================
+# Ausführung der Skripte
+# ============================================================================
+
+SHOW_VISUALIZATIONS = True  # Trainingsplots erzeugen (train.py)
+PARALLEL_TRAINING = True  # Szenarien in eigenen Prozessen trainieren (train_all_scenarios.py)
+PARALLEL_EVALUATION = True  # Stichprobe auf Worker-Prozesse verteilen (compare_scenarios.py)
+WORKERS = 0  # Worker-Prozesse für Evaluation, Sweep und Videoexport (0: Anzahl der CPU-Kerne)
+SOLVE_ALL = True  # Q* für alle Szenarien berechnen, sonst nur ENV_MODE (solve_optimal.py)
+SOLVER_METHOD = "value_iteration"  # oder policy_iteration
+
 # ============================================================================
 # Debug Parameter
 # ============================================================================
 
 DEBUG_MODE = False  # Debug-Ausgaben aktivieren
-VERBOSE_TRAINING = True  # Detaillierte Training-Ausgaben
\ No newline at end of file
+VERBOSE_TRAINING = True  # Detaillierte Training-Ausgaben
+
+# ============================================================================
+# Laufkonfiguration
+# ============================================================================
+
+# Unveränderliche Rewards (hashbar, daher als Cache-Schlüssel kompilierter Modelle nutzbar)
+@dataclass(frozen=True)
+class Rewards:
+    step: float = REWARDS["step"]
+    goal: float = REWARDS["goal"]
+    obstacle: float = REWARDS["obstacle"]
+    loop_abort: float = REWARDS["loop_abort"]
+    timeout: float = REWARDS["timeout"]
+    pickup: float = REWARDS["pickup"]
+    dropoff: float = REWARDS["dropoff"]
+
+    # Zugriff wie auf REWARDS (rewards["goal"])
+    def __getitem__(self, name):
+        return getattr(self, name)
+
+
+# Unveränderliche Konfiguration eines Laufs; Standardwerte aus den Konstanten oben.
+# Umgebungen, Training, Evaluation und Reporting erhalten sie explizit, sodass
+# beliebig viele Konfigurationen in einem Prozess nebeneinander laufen können.
+@dataclass(frozen=True)
+class RunConfig:
+    env_mode: str = ENV_MODE
+    seed: int = SEED
+    grid_size: int = GRID_SIZE
+    rewards: Rewards = field(default_factory=Rewards)
+
+    alpha: float = ALPHA
+    gamma: float = GAMMA
+    epsilon: float = EPSILON
+    episodes: int = EPISODES
+    max_steps: int = MAX_STEPS
+    loop_threshold: int = LOOP_THRESHOLD
+
+    grid_max_steps: int = GRID_MAX_STEPS
+    grid_loop_threshold: int = GRID_LOOP_THRESHOLD
+    container_max_steps: int = CONTAINER_MAX_STEPS
+    container_loop_count: int = CONTAINER_LOOP_COUNT
+
+    learner: str = LEARNER
+    batch_envs: int = BATCH_ENVS
+    warm_start: bool = WARM_START
+    early_stopping: bool = EARLY_STOPPING
+    q_dtype: str = Q_DTYPE
+    q_export_dtype: str = Q_EXPORT_DTYPE
+    epsilon_schedule: str = EPSILON_SCHEDULE
+    epsilon_min: float = EPSILON_MIN
+    epsilon_decay: float = EPSILON_DECAY
+    alpha_schedule: str = ALPHA_SCHEDULE
+    alpha_min: float = ALPHA_MIN
+    alpha_decay: float = ALPHA_DECAY
+
+    eval_episodes: int = EVAL_EPISODES
+    eval_max_steps: int = EVAL_MAX_STEPS
+    exact_evaluation: bool = EXACT_EVALUATION
+    adaptive_evaluation: bool = ADAPTIVE_EVALUATION
+    record_trajectories: bool = RECORD_TRAJECTORIES
+
+    # Ausführung der Skripte (ohne Einfluss auf die Ergebnisse, siehe RUNTIME_FIELDS)
+    show_visualizations: bool = SHOW_VISUALIZATIONS
+    artifact_cache: bool = USE_ARTIFACT_CACHE
+    parallel_training: bool = PARALLEL_TRAINING
+    parallel_evaluation: bool = PARALLEL_EVALUATION
+    eval_workers: int = WORKERS
+    n_seeds: int = MULTI_SEED_COUNT
+    sweep_scenarios: str = ""  # kommagetrennt; leer: env_mode
+    sweep_samples: int = SWEEP_SAMPLES
+    sweep_workers: int = WORKERS
+    sweep_results_path: str = SWEEP_RESULTS_PATH
+    solve_all: bool = SOLVE_ALL
+    solver_method: str = SOLVER_METHOD
+    video_scenarios: str = VIDEO_SCENARIOS
+    video_episodes: int = VIDEO_EPISODES
+    video_format: str = VIDEO_FORMAT
+    video_workers: int = WORKERS
+
+    # Kopie mit geänderten Feldern (Rewards auch als dict möglich)
+    def with_overrides(self, **changes):
+        if isinstance(changes.get("rewards"), dict):
+            changes["rewards"] = replace(self.rewards, **changes["rewards"])
+        return replace(self, **changes)
+
+    # Anzahl Worker-Prozesse (workers aus eval_workers bzw. sweep_workers, 0: CPU-Kerne)
+    @staticmethod
+    def worker_count(workers):
+        return workers if workers > 0 else os.cpu_count() or 1
+
+    # Konfiguration der Kommandozeilen-Skripte: Standardwerte, überschrieben durch die
+    # Umgebungsvariablen aus ENV_OVERRIDES und danach durch changes. Wird nur im
+    # __main__-Block der Skripte aufgerufen, nie beim Import eines Moduls.
+    @classmethod
+    def from_env(cls, **changes):
+        types = {run_field.name: run_field.type for run_field in fields(cls)}
+        values = {}
+        for name, variable in ENV_OVERRIDES.items():
+            raw = os.environ.get(variable)
+            if raw is not None:
+                values[name] = raw.lower() == "true" if types[name] is bool else types[name](raw)
+        return cls(**values).with_overrides(**changes)
+
+
+# Über Umgebungsvariablen setzbare Felder (Feld -> Variable), z. B. LEARNER=dyna oder EXACT_EVALUATION=false
+ENV_OVERRIDES = {
+    "env_mode": "ENV_MODE",
+    "learner": "LEARNER",
+    "batch_envs": "BATCH_ENVS",
+    "warm_start": "WARM_START",
+    "early_stopping": "EARLY_STOPPING",
+    "q_dtype": "Q_DTYPE",
+    "q_export_dtype": "Q_EXPORT_DTYPE",
+    "epsilon_schedule": "EPSILON_SCHEDULE",
+    "alpha_schedule": "ALPHA_SCHEDULE",
+    "exact_evaluation": "EXACT_EVALUATION",
+    "adaptive_evaluation": "ADAPTIVE_EVALUATION",
+    "record_trajectories": "RECORD_TRAJECTORIES",
+    "show_visualizations": "SHOW_VISUALIZATIONS",
+    "artifact_cache": "ARTIFACT_CACHE",
+    "parallel_training": "PARALLEL_TRAINING",
+    "parallel_evaluation": "PARALLEL_EVALUATION",
+    "eval_workers": "EVAL_WORKERS",
+    "n_seeds": "N_SEEDS",
+    "sweep_scenarios": "SWEEP_SCENARIOS",
+    "sweep_samples": "SWEEP_SAMPLES",
+    "sweep_workers": "SWEEP_WORKERS",
+    "sweep_results_path": "SWEEP_RESULTS_PATH",
+    "solve_all": "SOLVE_ALL",
+    "solver_method": "SOLVER_METHOD",
+    "video_scenarios": "VIDEO_SCENARIOS",
+    "video_episodes": "VIDEO_EPISODES",
+    "video_format": "VIDEO_FORMAT",
+    "video_workers": "VIDEO_WORKERS"
+}
+
+# Felder, die nur Ausführung und Ausgabe steuern (Plots, Prozesse, Aufzeichnung, Evaluation,
+# Speicherformat); sie gehen nicht in den Schlüssel des Artefakt-Caches ein
+RUNTIME_FIELDS = ("q_export_dtype", "exact_evaluation", "adaptive_evaluation", "record_trajectories", "show_visualizations",
+                  "artifact_cache", "parallel_training", "parallel_evaluation", "eval_workers", "n_seeds",
+                  "sweep_scenarios", "sweep_samples", "sweep_workers", "sweep_results_path", "solve_all",
+                  "solver_method", "video_scenarios", "video_episodes", "video_format", "video_workers")
\ No newline at end of file
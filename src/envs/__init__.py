@@ -1,6 +1,28 @@
 # envs/__init__.py
 
-from .grid_environment import GridEnvironment
-from .container_environment import ContainerShipEnv
+# Umgebungsklassen werden erst beim ersten Attributzugriff geladen (PEP 562),
+# damit z. B. envs.outcomes oder envs.tabular_model ohne gymnasium importierbar sind.
 
-__all__ = ['GridEnvironment', 'ContainerShipEnv']
\ No newline at end of file
+import importlib
+
+_MODULE_OF = {
+    'GridEnvironment': 'grid_environment',
+    'ContainerShipEnv': 'container_environment',
+    'VectorGridEnvironment': 'vector_grid_environment',
+    'VectorContainerShipEnv': 'vector_container_environment'
+}
+
+__all__ = list(_MODULE_OF)
+
+
+# Untermodul beim ersten Zugriff importieren und die Klasse im Paket zwischenspeichern
+def __getattr__(name):
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULE_OF[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -16,8 +16,11 @@ from gymnasium import spaces
 import numpy as np
 
 # Lokale Module
-from config import (REWARDS, GRID_SIZE, N_ACTIONS, CONTAINER_START_POS,
-                    CONTAINER_OBSTACLES, DEBUG_MODE)
+from config import (N_ACTIONS, CONTAINER_START_POS, CONTAINER_OBSTACLES, DEBUG_MODE,
+                    RunConfig)
+from envs.tabular_model import compile_container_model
+from envs.outcomes import OUTCOME_CODES
+from envs.rendering import layout_codes, compose_frames
 
 
 # ============================================================================
@@ -25,19 +28,23 @@ from config import (REWARDS, GRID_SIZE, N_ACTIONS, CONTAINER_START_POS,
 # ============================================================================
 
 class ContainerShipEnv(gym.Env):
-    metadata = {"render_modes": ["human"]}
+    metadata = {"render_modes": ["rgb_array"], "render_fps": 4}
 
-    def __init__(self):
+    # config: RunConfig (Standard aus config.py)
+    def __init__(self, config=None, render_mode=None):
         super(ContainerShipEnv, self).__init__()
-        self.grid_size = GRID_SIZE  # Aus config statt hardcoded
+        self.config = config if config is not None else RunConfig()
+        self.rewards = self.config.rewards
+        self.grid_size = self.config.grid_size
         self.start_pos = CONTAINER_START_POS  # Aus config
         self.obstacles = CONTAINER_OBSTACLES  # Aus config
-        self.max_steps = 300
+        self.max_steps = self.config.container_max_steps
 
         self.observation_space = spaces.MultiDiscrete([self.grid_size, self.grid_size, 2])
         self.action_space = spaces.Discrete(N_ACTIONS)  # Aus config statt hardcoded
 
         self.np_random = None
+        self.render_mode = render_mode
         self._initialize_environment()
 
     # Initialisierung der Umgebungsparameter
@@ -46,7 +53,7 @@ class ContainerShipEnv(gym.Env):
         self.container_loaded = False
         self.steps = 0
         self.visited_states = {}
-        self.max_loop_count = 3
+        self.max_loop_count = self.config.container_loop_count
         self.successful_dropoffs = 0
 
     # ============================================================================
@@ -100,17 +107,17 @@ class ContainerShipEnv(gym.Env):
     # Berechnung des Rewards basierend auf Terminierungsgrund
     def calculate_reward(self, terminated_reason=None):
         if terminated_reason == "dropoff":
-            return REWARDS["dropoff"]
+            return self.rewards["dropoff"]
         elif terminated_reason == "pickup":
-            return REWARDS["pickup"]
+            return self.rewards["pickup"]
         elif terminated_reason == "obstacle":
-            return REWARDS["obstacle"]
+            return self.rewards["obstacle"]
         elif terminated_reason == "loop":
-            return REWARDS["loop_abort"]
+            return self.rewards["loop_abort"]
         elif terminated_reason == "timeout":
-            return REWARDS["timeout"]
+            return self.rewards["timeout"]
         else:
-            return REWARDS["step"]
+            return self.rewards["step"]
 
     # Überprüfung der Terminierungsbedingungen
     def check_termination_and_rewards(self, next_pos, state_key):
@@ -143,6 +150,12 @@ class ContainerShipEnv(gym.Env):
         else:
             self.visited_states[state_key] = 1
 
+    # Kompiliertes Tabellenmodell des aktuellen Pickup-/Dropoff-Layouts (gecacht je Layout)
+    def compile_model(self):
+        obstacles = tuple(sorted(self.pos_to_state(pos) for pos in self.obstacles))
+        return compile_container_model(self.pos_to_state(self.pickup_pos), self.pos_to_state(self.dropoff_pos),
+                                       obstacles, self.grid_size, self.rewards)
+
     # ============================================================================
     # Hauptfunktionen
     # ============================================================================
@@ -174,7 +187,26 @@ class ContainerShipEnv(gym.Env):
         terminated, reason = self.check_termination_and_rewards(next_pos, state_key)
         reward = self.calculate_reward(reason)
 
-        return obs, reward, terminated, False, {}
+        return obs, reward, terminated, False, {"outcome": OUTCOME_CODES[reason]}
+
+    # ============================================================================
+    # Rendering
+    # ============================================================================
+
+    # Kachel-Codes (1, cells) des aktuellen Zustands (Grundlage für render und render_batch)
+    def render_codes(self):
+        obstacles = [self.pos_to_state(pos) for pos in self.obstacles]
+        return layout_codes(self.grid_size * self.grid_size, [self.pos_to_state(self.agent_pos)],
+                            [self.pos_to_state(self.start_pos)], [obstacles],
+                            pickup_cells=[self.pos_to_state(self.pickup_pos)],
+                            dropoff_cells=[self.pos_to_state(self.dropoff_pos)], loaded=[self.container_loaded])
+
+    # RGB-Frame (H, W, 3) im Modus "rgb_array"
+    def render(self):
+        if self.render_mode != "rgb_array":
+            gym.logger.warn(f"render_mode={self.render_mode!r} wird nicht unterstützt, nur 'rgb_array'")
+            return None
+        return compose_frames(self.render_codes(), self.grid_size)[0]
 
     # ============================================================================
     # Zusätzliche Methoden für Kompatibilität
@@ -16,8 +16,11 @@ from gymnasium import spaces
 import numpy as np
 
 # Lokale Module
-from config import (REWARDS, GRID_SIZE, N_ACTIONS, DEFAULT_START_POS,
-                    DEFAULT_GOAL_POS, DEFAULT_OBSTACLES, DEBUG_MODE)
+from config import (N_ACTIONS, DEFAULT_START_POS, DEFAULT_GOAL_POS, DEFAULT_OBSTACLES,
+                    DEBUG_MODE, RunConfig)
+from envs.tabular_model import compile_grid_model
+from envs.outcomes import OUTCOME_CODES
+from envs.rendering import layout_codes, compose_frames
 
 
 # ============================================================================
@@ -25,18 +28,22 @@ from config import (REWARDS, GRID_SIZE, N_ACTIONS, DEFAULT_START_POS,
 # ============================================================================
 
 class GridEnvironment(gym.Env):
-    metadata = {"render_modes": ["human"]}
+    metadata = {"render_modes": ["rgb_array"], "render_fps": 4}
 
-    def __init__(self, mode="static"):
+    # config: RunConfig (Standard aus config.py); mode überschreibt config.env_mode
+    def __init__(self, mode=None, config=None, render_mode=None):
         super(GridEnvironment, self).__init__()
-        self.mode = mode
-        self.grid_size = GRID_SIZE  # Aus config statt hardcoded
+        self.config = config if config is not None else RunConfig()
+        self.mode = mode if mode is not None else self.config.env_mode
+        self.rewards = self.config.rewards
+        self.grid_size = self.config.grid_size
         self.observation_space = spaces.Discrete(self.grid_size * self.grid_size)
         self.action_space = spaces.Discrete(N_ACTIONS)  # Aus config statt hardcoded
 
-        self.max_steps = 50
-        self.loop_threshold = 6
+        self.max_steps = self.config.grid_max_steps
+        self.loop_threshold = self.config.grid_loop_threshold
         self.np_random = None
+        self.render_mode = render_mode
 
         self._initialize_environment()
 
@@ -136,16 +143,16 @@ class GridEnvironment(gym.Env):
     # Berechnung des Rewards basierend auf Terminierungsgrund
     def calculate_reward(self, next_pos, terminated_reason=None):
         if terminated_reason == "goal":
-            return REWARDS["goal"]
+            return self.rewards["goal"]
 
-        reward = REWARDS["step"]
+        reward = self.rewards["step"]
 
         if terminated_reason == "obstacle":
-            reward += REWARDS["obstacle"]
+            reward += self.rewards["obstacle"]
         elif terminated_reason == "loop":
-            reward += REWARDS["loop_abort"]
+            reward += self.rewards["loop_abort"]
         elif terminated_reason == "timeout":
-            reward += REWARDS["timeout"]
+            reward += self.rewards["timeout"]
 
         return reward
 
@@ -176,6 +183,11 @@ class GridEnvironment(gym.Env):
         else:
             self.visited_states[next_state] = 1
 
+    # Kompiliertes Tabellenmodell des aktuellen Layouts (gecacht je Layout)
+    def compile_model(self):
+        obstacles = tuple(sorted(self.pos_to_state(pos) for pos in self.obstacles))
+        return compile_grid_model(self.pos_to_state(self.goal_pos), obstacles, self.grid_size, self.rewards)
+
     # ============================================================================
     # Hauptfunktionen
     # ============================================================================
@@ -213,7 +225,24 @@ class GridEnvironment(gym.Env):
         terminated, reason = self.check_termination(next_pos, next_state)
         reward = self.calculate_reward(next_pos, reason)
 
-        return next_state, reward, terminated, False, {}
+        return next_state, reward, terminated, False, {"outcome": OUTCOME_CODES[reason]}
+
+    # ============================================================================
+    # Rendering
+    # ============================================================================
+
+    # Kachel-Codes (1, cells) des aktuellen Zustands (Grundlage für render und render_batch)
+    def render_codes(self):
+        obstacles = [self.pos_to_state(pos) for pos in self.obstacles]
+        return layout_codes(self.grid_size * self.grid_size, [self.state], [self.pos_to_state(self.start_pos)],
+                            [obstacles], goal_cells=[self.pos_to_state(self.goal_pos)])
+
+    # RGB-Frame (H, W, 3) im Modus "rgb_array"
+    def render(self):
+        if self.render_mode != "rgb_array":
+            gym.logger.warn(f"render_mode={self.render_mode!r} wird nicht unterstützt, nur 'rgb_array'")
+            return None
+        return compose_frames(self.render_codes(), self.grid_size)[0]
 
     # ============================================================================
     # Zusätzliche Methoden für Kompatibilität
@@ -0,0 +1,32 @@
+# outcomes.py
+
+# ============================================================================
+# Terminierungscodes
+# ============================================================================
+
+# Ganzzahlige Codes für Episodenenden (vektorisierte Umgebungen, Evaluation)
+OUTCOME_NONE = 0
+OUTCOME_GOAL = 1  # Ziel erreicht bzw. Container abgeliefert
+OUTCOME_OBSTACLE = 2
+OUTCOME_LOOP = 3
+OUTCOME_TIMEOUT = 4
+OUTCOME_PICKUP = 5  # Container aufgenommen (nicht terminierend)
+
+# Bezeichnungen der Episodenenden in Berichten und Plots
+OUTCOME_LABELS = {
+    OUTCOME_GOAL: "Ziel erreicht",
+    OUTCOME_OBSTACLE: "Hindernis-Kollision",
+    OUTCOME_LOOP: "Schleifenabbruch",
+    OUTCOME_TIMEOUT: "Timeout"
+}
+
+# Terminierungsgründe der skalaren Umgebungen (check_termination*) als Codes
+OUTCOME_CODES = {
+    None: OUTCOME_NONE,
+    "goal": OUTCOME_GOAL,
+    "dropoff": OUTCOME_GOAL,
+    "obstacle": OUTCOME_OBSTACLE,
+    "loop": OUTCOME_LOOP,
+    "timeout": OUTCOME_TIMEOUT,
+    "pickup": OUTCOME_PICKUP
+}
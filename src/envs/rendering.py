@@ -0,0 +1,113 @@
+# rendering.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+from functools import lru_cache
+
+# Projektstruktur für Imports anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Drittanbieter
+import numpy as np
+
+# Lokale Module
+from config import CELL_SIZE
+
+# Kachel-Codes je Zelle; Frames entstehen durch Indexierung der Kacheltabelle
+TILE_EMPTY = 0
+TILE_START = 1
+TILE_GOAL = 2
+TILE_OBSTACLE = 3
+TILE_PICKUP = 4
+TILE_DROPOFF = 5
+TILE_AGENT = 6
+TILE_AGENT_LOADED = 7
+
+COLORS = {
+    'background': (224, 247, 255),
+    'grid_line': (200, 200, 200),
+    'start': (70, 130, 180),
+    'goal': (46, 139, 87),
+    'obstacle': (105, 105, 105),
+    'pickup': (160, 82, 45),
+    'dropoff': (218, 165, 32),
+    'agent': (25, 25, 112)
+}
+
+
+# ============================================================================
+# Kacheln
+# ============================================================================
+
+# Kacheltabelle (Codes, cell_size, cell_size, 3) als uint8, einmal je Zellgröße
+@lru_cache(maxsize=None)
+def build_tiles(cell_size=CELL_SIZE):
+    yy, xx = np.mgrid[:cell_size, :cell_size] + 0.5
+    radius = np.hypot(yy - cell_size / 2, xx - cell_size / 2) / cell_size
+    square = np.maximum(np.abs(yy - cell_size / 2), np.abs(xx - cell_size / 2)) / cell_size
+
+    tiles = np.empty((TILE_AGENT_LOADED + 1, cell_size, cell_size, 3), dtype=np.uint8)
+    tiles[:] = COLORS['background']
+    tiles[TILE_START, (radius < 0.3) & (radius > 0.2)] = COLORS['start']
+    tiles[TILE_GOAL, square < 0.3] = COLORS['goal']
+    tiles[TILE_OBSTACLE, radius < 0.35] = COLORS['obstacle']
+    tiles[TILE_PICKUP, square < 0.25] = COLORS['pickup']
+    tiles[TILE_DROPOFF, square < 0.3] = COLORS['dropoff']
+    tiles[TILE_AGENT, radius < 0.3] = COLORS['agent']
+    tiles[TILE_AGENT_LOADED, radius < 0.3] = COLORS['agent']
+    tiles[TILE_AGENT_LOADED, square < 0.12] = COLORS['pickup']
+
+    # Gitterlinie am Zellrand
+    for edge in (0, -1):
+        tiles[:, edge, :] = COLORS['grid_line']
+        tiles[:, :, edge] = COLORS['grid_line']
+
+    tiles.setflags(write=False)
+    return tiles
+
+
+# ============================================================================
+# Frames
+# ============================================================================
+
+# Kachel-Codes (N, cells) für N Layouts; Zellen als Arrays der Form (N,) oder (N, k).
+# Bei Überschneidung gilt Agent > Start > Pickup > Dropoff > Ziel > Hindernis.
+def layout_codes(n_cells, agent_cells, start_cells, obstacle_cells, goal_cells=None,
+                 pickup_cells=None, dropoff_cells=None, loaded=None):
+    agent_cells = np.asarray(agent_cells, dtype=np.int64)
+    n = len(agent_cells)
+    rows = np.arange(n)
+    codes = np.full((n, n_cells), TILE_EMPTY, dtype=np.int8)
+
+    layers = [(obstacle_cells, TILE_OBSTACLE), (goal_cells, TILE_GOAL),
+              (dropoff_cells, TILE_DROPOFF), (pickup_cells, TILE_PICKUP), (start_cells, TILE_START)]
+    for cells, code in layers:
+        if cells is not None:
+            codes[rows[:, None], np.asarray(cells, dtype=np.int64).reshape(n, -1)] = code
+
+    # Beladenes Schiff trägt den Container; die Pickup-Zelle wird dann leer dargestellt
+    loaded = np.zeros(n, dtype=bool) if loaded is None else np.asarray(loaded, dtype=bool)
+    if pickup_cells is not None:
+        pickups = np.asarray(pickup_cells, dtype=np.int64).reshape(n)
+        emptied = loaded & (codes[rows, pickups] == TILE_PICKUP)
+        codes[rows[emptied], pickups[emptied]] = TILE_EMPTY
+
+    codes[rows, agent_cells] = np.where(loaded, TILE_AGENT_LOADED, TILE_AGENT)
+    return codes
+
+
+# RGB-Frames (N, H, W, 3) aus Kachel-Codes (N, cells) per Array-Indexierung
+def compose_frames(codes, grid_size, cell_size=CELL_SIZE):
+    n = len(codes)
+    tiles = build_tiles(cell_size)[codes].reshape(n, grid_size, grid_size, cell_size, cell_size, 3)
+    return tiles.transpose(0, 1, 3, 2, 4, 5).reshape(n, grid_size * cell_size, grid_size * cell_size, 3)
+
+
+# RGB-Frames (N, H, W, 3) für eine Liste skalarer Umgebungen in einem Aufruf
+def render_batch(envs, cell_size=CELL_SIZE):
+    codes = np.concatenate([env.render_codes() for env in envs])
+    return compose_frames(codes, envs[0].grid_size, cell_size)
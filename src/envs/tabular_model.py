@@ -0,0 +1,218 @@
+# tabular_model.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+from collections import namedtuple
+from functools import lru_cache
+from itertools import combinations
+
+# Projektstruktur für Imports anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Drittanbieter
+import numpy as np
+
+# Lokale Module
+from config import (GRID_SIZE, N_ACTIONS, DEFAULT_START_POS, DEFAULT_GOAL_POS,
+                    DEFAULT_OBSTACLES, CONTAINER_START_POS, CONTAINER_OBSTACLES, Rewards)
+from envs.outcomes import (OUTCOME_NONE, OUTCOME_GOAL, OUTCOME_OBSTACLE,
+                           OUTCOME_PICKUP)
+
+# Kompiliertes Modell eines Layouts: dichte Arrays der Form (n_states, n_actions).
+# Schleifen- und Timeout-Abbruch hängen vom Episodenverlauf ab und sind nicht enthalten.
+TabularModel = namedtuple("TabularModel", ["next_state", "reward", "terminal_code"])
+
+
+# ============================================================================
+# Kompilierung
+# ============================================================================
+
+# Tabelle next_cell[cell, action] mit Randbegrenzung (0=UP, 1=RIGHT, 2=DOWN, 3=LEFT)
+@lru_cache(maxsize=None)
+def build_move_table(grid_size):
+    rows, cols = np.divmod(np.arange(grid_size * grid_size), grid_size)
+    last = grid_size - 1
+    new_rows = np.stack([np.maximum(rows - 1, 0), rows, np.minimum(rows + 1, last), rows], axis=1)
+    new_cols = np.stack([cols, np.minimum(cols + 1, last), cols, np.maximum(cols - 1, 0)], axis=1)
+    moves = new_rows * grid_size + new_cols
+    moves.setflags(write=False)
+    return moves
+
+
+# Boolesche Masken (L, cells) der Hinderniszellen je Layout
+def _obstacle_masks(obstacle_cells, grid_size):
+    obstacle_cells = np.asarray(obstacle_cells, dtype=np.int64).reshape(len(obstacle_cells), -1)
+    masks = np.zeros((len(obstacle_cells), grid_size * grid_size), dtype=bool)
+    masks[np.arange(len(obstacle_cells))[:, None], obstacle_cells] = True
+    return masks
+
+
+# Arrays schreibgeschützt machen, da Modelle im Cache geteilt werden
+def _freeze(next_state, reward, terminal_code):
+    for array in (next_state, reward, terminal_code):
+        array.setflags(write=False)
+    return TabularModel(next_state, reward, terminal_code)
+
+
+# L Grid-Layouts auf einmal kompilieren: goal_cells (L,), obstacle_cells (L, k);
+# liefert gestapelte Arrays (L, S, A). Reihenfolge wie GridEnvironment.check_termination.
+def compile_grid_models(goal_cells, obstacle_cells, grid_size=GRID_SIZE, rewards=Rewards()):
+    goal_cells = np.asarray(goal_cells, dtype=np.int64)
+    moves = build_move_table(grid_size)
+    next_state = np.broadcast_to(moves, (len(goal_cells),) + moves.shape).copy()
+    layers = np.arange(len(goal_cells))[:, None, None]
+
+    terminal_code = np.where(_obstacle_masks(obstacle_cells, grid_size)[layers, next_state],
+                             OUTCOME_OBSTACLE, OUTCOME_NONE).astype(np.int8)
+    terminal_code[next_state == goal_cells[:, None, None]] = OUTCOME_GOAL
+
+    reward = np.full(next_state.shape, float(rewards["step"]))
+    reward[terminal_code == OUTCOME_OBSTACLE] += rewards["obstacle"]
+    reward[terminal_code == OUTCOME_GOAL] = rewards["goal"]
+
+    return TabularModel(next_state, reward, terminal_code)
+
+
+# Grid-Layout kompilieren (Einzelfall von compile_grid_models).
+# Die Rewards sind Teil des Cache-Schlüssels.
+@lru_cache(maxsize=4096)
+def compile_grid_model(goal_cell, obstacle_cells, grid_size=GRID_SIZE, rewards=Rewards()):
+    model = compile_grid_models([goal_cell], [obstacle_cells], grid_size, rewards)
+    return _freeze(model.next_state[0], model.reward[0], model.terminal_code[0])
+
+
+# L Container-Layouts auf einmal kompilieren; Zustand = cell + grid_size² * loaded.
+# next_state ist der tatsächliche Folgezustand (nach Pickup beladen), die
+# Beobachtung der ContainerShipEnv liegt bei OUTCOME_PICKUP eine Ebene tiefer.
+def compile_container_models(pickup_cells, dropoff_cells, obstacle_cells, grid_size=GRID_SIZE, rewards=Rewards()):
+    pickup_cells = np.asarray(pickup_cells, dtype=np.int64)[:, None, None]
+    dropoff_cells = np.asarray(dropoff_cells, dtype=np.int64)[:, None, None]
+    n_layouts = len(pickup_cells)
+    n_cells = grid_size * grid_size
+    moves = np.tile(build_move_table(grid_size), (2, 1))
+    next_cells = np.broadcast_to(moves, (n_layouts,) + moves.shape)
+    loaded = np.repeat([0, 1], n_cells)[None, :, None]
+    layers = np.arange(n_layouts)[:, None, None]
+
+    terminal_code = np.full(next_cells.shape, OUTCOME_NONE, dtype=np.int8)
+    terminal_code[(loaded == 1) & (next_cells == dropoff_cells)] = OUTCOME_GOAL
+    terminal_code[(loaded == 0) & (next_cells == pickup_cells)] = OUTCOME_PICKUP
+    terminal_code[_obstacle_masks(obstacle_cells, grid_size)[layers, next_cells]] = OUTCOME_OBSTACLE
+
+    next_loaded = loaded | (terminal_code == OUTCOME_PICKUP)
+    next_state = next_cells + n_cells * next_loaded
+
+    reward = np.full(next_cells.shape, float(rewards["step"]))
+    reward[terminal_code == OUTCOME_GOAL] = rewards["dropoff"]
+    reward[terminal_code == OUTCOME_PICKUP] = rewards["pickup"]
+    reward[terminal_code == OUTCOME_OBSTACLE] = rewards["obstacle"]
+
+    return TabularModel(next_state, reward, terminal_code)
+
+
+# Container-Layout kompilieren (Einzelfall von compile_container_models)
+@lru_cache(maxsize=4096)
+def compile_container_model(pickup_cell, dropoff_cell, obstacle_cells, grid_size=GRID_SIZE, rewards=Rewards()):
+    model = compile_container_models([pickup_cell], [dropoff_cell], [obstacle_cells], grid_size, rewards)
+    return _freeze(model.next_state[0], model.reward[0], model.terminal_code[0])
+
+
+# ============================================================================
+# ModelBank Klasse
+# ============================================================================
+
+# Gestapelte Modelle (L, S, A) für vektorisierte Umgebungen. Jede Layout-ID wird
+# nur beim ersten Auftreten kompiliert; danach kostet ein Reset nur einen Lookup.
+class ModelBank:
+
+    def __init__(self, n_layouts, n_states, n_actions=N_ACTIONS, capacity=8):
+        self.n_states = n_states
+        self.n_actions = n_actions
+        self.row_of = np.full(n_layouts, -1, dtype=np.int64)
+        self.size = 0
+
+        self.next_state = np.empty((capacity, n_states, n_actions), dtype=np.int64)
+        self.reward = np.empty((capacity, n_states, n_actions))
+        self.terminal_code = np.empty((capacity, n_states, n_actions), dtype=np.int8)
+
+    # Modell als neue Zeile anhängen (Kapazität verdoppeln bei Bedarf)
+    def _append(self, layout_id, model):
+        if self.size == len(self.next_state):
+            capacity = 2 * len(self.next_state)
+            for name in ("next_state", "reward", "terminal_code"):
+                old = getattr(self, name)
+                grown = np.empty((capacity,) + old.shape[1:], dtype=old.dtype)
+                grown[:self.size] = old[:self.size]
+                setattr(self, name, grown)
+
+        self.next_state[self.size] = model.next_state
+        self.reward[self.size] = model.reward
+        self.terminal_code[self.size] = model.terminal_code
+        self.row_of[layout_id] = self.size
+        self.size += 1
+
+    # Bank-Zeilen für Layout-IDs; compile_at(i) liefert das Modell für layout_ids[i]
+    def rows(self, layout_ids, compile_at):
+        rows = self.row_of[layout_ids]
+        missing = np.flatnonzero(rows < 0)
+        if len(missing) > 0:
+            new_ids, first = np.unique(layout_ids[missing], return_index=True)
+            for layout_id, position in zip(new_ids, missing[first]):
+                self._append(layout_id, compile_at(position))
+            rows = self.row_of[layout_ids]
+        return rows
+
+
+# ============================================================================
+# Aufzählung der Startkonfigurationen
+# ============================================================================
+
+# Alle Startkonfigurationen eines Modus mit Ziehungswahrscheinlichkeit (wie reset()).
+# Liefert gestapelte Modelle (L, S, A), Startzustand und Layoutbeschreibung je Konfiguration.
+def enumerate_configurations(env_mode, grid_size=GRID_SIZE, rewards=Rewards()):
+    def cell(pos):
+        return pos[0] * grid_size + pos[1]
+
+    cells = range(grid_size * grid_size)
+
+    if env_mode == "container":
+        start = cell(CONTAINER_START_POS)
+        obstacles = tuple(sorted(cell(pos) for pos in CONTAINER_OBSTACLES))
+        candidates = [c for c in cells if c != start and c not in obstacles]
+        goals = [(pickup, dropoff) for pickup in candidates for dropoff in candidates if dropoff != pickup]
+        starts = [start] * len(goals)
+        obstacle_sets = [obstacles] * len(goals)
+        pickups, dropoffs = zip(*goals)
+        model = compile_container_models(pickups, dropoffs, obstacle_sets, grid_size, rewards)
+    else:
+        start = cell(DEFAULT_START_POS)
+        goal = cell(DEFAULT_GOAL_POS)
+        obstacles = tuple(sorted(cell(pos) for pos in DEFAULT_OBSTACLES))
+        layouts = [(start, goal, obstacles)]
+
+        if env_mode == "random_start":
+            layouts = [(c, goal, obstacles) for c in cells if c != goal and c not in obstacles]
+        elif env_mode == "random_goal":
+            layouts = [(start, c, obstacles) for c in cells if c != start and c not in obstacles]
+        elif env_mode == "random_obstacles":
+            candidates = [c for c in cells if c not in (start, goal)]
+            layouts = [(start, goal, triple) for triple in combinations(candidates, len(obstacles))]
+
+        starts, goals, obstacle_sets = (list(column) for column in zip(*layouts))
+        model = compile_grid_models(goals, obstacle_sets, grid_size, rewards)
+
+    # Alle Modi ziehen gleichverteilt über ihre Konfigurationen
+    n_configs = len(starts)
+    return {
+        "next_state": model.next_state,
+        "reward": model.reward,
+        "terminal_code": model.terminal_code,
+        "start_state": np.array(starts),
+        "goal": np.array(goals),
+        "obstacles": np.array(obstacle_sets),
+        "probability": np.full(n_configs, 1.0 / n_configs)
+    }
@@ -0,0 +1,212 @@
+# vector_container_environment.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+
+# Projektstruktur für Imports anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Drittanbieter
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+import numpy as np
+
+# Lokale Module
+from config import N_ACTIONS, CONTAINER_START_POS, CONTAINER_OBSTACLES, RunConfig
+from envs.outcomes import (OUTCOME_NONE, OUTCOME_LOOP, OUTCOME_TIMEOUT,
+                           OUTCOME_PICKUP)
+from envs.tabular_model import ModelBank, compile_container_model
+from envs.rendering import layout_codes, compose_frames
+
+
+# ============================================================================
+# VectorContainerShipEnv Klasse
+# ============================================================================
+
+# N unabhängige Episoden der ContainerShipEnv in flachen Arrays. Beobachtungen
+# sind direkt State-Indizes in der Codierung von utils/common.py::obs_to_state
+# (cell + grid_size² * loaded). Jedes Pickup-/Dropoff-Paar ist ein kompiliertes
+# Modell (tabular_model.py). Auto-Reset wie VectorGridEnvironment (SAME_STEP).
+class VectorContainerShipEnv(gym.vector.VectorEnv):
+    metadata = {"render_modes": ["rgb_array"], "render_fps": 4, "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, max_steps=None, max_loop_count=None,
+                 max_episode_steps=None, seed=None, config=None, render_mode=None, slot_seeds=None):
+        self.config = config if config is not None else RunConfig()
+        self.num_envs = num_envs
+        self.rewards = self.config.rewards
+        self.grid_size = self.config.grid_size
+        self.n_cells = self.grid_size * self.grid_size
+        self.n_states = 2 * self.n_cells
+
+        # Gleiche Grenzen wie ContainerShipEnv; max_episode_steps wie in VectorGridEnvironment
+        self.max_steps = max_steps if max_steps is not None else self.config.container_max_steps
+        self.max_loop_count = max_loop_count if max_loop_count is not None else self.config.container_loop_count
+        self.max_episode_steps = max_episode_steps
+
+        self.single_observation_space = spaces.Discrete(self.n_states)
+        self.single_action_space = spaces.Discrete(N_ACTIONS)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.np_random = np.random.default_rng(seed)
+        self.render_mode = render_mode
+        self._set_slot_streams(slot_seeds)
+
+        self._initialize_environment()
+
+    # Initialisierung der Arrays
+    def _initialize_environment(self):
+        n = self.num_envs
+        self._slots = np.arange(n)
+
+        self.start_cell = self.pos_to_state(CONTAINER_START_POS)
+        self.obstacle_cells = tuple(sorted(self.pos_to_state(pos) for pos in CONTAINER_OBSTACLES))
+
+        # Kandidaten für Pickup/Dropoff (wie ContainerShipEnv._set_random_positions)
+        self._candidates = np.setdiff1d(np.arange(self.n_cells), self.obstacle_cells + (self.start_cell,))
+        n_candidates = len(self._candidates)
+        self.models = ModelBank(n_candidates * (n_candidates - 1), self.n_states)
+
+        self.true_states = np.full(n, self.start_cell, dtype=np.int64)
+        self.pickup_cells = np.zeros(n, dtype=np.int64)
+        self.dropoff_cells = np.zeros(n, dtype=np.int64)
+        self.layout_rows = np.zeros(n, dtype=np.int64)
+        self.visit_counts = np.zeros((n, self.n_states), dtype=np.int32)
+        self.steps = np.zeros(n, dtype=np.int32)
+
+        # Reward bei verlaufsabhängigem Abbruch (Container-Rewards sind nicht additiv)
+        self._abort_rewards = np.zeros(OUTCOME_TIMEOUT + 1)
+        self._abort_rewards[OUTCOME_LOOP] = self.rewards["loop_abort"]
+        self._abort_rewards[OUTCOME_TIMEOUT] = self.rewards["timeout"]
+
+    # ============================================================================
+    # Hilfsfunktionen
+    # ============================================================================
+
+    # Konvertierung von Position zu Zellindex
+    def pos_to_state(self, pos):
+        return pos[0] * self.grid_size + pos[1]
+
+    # Position und Beladung aller Slots
+    @property
+    def agent_cells(self):
+        return self.true_states % self.n_cells
+
+    @property
+    def loaded(self):
+        return self.true_states // self.n_cells
+
+    # Kompiliertes Modell für den Slot slot
+    def _compile_slot(self, slot):
+        return compile_container_model(int(self.pickup_cells[slot]), int(self.dropoff_cells[slot]),
+                                       self.obstacle_cells, self.grid_size, self.rewards)
+
+    # Eigener Layout-Strom je Slot (slot_seeds: eine SeedSequence bzw. ein Seed pro Slot).
+    # Ohne slot_seeds ziehen alle Slots aus np_random; welches Layout ein Slot erhält, hängt
+    # dann davon ab, wann die anderen Slots zurückgesetzt werden.
+    def _set_slot_streams(self, slot_seeds):
+        if slot_seeds is None:
+            self.slot_rngs = None
+        else:
+            self.slot_rngs = [np.random.default_rng(slot_seed) for slot_seed in slot_seeds]
+
+    # Ganzzahlen in [0, high) für die Slots idx (je Slot aus dessen Strom, falls vorhanden)
+    def _slot_integers(self, idx, high):
+        if self.slot_rngs is None:
+            return self.np_random.integers(0, high, size=len(idx))
+        return np.array([self.slot_rngs[slot].integers(0, high) for slot in idx], dtype=np.int64)
+
+    # Neue Pickup-/Dropoff-Zellen für die Slots idx ziehen
+    def _reset_slots(self, idx):
+        n_candidates = len(self._candidates)
+
+        # Dropoff aus den verbleibenden Kandidaten: Index >= Pickup-Index verschieben
+        pickup_idx = self._slot_integers(idx, n_candidates)
+        dropoff_idx = self._slot_integers(idx, n_candidates - 1)
+        layout_ids = pickup_idx * (n_candidates - 1) + dropoff_idx
+        dropoff_idx += dropoff_idx >= pickup_idx
+
+        self.pickup_cells[idx] = self._candidates[pickup_idx]
+        self.dropoff_cells[idx] = self._candidates[dropoff_idx]
+        self.layout_rows[idx] = self.models.rows(layout_ids, lambda i: self._compile_slot(idx[i]))
+        self.true_states[idx] = self.start_cell
+        self.visit_counts[idx] = 0
+        self.steps[idx] = 0
+
+    # ============================================================================
+    # Hauptfunktionen
+    # ============================================================================
+
+    # Reset aller Slots; mit Layout-Strömen je Slot werden diese aus seed neu abgeleitet
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+            if self.slot_rngs is not None:
+                self._set_slot_streams(np.random.SeedSequence(seed).spawn(self.num_envs))
+
+        self._reset_slots(self._slots)
+        return self.true_states.copy(), {}
+
+    # Ausführung je einer Aktion pro Slot
+    def step(self, actions):
+        slots = self._slots
+        rows = self.layout_rows
+        next_states = self.models.next_state[rows, self.true_states, actions]
+        outcomes = self.models.terminal_code[rows, self.true_states, actions]
+        rewards = self.models.reward[rows, self.true_states, actions]
+        self.true_states = next_states
+        self.steps += 1
+
+        # Beobachtung vor Pickup-Ereignis (wie ContainerShipEnv.step)
+        obs = np.where(outcomes == OUTCOME_PICKUP, next_states - self.n_cells, next_states)
+        self.visit_counts[slots, obs] += 1
+
+        # Schleife und Timeout haben Vorrang (wie ContainerShipEnv.check_termination_and_rewards)
+        aborts = np.where(self.visit_counts[slots, obs] >= self.max_loop_count, OUTCOME_LOOP,
+                          np.where(self.steps >= self.max_steps, OUTCOME_TIMEOUT, OUTCOME_NONE))
+        aborted = aborts != OUTCOME_NONE
+        outcomes[aborted] = aborts[aborted]
+        rewards[aborted] = self._abort_rewards[aborts[aborted]]
+
+        terminated = (outcomes != OUTCOME_NONE) & (outcomes != OUTCOME_PICKUP)
+        if self.max_episode_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_episode_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        infos = {
+            "final_obs": obs,
+            "outcome": outcomes,
+            "episode_steps": self.steps.copy()
+        }
+
+        # Auto-Reset beendeter Slots; laufende Slots liefern die Beobachtung vor dem Pickup
+        next_obs = obs.copy()
+        done = np.flatnonzero(terminated | truncated)
+        if len(done) > 0:
+            self._reset_slots(done)
+            next_obs[done] = self.true_states[done]
+
+        return next_obs, rewards, terminated, truncated, infos
+
+    # ============================================================================
+    # Rendering
+    # ============================================================================
+
+    # RGB-Frames (N, H, W, 3) aller Slots in einem Aufruf (Modus "rgb_array");
+    # nach Auto-Reset zeigt ein Slot bereits den Start der neuen Episode
+    def render(self):
+        if self.render_mode != "rgb_array":
+            gym.logger.warn(f"render_mode={self.render_mode!r} wird nicht unterstützt, nur 'rgb_array'")
+            return None
+        n = self.num_envs
+        obstacles = np.broadcast_to(self.obstacle_cells, (n, len(self.obstacle_cells)))
+        codes = layout_codes(self.n_cells, self.agent_cells, np.full(n, self.start_cell), obstacles,
+                             pickup_cells=self.pickup_cells, dropoff_cells=self.dropoff_cells, loaded=self.loaded)
+        return compose_frames(codes, self.grid_size)
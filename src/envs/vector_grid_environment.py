@@ -0,0 +1,238 @@
+# vector_grid_environment.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+
+# Projektstruktur für Imports anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+# Drittanbieter
+from math import comb
+
+import gymnasium as gym
+from gymnasium import spaces
+from gymnasium.vector import AutoresetMode
+from gymnasium.vector.utils import batch_space
+import numpy as np
+
+# Lokale Module
+from config import (N_ACTIONS, DEFAULT_START_POS, DEFAULT_GOAL_POS, DEFAULT_OBSTACLES,
+                    RunConfig)
+from envs.outcomes import OUTCOME_NONE, OUTCOME_LOOP, OUTCOME_TIMEOUT
+from envs.tabular_model import ModelBank, compile_grid_model
+from envs.rendering import layout_codes, compose_frames
+
+
+# ============================================================================
+# VectorGridEnvironment Klasse
+# ============================================================================
+
+# N unabhängige Episoden der GridEnvironment, Zustand komplett in NumPy-Arrays.
+# Bewegung, Ziel und Hindernisse kommen aus kompilierten Modellen (tabular_model.py),
+# je Slot über eine Layout-ID adressiert. Beendete Slots werden im selben
+# step()-Aufruf zurückgesetzt (SAME_STEP); die tatsächlichen Folgezustände
+# liegen in infos["final_obs"].
+class VectorGridEnvironment(gym.vector.VectorEnv):
+    metadata = {"render_modes": ["rgb_array"], "render_fps": 4, "autoreset_mode": AutoresetMode.SAME_STEP}
+
+    def __init__(self, num_envs, mode=None, max_steps=None, loop_threshold=None,
+                 max_episode_steps=None, seed=None, config=None, render_mode=None, slot_seeds=None):
+        self.config = config if config is not None else RunConfig()
+        self.num_envs = num_envs
+        self.mode = mode if mode is not None else self.config.env_mode
+        self.rewards = self.config.rewards
+        self.grid_size = self.config.grid_size
+        self.n_states = self.grid_size * self.grid_size
+
+        # Gleiche Grenzen wie GridEnvironment; max_episode_steps schneidet
+        # Episoden ohne Timeout-Strafe ab (entspricht MAX_STEPS in train.py)
+        self.max_steps = max_steps if max_steps is not None else self.config.grid_max_steps
+        self.loop_threshold = loop_threshold if loop_threshold is not None else self.config.grid_loop_threshold
+        self.max_episode_steps = max_episode_steps
+
+        self.single_observation_space = spaces.Discrete(self.n_states)
+        self.single_action_space = spaces.Discrete(N_ACTIONS)
+        self.observation_space = batch_space(self.single_observation_space, num_envs)
+        self.action_space = batch_space(self.single_action_space, num_envs)
+        self.np_random = np.random.default_rng(seed)
+        self.render_mode = render_mode
+        self._set_slot_streams(slot_seeds)
+
+        self._initialize_environment()
+
+    # Initialisierung der Arrays und Standard-Layouts
+    def _initialize_environment(self):
+        n = self.num_envs
+        self._slots = np.arange(n)
+
+        self.default_start = self.pos_to_state(DEFAULT_START_POS)
+        self.default_goal = self.pos_to_state(DEFAULT_GOAL_POS)
+        self.default_obstacles = np.array([self.pos_to_state(pos) for pos in DEFAULT_OBSTACLES])
+        self.n_obstacles = len(DEFAULT_OBSTACLES)
+
+        # Kandidaten je Modus (wie GridEnvironment._set_positions_by_mode)
+        cells = np.arange(self.n_states)
+        self._start_candidates = np.setdiff1d(cells, np.append(self.default_obstacles, self.default_goal))
+        self._goal_candidates = np.setdiff1d(cells, np.append(self.default_obstacles, self.default_start))
+        self._obstacle_candidates = np.setdiff1d(cells, [self.default_start, self.default_goal])
+
+        # Binomialtabelle für die Rangbildung von Hindernis-Kombinationen
+        n_candidates = len(self._obstacle_candidates)
+        self._binomials = np.array([[comb(x, k) for x in range(n_candidates)]
+                                    for k in range(self.n_obstacles + 1)])
+
+        if self.mode == "random_goal":
+            n_layouts = len(self._goal_candidates)
+        elif self.mode == "random_obstacles":
+            n_layouts = comb(n_candidates, self.n_obstacles)
+        else:
+            n_layouts = 1
+        self.models = ModelBank(n_layouts, self.n_states)
+
+        self.states = np.full(n, self.default_start, dtype=np.int64)
+        self.start_states = np.full(n, self.default_start, dtype=np.int64)
+        self.goal_states = np.full(n, self.default_goal, dtype=np.int64)
+        self.obstacle_cells = np.tile(self.default_obstacles, (n, 1))
+        self.layout_rows = np.zeros(n, dtype=np.int64)
+        self.visit_counts = np.zeros((n, self.n_states), dtype=np.int32)
+        self.current_steps = np.zeros(n, dtype=np.int32)
+
+        # Strafzuschlag für verlaufsabhängige Abbrüche (zusätzlich zu rewards["step"])
+        self._penalties = np.zeros(OUTCOME_TIMEOUT + 1)
+        self._penalties[OUTCOME_LOOP] = self.rewards["loop_abort"]
+        self._penalties[OUTCOME_TIMEOUT] = self.rewards["timeout"]
+
+    # ============================================================================
+    # Hilfsfunktionen
+    # ============================================================================
+
+    # Konvertierung von Position zu State-Index
+    def pos_to_state(self, pos):
+        return pos[0] * self.grid_size + pos[1]
+
+    # Konvertierung von State-Indizes zu Positionen (Arrays)
+    def state_to_pos(self, states):
+        return np.divmod(states, self.grid_size)
+
+    # Kompiliertes Modell für den Slot slot
+    def _compile_slot(self, slot):
+        obstacles = tuple(sorted(int(cell) for cell in self.obstacle_cells[slot]))
+        return compile_grid_model(int(self.goal_states[slot]), obstacles, self.grid_size, self.rewards)
+
+    # Eigener Layout-Strom je Slot (slot_seeds: eine SeedSequence bzw. ein Seed pro Slot).
+    # Ohne slot_seeds ziehen alle Slots aus np_random; welches Layout ein Slot erhält, hängt
+    # dann davon ab, wann die anderen Slots zurückgesetzt werden.
+    def _set_slot_streams(self, slot_seeds):
+        if slot_seeds is None:
+            self.slot_rngs = None
+        else:
+            self.slot_rngs = [np.random.default_rng(slot_seed) for slot_seed in slot_seeds]
+
+    # Ganzzahlen in [0, high) für die Slots idx (je Slot aus dessen Strom, falls vorhanden)
+    def _slot_integers(self, idx, high):
+        if self.slot_rngs is None:
+            return self.np_random.integers(0, high, size=len(idx))
+        return np.array([self.slot_rngs[slot].integers(0, high) for slot in idx], dtype=np.int64)
+
+    # Gleichverteilte Zufallszahlen (len(idx), n) für die Slots idx
+    def _slot_random(self, idx, n):
+        if self.slot_rngs is None:
+            return self.np_random.random((len(idx), n))
+        return np.stack([self.slot_rngs[slot].random(n) for slot in idx])
+
+    # Neues Layout für die Slots idx gemäß Modus ziehen
+    def _reset_slots(self, idx):
+        k = len(idx)
+        layout_ids = np.zeros(k, dtype=np.int64)
+
+        if self.mode == "random_start":
+            self.start_states[idx] = self._start_candidates[self._slot_integers(idx, len(self._start_candidates))]
+
+        elif self.mode == "random_goal":
+            layout_ids = self._slot_integers(idx, len(self._goal_candidates))
+            self.goal_states[idx] = self._goal_candidates[layout_ids]
+
+        elif self.mode == "random_obstacles":
+            # Ziehen ohne Zurücklegen je Slot über die kleinsten Zufallsschlüssel
+            keys = self._slot_random(idx, len(self._obstacle_candidates))
+            picks = np.sort(np.argpartition(keys, self.n_obstacles, axis=1)[:, :self.n_obstacles], axis=1)
+            self.obstacle_cells[idx] = self._obstacle_candidates[picks]
+            # Rang der Kombination im kombinatorischen Zahlensystem als Layout-ID
+            for k_th in range(self.n_obstacles):
+                layout_ids += self._binomials[k_th + 1, picks[:, k_th]]
+
+        # static: alles bleibt bei DEFAULT-Werten
+
+        self.layout_rows[idx] = self.models.rows(layout_ids, lambda i: self._compile_slot(idx[i]))
+        self.states[idx] = self.start_states[idx]
+        self.visit_counts[idx] = 0
+        self.current_steps[idx] = 0
+
+    # ============================================================================
+    # Hauptfunktionen
+    # ============================================================================
+
+    # Reset aller Slots; mit Layout-Strömen je Slot werden diese aus seed neu abgeleitet
+    def reset(self, seed=None, options=None):
+        if seed is not None:
+            self.np_random = np.random.default_rng(seed)
+            if self.slot_rngs is not None:
+                self._set_slot_streams(np.random.SeedSequence(seed).spawn(self.num_envs))
+
+        self._reset_slots(self._slots)
+        return self.states.copy(), {}
+
+    # Ausführung je einer Aktion pro Slot
+    def step(self, actions):
+        slots = self._slots
+        rows = self.layout_rows
+        next_states = self.models.next_state[rows, self.states, actions]
+        outcomes = self.models.terminal_code[rows, self.states, actions]
+
+        self.current_steps += 1
+        self.visit_counts[slots, next_states] += 1
+
+        # Verlaufsabhängige Abbrüche nach Ziel/Hindernis (wie GridEnvironment.check_termination)
+        open_slots = outcomes == OUTCOME_NONE
+        outcomes[open_slots & (self.visit_counts[slots, next_states] >= self.loop_threshold)] = OUTCOME_LOOP
+        open_slots = outcomes == OUTCOME_NONE
+        outcomes[open_slots & (self.current_steps >= self.max_steps)] = OUTCOME_TIMEOUT
+
+        rewards = self.models.reward[rows, self.states, actions] + self._penalties[outcomes]
+        terminated = outcomes != OUTCOME_NONE
+        if self.max_episode_steps is not None:
+            truncated = ~terminated & (self.current_steps >= self.max_episode_steps)
+        else:
+            truncated = np.zeros(self.num_envs, dtype=bool)
+
+        infos = {
+            "final_obs": next_states,
+            "outcome": outcomes,
+            "episode_steps": self.current_steps.copy()
+        }
+
+        # Auto-Reset beendeter Slots
+        self.states = next_states.copy()
+        done = np.flatnonzero(terminated | truncated)
+        if len(done) > 0:
+            self._reset_slots(done)
+
+        return self.states.copy(), rewards, terminated, truncated, infos
+
+    # ============================================================================
+    # Rendering
+    # ============================================================================
+
+    # RGB-Frames (N, H, W, 3) aller Slots in einem Aufruf (Modus "rgb_array");
+    # nach Auto-Reset zeigt ein Slot bereits den Start der neuen Episode
+    def render(self):
+        if self.render_mode != "rgb_array":
+            gym.logger.warn(f"render_mode={self.render_mode!r} wird nicht unterstützt, nur 'rgb_array'")
+            return None
+        codes = layout_codes(self.n_states, self.states, self.start_states, self.obstacle_cells,
+                             goal_cells=self.goal_states)
+        return compose_frames(codes, self.grid_size)
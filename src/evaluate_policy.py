@@ -10,117 +10,71 @@ import os
 # Projektstruktur für Import anpassen
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
-# Drittanbieter
-import numpy as np
-from collections import defaultdict
-
 # Lokale Module
-from config import (ENV_MODE, EPISODES, MAX_STEPS, LOOP_THRESHOLD, REWARDS,
-                    get_q_table_path, EXPORT_PDF, EXPORT_PATH, SEED)
+from config import EXPORT_PDF, EXPORT_PATH, RunConfig, ADAPTIVE_MAX_EPISODES, TRAJECTORY_PATH
 
 # Utils
-from utils.common import set_all_seeds, obs_to_state, check_success, setup_export
-from utils.environment import initialize_environment
+from utils.common import set_all_seeds, setup_export
 from utils.qlearning import load_q_table
-from utils.evaluation import classify_episode_result, check_loop_detection
-from utils.visualization import create_success_plot, create_reward_histogram
-from utils.reporting import print_evaluation_results
+from utils.evaluation_engine import evaluate_greedy, outcome_counts, confidence_intervals
+from utils.reporting import print_evaluation_results, print_confidence_intervals
+from utils.trajectory import TrajectoryRecorder
 
 
 # ============================================================================
 # Hauptfunktion
 # ============================================================================
 
-# Evaluation der trainierten Policy über mehrere Episoden
-def evaluate_policy():
+# Evaluation der trainierten Policy über mehrere Episoden (config: RunConfig, Standardwerte aus config.py)
+def evaluate_policy(config=None):
+    config = config if config is not None else RunConfig()
+    env_mode = config.env_mode
+
     # Seed für Reproduzierbarkeit setzen
-    set_all_seeds()
+    set_all_seeds(config.seed)
 
     # Initialisierung
-    env, grid_size = initialize_environment(ENV_MODE)
-    q_table_path = get_q_table_path(ENV_MODE)
-    Q = load_q_table(q_table_path)
+    Q = load_q_table(env_mode)
     setup_export()
 
     if Q is None:
         return
 
-    results_cause = defaultdict(int)
-    results_solved = defaultdict(int)
-    rewards_all = []
-
-    print(f"Starte Evaluation mit {EPISODES} Episoden...")
-
-    for episode in range(EPISODES):
-        obs, _ = env.reset()
-        state = obs_to_state(obs, ENV_MODE, grid_size)
-        episode_reward = 0
-        visited_states = {}
-        steps = 0
-        cause = "Timeout"
-        goal_reached = False
-        loop_detected = False
-
-        # Episode durchführen
-        for step in range(MAX_STEPS):
-            action = np.argmax(Q[state])
-            obs, reward, terminated, _, _ = env.step(action)
-            next_state = obs_to_state(obs, ENV_MODE, grid_size)
-            episode_reward += reward
-            steps += 1
-
-            # Schleifenerkennung für Grid-Environment
-            if check_loop_detection(visited_states, next_state, ENV_MODE):
-                cause = "Schleifenabbruch"
-                loop_detected = True
-                episode_reward += REWARDS["loop_abort"]
-                break
-
-            # Erfolg erkennen
-            if ENV_MODE == "container":
-                if reward == REWARDS["dropoff"]:
-                    goal_reached = True
-                    cause = "Ziel erreicht"
-                elif reward == REWARDS["loop_abort"]:
-                    loop_detected = True
-                    cause = "Schleifenabbruch"
-            else:
-                if reward == REWARDS["goal"]:
-                    goal_reached = True
-                    cause = "Ziel erreicht"
-
-            state = next_state
-
-            if terminated:
-                # Klassifizierung basierend auf letztem Reward
-                if not goal_reached and not loop_detected:
-                    cause, _ = classify_episode_result(reward, cause, episode_reward, ENV_MODE)
-                break
-
-        # Timeout-Check
-        if not terminated and steps >= MAX_STEPS:
-            cause = "Timeout"
-            episode_reward += REWARDS["timeout"]
-
-        # Alternative Klassifizierung basierend auf Gesamt-Reward
-        if cause == "Timeout" and episode_reward > 0:
-            if ENV_MODE != "container" and episode_reward >= REWARDS["goal"]:
-                cause = "Ziel erreicht"
-
-        # Erfolg bestimmen
-        success = (cause == "Ziel erreicht")
-
-        # Statistiken aktualisieren
-        results_cause[cause] += 1
-        results_solved["solved episode" if success else "failed episode"] += 1
-        rewards_all.append(episode_reward)
+    # Adaptiv: Batches bis zur Zielgenauigkeit; exakt: jede Startkonfiguration einmal (alle Modi
+    # ziehen gleichverteilt, daher entspricht jede Konfiguration einer Episode); sonst config.episodes Stichproben
+    if config.adaptive_evaluation:
+        print(f"Starte adaptive Evaluation (Budget: {ADAPTIVE_MAX_EPISODES} Episoden)...")
+    elif config.exact_evaluation:
+        print("Starte exakte Evaluation über alle Startkonfigurationen...")
+    else:
+        print(f"Starte Evaluation mit {config.episodes} Episoden...")
+
+    # Optional alle Schritte aufzeichnen; Episoden-ID = Zeile der Episodendatensätze
+    recorder = None
+    if config.record_trajectories:
+        recorder = TrajectoryRecorder(os.path.join(TRAJECTORY_PATH, f"evaluate_{env_mode}"),
+                                      metadata={"source": "evaluate_policy", "env_mode": env_mode,
+                                                "exact": config.exact_evaluation,
+                                                "adaptive": config.adaptive_evaluation})
+
+    records = evaluate_greedy(Q, env_mode, config, config.exact_evaluation, config.episodes, config.max_steps,
+                              adaptive=config.adaptive_evaluation, recorder=recorder)
+    if recorder is not None:
+        recorder.close()
+
+    # Rewards wie in den Kennzahlen der Engine: abgeschnittene Episoden ohne Timeout-Strafe
+    results_cause, results_solved = outcome_counts(records)
+    rewards_all = records["reward"].tolist()
 
     # Ergebnisse ausgeben
-    print_evaluation_results(results_cause, results_solved, rewards_all, EPISODES, ENV_MODE)
+    print_evaluation_results(results_cause, results_solved, rewards_all, len(rewards_all), env_mode)
+    if config.adaptive_evaluation or not config.exact_evaluation:
+        print_confidence_intervals(confidence_intervals(records), len(rewards_all))
 
-    # Visualisierungen erstellen
-    create_success_plot(results_solved, ENV_MODE)
-    create_reward_histogram(rewards_all, ENV_MODE)
+    # Visualisierungen erstellen (matplotlib erst hier laden)
+    from utils.visualization import create_success_plot, create_reward_histogram
+    create_success_plot(results_solved, env_mode)
+    create_reward_histogram(rewards_all, env_mode)
 
 
 # ============================================================================
@@ -128,4 +82,4 @@ def evaluate_policy():
 # ============================================================================
 
 if __name__ == "__main__":
-    evaluate_policy()
\ No newline at end of file
+    evaluate_policy(RunConfig.from_env())
\ No newline at end of file
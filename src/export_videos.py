@@ -0,0 +1,152 @@
+# export_videos.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+import time
+import importlib.util
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Projektstruktur für Import anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+# Drittanbieter
+import numpy as np
+import imageio.v3 as iio
+
+# Lokale Module
+from config import RunConfig, SEED, EVAL_MAX_STEPS, VIDEO_FORMAT, VIDEO_FPS, VIDEO_PATH, get_q_table_path
+
+# Utils
+from utils.common import obs_to_state, check_success
+from utils.environment import initialize_environment
+from utils.qlearning import load_q_table, compile_policy
+from utils.evaluation_engine import scenario_stream
+
+# ============================================================================
+# Konfiguration
+# ============================================================================
+
+HOLD_FRAMES = 3  # Start- und Endbild mehrfach zeigen
+
+# ============================================================================
+# Rendering
+# ============================================================================
+
+# Umgebung (Modus "rgb_array") und Policy je Szenario einmal pro Worker-Prozess
+@lru_cache(maxsize=None)
+def scenario_setup(env_mode):
+    Q = load_q_table(env_mode)
+    if Q is None:
+        return None
+    env, _ = initialize_environment(env_mode, render_mode="rgb_array")
+    return env, compile_policy(Q)
+
+
+# Greedy-Episode abspielen; Frames kommen aus dem Kachel-Renderer der Umgebung (envs/rendering.py)
+def render_episode(env_mode, episode, max_steps=EVAL_MAX_STEPS, seed=SEED):
+    env, policy = scenario_setup(env_mode)
+
+    # Seed je (Szenario, Episode) unabhängig von der Verteilung auf Worker
+    episode_seed = int(np.random.SeedSequence([seed, scenario_stream(env_mode), episode]).generate_state(1)[0])
+    obs, _ = env.reset(seed=episode_seed)
+
+    frames = [env.render()] * HOLD_FRAMES
+    total_reward = 0
+    success = False
+
+    for step in range(1, max_steps + 1):
+        action = policy.actions[obs_to_state(obs, env_mode, env.grid_size)]
+        obs, reward, terminated, truncated, _ = env.step(action)
+        total_reward += reward
+        frames.append(env.render())
+
+        if terminated or truncated:
+            success = check_success(reward, env_mode, env.rewards)
+            break
+
+    frames.extend([frames[-1]] * (HOLD_FRAMES - 1))
+    return frames, {"steps": step, "reward": total_reward, "success": bool(success)}
+
+
+# Schreib-Plugin für das Videoformat verfügbar? (MP4 braucht imageio-ffmpeg oder PyAV)
+def video_format_supported(video_format):
+    if video_format == "gif":
+        return True
+    return any(importlib.util.find_spec(module) is not None for module in ("imageio_ffmpeg", "av"))
+
+
+# Frames als GIF oder MP4 schreiben
+def write_video(path, frames, fps=VIDEO_FPS):
+    if path.endswith(".gif"):
+        iio.imwrite(path, np.stack(frames), duration=1000 / fps, loop=0)
+    else:
+        iio.imwrite(path, np.stack(frames), fps=fps)
+
+
+# Worker: Episode rendern und als Video speichern
+def export_episode(env_mode, episode, video_format=VIDEO_FORMAT, output_dir=VIDEO_PATH):
+    if scenario_setup(env_mode) is None:
+        return {"name": env_mode, "episode": episode, "error": f"Q-Tabelle fehlt: {get_q_table_path(env_mode)}"}
+
+    frames, result = render_episode(env_mode, episode)
+    path = os.path.join(output_dir, f"{env_mode}_episode_{episode:04d}.{video_format}")
+    write_video(path, frames)
+    return {"name": env_mode, "episode": episode, "path": path, "frames": len(frames), **result}
+
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+# Alle Episoden aller Szenarien auf Worker-Prozesse verteilen (Szenarien, Episoden, Format und
+# Worker aus run_config); ein fehlgeschlagener Auftrag wird als Fehler der Episode gemeldet,
+# die übrigen laufen weiter
+def export_videos(run_config=None):
+    run_config = run_config if run_config is not None else RunConfig()
+    scenarios = run_config.video_scenarios.split(",")
+    episodes = run_config.video_episodes
+    video_format = run_config.video_format
+    workers = RunConfig.worker_count(run_config.video_workers)
+    if not video_format_supported(video_format):
+        raise SystemExit(f"FEHLER: VIDEO_FORMAT={video_format} braucht das ffmpeg-Plugin von imageio "
+                         f"(pip install imageio-ffmpeg) oder VIDEO_FORMAT=gif")
+
+    os.makedirs(VIDEO_PATH, exist_ok=True)
+    jobs = [(name, episode) for name in scenarios for episode in range(episodes)]
+    start_time = time.perf_counter()
+
+    print(f"Video-Export: {len(scenarios)} Szenarien x {episodes} Episoden ({video_format}) auf {workers} Worker-Prozessen")
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(export_episode, name, episode, video_format): (name, episode)
+                   for name, episode in jobs}
+        for future in as_completed(futures):
+            name, episode = futures[future]
+            try:
+                results.append(future.result())
+            except Exception as error:
+                results.append({"name": name, "episode": episode, "error": f"{type(error).__name__}: {error}"})
+
+    results.sort(key=lambda result: (scenarios.index(result["name"]), result["episode"]))
+    for name in scenarios:
+        scenario_results = [result for result in results if result["name"] == name]
+        errors = [result["error"] for result in scenario_results if "error" in result]
+        videos = [result for result in scenario_results if "error" not in result]
+        if videos:
+            successes = sum(result["success"] for result in videos)
+            frames = sum(result["frames"] for result in videos)
+            print(f"  {name:<18} {len(videos)} Videos, {successes} erfolgreich, {frames} Frames")
+        if errors:
+            print(f"  {name:<18} FEHLER in {len(errors)} Episoden: {errors[0]}")
+
+    print(f"Fertig in {time.perf_counter() - start_time:.1f} s, Videos unter {VIDEO_PATH}/")
+    return results
+
+
+if __name__ == "__main__":
+    export_videos(RunConfig.from_env())
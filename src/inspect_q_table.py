@@ -17,7 +17,7 @@ import numpy as np
 from config import ENV_MODE
 
 # Utils
-from utils.qlearning import load_q_table
+from utils.qlearning import load_q_table, load_q_table_metadata, verify_q_table, compare_storage_formats, compile_policy
 
 # ============================================================================
 # Konfiguration
@@ -41,15 +41,9 @@ DISPLAY_COLS = 4
 # Hilfsfunktionen
 # ============================================================================
 
-def load_q_table_for_inspection(filepath):
-    """Q-Tabelle für Inspektion laden"""
-    try:
-        q_table = np.load(filepath)
-        print(f"Q-Tabelle erfolgreich geladen: {filepath}")
-        return q_table
-    except FileNotFoundError:
-        print(f"FEHLER: Q-Tabelle nicht gefunden: {filepath}")
-        return None
+def load_q_table_for_inspection(scenario_name):
+    """Q-Tabelle für Inspektion laden (speicherabgebildet, Prüfsummenstatus zeigen die Metadaten)"""
+    return load_q_table(scenario_name, verify=False)
 
 
 def get_q_table_info(q_table):
@@ -77,11 +71,10 @@ def find_best_actions_per_state(q_table, num_states=10):
     if q_table is None:
         return None
 
+    policy = compile_policy(q_table)
     best_actions = []
     for state in range(min(num_states, q_table.shape[0])):
-        best_action = np.argmax(q_table[state])
-        best_value = q_table[state, best_action]
-        best_actions.append((state, best_action, best_value))
+        best_actions.append((state, int(policy.actions[state]), policy.values[state]))
 
     return best_actions
 
@@ -111,6 +104,27 @@ def display_q_table_overview(q_table, scenario_name):
     print(f"Gelernte Einträge: {info['nonzero_entries']} ({info['nonzero_entries'] / q_table.size * 100:.1f}%)")
 
 
+def display_q_table_metadata(scenario_name):
+    """Kopfdaten der Q-Tabelle und Prüfsummenstatus anzeigen"""
+    metadata = load_q_table_metadata(scenario_name)
+    if metadata is None:
+        return
+
+    print(f"\nMetadaten:")
+    if "format_version" not in metadata:
+        print("  Kein Metadaten-Kopf (ältere Q-Tabelle)")
+    for key in ["dtype", "source_dtype", "scale", "greedy_agreement", "grid_size", "learner", "alpha", "gamma", "epsilon", "seed", "episodes_run",
+                "episodes_max", "solver", "created"]:
+        if key in metadata:
+            print(f"  {key}: {metadata[key]}")
+
+    checksum_valid = verify_q_table(scenario_name)
+    if checksum_valid is None:
+        print("  Prüfsumme: nicht vorhanden")
+    else:
+        print(f"  Prüfsumme: {'✓ gültig' if checksum_valid else '✗ ungültig'}")
+
+
 def display_full_q_table_matrix(q_table, scenario_name):
     """Komplette Q-Tabelle als Matrix anzeigen"""
     if q_table is None:
@@ -197,11 +211,11 @@ def inspect_single_q_table(scenario_name):
         print(f"Verfügbare Szenarien: {list(AVAILABLE_Q_TABLES.keys())}")
         return
 
-    filepath = AVAILABLE_Q_TABLES[scenario_name]
-    q_table = load_q_table_for_inspection(filepath)
+    q_table = load_q_table_for_inspection(scenario_name)
 
     if q_table is not None:
         display_q_table_overview(q_table, scenario_name)
+        display_q_table_metadata(scenario_name)
         display_q_table_sample(q_table, scenario_name)
         display_best_actions(q_table, scenario_name)
         display_full_q_table_matrix(q_table, scenario_name)
@@ -235,7 +249,7 @@ def inspect_current_scenario():
 
 
 def compare_q_table_shapes():
-    """Formen aller Q-Tabellen vergleichen"""
+    """Formen aller Q-Tabellen vergleichen (aus den Metadaten, ohne die Tabellen zu laden)"""
     print(f"\n{'=' * 60}")
     print("Q-TABELLEN FORMEN-VERGLEICH")
     print(f"{'=' * 60}")
@@ -244,14 +258,10 @@ def compare_q_table_shapes():
     print("-" * 70)
 
     for scenario_name, filepath in AVAILABLE_Q_TABLES.items():
-        if os.path.exists(filepath):
-            q_table = load_q_table_for_inspection(filepath)
-            if q_table is not None:
-                shape = q_table.shape
-                status = "✓ Geladen"
-            else:
-                shape = "N/A"
-                status = "✗ Fehler"
+        metadata = load_q_table_metadata(scenario_name)
+        if metadata is not None:
+            shape = tuple(metadata["shape"])
+            status = "✓ Metadaten" if "format_version" in metadata else "✓ Ohne Kopf"
         else:
             shape = "N/A"
             status = "✗ Nicht gefunden"
@@ -268,6 +278,25 @@ def compare_q_table_shapes():
         print(scenario_name.ljust(20) + shape_str.ljust(15) + states_str.ljust(10) + actions_str.ljust(10) + status)
 
 
+def compare_q_table_storage(scenario_name):
+    """Speicherformate einer Q-Tabelle vergleichen (Größe, Fehler, Greedy-Übereinstimmung)"""
+    if scenario_name not in AVAILABLE_Q_TABLES:
+        print(f"FEHLER: Unbekanntes Szenario '{scenario_name}'")
+        return
+
+    q_table = load_q_table_for_inspection(scenario_name)
+    if q_table is None:
+        return
+
+    print(f"\nSPEICHERFORMATE: {scenario_name.upper()}")
+    print("=" * 60)
+    print("Format".ljust(10) + "Bytes".ljust(10) + "Max. Fehler".ljust(15) + "Greedy-Übereinstimmung")
+    print("-" * 60)
+    for result in compare_storage_formats(q_table):
+        print(f"{result['dtype']}".ljust(10) + f"{result['bytes']}".ljust(10) +
+              f"{result['max_error']:.2e}".ljust(15) + f"{result['greedy_agreement']:.1%}")
+
+
 # ============================================================================
 # Ausführung
 # ============================================================================
@@ -281,9 +310,10 @@ def main():
     print("3. Alle verfügbaren Q-Tabellen inspizieren")
     print("4. Q-Tabellen-Formen vergleichen")
     print("5. Nur Matrix anzeigen (bestimmtes Szenario)")
+    print("6. Speicherformate vergleichen (bestimmtes Szenario)")
 
     try:
-        choice = input("\nWählen Sie eine Option (1-5): ").strip()
+        choice = input("\nWählen Sie eine Option (1-6): ").strip()
 
         if choice == "1":
             inspect_current_scenario()
@@ -299,11 +329,14 @@ def main():
             print(f"Verfügbare Szenarien: {list(AVAILABLE_Q_TABLES.keys())}")
             scenario = input("Szenario für Matrix-Anzeige eingeben: ").strip()
             if scenario in AVAILABLE_Q_TABLES:
-                filepath = AVAILABLE_Q_TABLES[scenario]
-                q_table = load_q_table_for_inspection(filepath)
+                q_table = load_q_table_for_inspection(scenario)
                 display_full_q_table_matrix(q_table, scenario)
             else:
                 print(f"FEHLER: Unbekanntes Szenario '{scenario}'")
+        elif choice == "6":
+            print(f"Verfügbare Szenarien: {list(AVAILABLE_Q_TABLES.keys())}")
+            scenario = input("Szenario für Formatvergleich eingeben: ").strip()
+            compare_q_table_storage(scenario)
         else:
             print("Ungültige Auswahl. Zeige alle Q-Tabellen...")
             inspect_all_q_tables()
@@ -0,0 +1,61 @@
+# solve_optimal.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+import time
+
+# Projektstruktur für Import anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+# Lokale Module
+from config import RunConfig, get_q_table_path
+
+# Utils
+from utils.planning import solve_q_star, optimality_gap
+from utils.qlearning import save_q_table, load_q_table
+from utils.reporting import print_optimality_gap
+
+# ============================================================================
+# Konfiguration
+# ============================================================================
+
+SCENARIOS = ["static", "random_start", "random_goal", "random_obstacles", "container"]
+
+# ============================================================================
+# Lösung eines Szenarios
+# ============================================================================
+
+# Berechnung und Speicherung von Q* (q_table_<mode>_optimal.npy, gleiche Form wie die gelernte Tabelle);
+# Verfahren und γ aus config (RunConfig, Standardwerte aus config.py)
+def solve_scenario(env_mode, config=None):
+    config = config if config is not None else RunConfig()
+    method = config.solver_method
+    start_time = time.perf_counter()
+    Q_star, Q_layouts, iterations = solve_q_star(env_mode, config.gamma, method)
+    duration_ms = (time.perf_counter() - start_time) * 1000
+
+    print(f"\n{env_mode}: {len(Q_layouts)} Layouts, {iterations} Iterationen ({method}), {duration_ms:.1f} ms")
+    save_q_table(Q_star, f"{env_mode}_optimal", {"env_mode": env_mode, "solver": method,
+                                                 "iterations": int(iterations), "gamma": config.gamma,
+                                                 "layouts": len(Q_layouts)})
+
+    # Optimalitätslücke einer vorhandenen gelernten Q-Tabelle
+    if os.path.exists(get_q_table_path(env_mode)):
+        Q = load_q_table(env_mode)
+        print_optimality_gap(optimality_gap(Q, env_mode, config.gamma), env_mode)
+
+    return Q_star
+
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+if __name__ == "__main__":
+    run_config = RunConfig.from_env()
+    for scenario in (SCENARIOS if run_config.solve_all else [run_config.env_mode]):
+        solve_scenario(scenario, run_config)
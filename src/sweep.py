@@ -0,0 +1,200 @@
+# sweep.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+import io
+import csv
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+
+# Projektstruktur für Import anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+# Lokale Module
+from config import RunConfig, SEED, SUCCESS_WINDOW, SWEEP_GRID, SWEEP_BATCH_ENVS
+
+# Utils
+from utils.batch_training import train_batched
+from utils.planning import optimality_gap
+
+# ============================================================================
+# Konfiguration
+# ============================================================================
+
+PARAMETERS = list(SWEEP_GRID)
+METRICS = ["success_rate", "final_success_rate", "mean_reward", "mean_steps", "optimality_gap", "duration_s"]
+FIELDS = ["scenario"] + PARAMETERS + METRICS
+
+# ============================================================================
+# Konfigurationen erzeugen
+# ============================================================================
+
+# Alle Kombinationen des Gitters je Szenario
+def expand_grid(scenarios, grid):
+    return [{"scenario": scenario, **dict(zip(grid, values))}
+            for scenario in scenarios for values in itertools.product(*grid.values())]
+
+
+# Zufallssuche: je Szenario n Ziehungen (ohne Duplikate) aus den Wertebereichen
+def random_search(scenarios, grid, n_samples, seed=SEED):
+    rng = np.random.default_rng(seed)
+    runs = {}
+    n_combinations = int(np.prod([len(values) for values in grid.values()]))
+    for scenario in scenarios:
+        sampled = set()
+        while len(sampled) < min(n_samples, n_combinations):
+            sampled.add(tuple(rng.integers(len(values)) for values in grid.values()))
+        for indices in sorted(sampled):
+            run = {"scenario": scenario, **{name: grid[name][i] for name, i in zip(grid, indices)}}
+            runs[run_key(run)] = run
+    return list(runs.values())
+
+
+# Eindeutiger Schlüssel eines Laufs (wie in der CSV gespeichert)
+def run_key(run):
+    return tuple(str(run[field]) for field in ["scenario"] + PARAMETERS)
+
+
+# Bereits abgeschlossene Läufe aus der Ergebnistabelle (Wiederaufnahme). Eine Tabelle mit
+# anderem Kopf (z. B. nach Änderung von SWEEP_GRID) wird nicht fortgesetzt; unvollständige
+# Zeilen (Abbruch während des Schreibens) werden verworfen und ihre Läufe wiederholt.
+def load_completed(path):
+    if not os.path.exists(path) or os.path.getsize(path) == 0:
+        return set()
+    with open(path, newline="", encoding="utf-8") as f:
+        content = f.read()
+    reader = csv.DictReader(io.StringIO(content))
+    if reader.fieldnames != FIELDS:
+        raise ValueError(f"Kopf von {path} passt nicht zu SWEEP_GRID ({reader.fieldnames} statt {FIELDS}); "
+                         f"Datei verschieben oder SWEEP_RESULTS_PATH ändern")
+
+    rows = list(reader)
+    complete = [row for row in rows if None not in row and all(row[field] not in (None, "") for field in FIELDS)]
+    # Letzte Zeile ohne Zeilenende wurde beim Schreiben abgebrochen
+    if complete and complete[-1] is rows[-1] and not content.endswith("\n"):
+        complete.pop()
+    if len(complete) < len(rows):
+        print(f"Warnung: {len(rows) - len(complete)} unvollständige Zeile(n) in {path} verworfen")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=FIELDS)
+            writer.writeheader()
+            writer.writerows(complete)
+    return {run_key(row) for row in complete}
+
+# ============================================================================
+# Einzelner Lauf (Worker-Prozess)
+# ============================================================================
+
+# RunConfig eines Gitterpunkts: base_config mit Szenario und den Werten aus SWEEP_GRID
+# (Gitterparameter sind Felder von RunConfig)
+def run_config_for(run, base_config):
+    values = {name: type(getattr(base_config, name))(run[name]) for name in PARAMETERS}
+    return base_config.with_overrides(env_mode=run["scenario"], batch_envs=SWEEP_BATCH_ENVS, **values)
+
+
+# Training mit den Parametern eines Laufs und Kennzahlen als Tabellenzeile
+def run_configuration(run, base_config):
+    start_time = time.perf_counter()
+    config = run_config_for(run, base_config)
+    Q, rewards, success, steps = train_batched(
+        config.env_mode, config.episodes, config.batch_envs, alpha=config.alpha, gamma=config.gamma,
+        epsilon=config.epsilon, max_steps=config.max_steps, seed=config.seed, config=config)
+    gap = optimality_gap(Q, config.env_mode, config.gamma, config=config)
+
+    return {
+        **run,
+        "success_rate": float(np.mean(success)),
+        "final_success_rate": float(np.mean(success[-SUCCESS_WINDOW:])),
+        "mean_reward": float(np.mean(rewards)),
+        "mean_steps": float(np.mean(steps)),
+        "optimality_gap": gap["gap"],
+        "duration_s": time.perf_counter() - start_time
+    }
+
+# ============================================================================
+# Sweep
+# ============================================================================
+
+# Offene Läufe auf den Prozesspool verteilen; Ergebnisse werden in Abschlussreihenfolge
+# sofort an die CSV angehängt, abgebrochene Sweeps setzen beim nächsten Start fort.
+# Fehlgeschlagene Läufe werden gemeldet und nicht geschrieben, also beim nächsten Start wiederholt.
+# Ergebnispfad und Worker-Anzahl kommen aus base_config (sweep_results_path, sweep_workers).
+def run_sweep(runs, base_config):
+    path = base_config.sweep_results_path
+    workers = RunConfig.worker_count(base_config.sweep_workers)
+    completed = load_completed(path)
+    pending = [run for run in runs if run_key(run) not in completed]
+    print(f"Sweep: {len(runs)} Konfigurationen, {len(runs) - len(pending)} bereits vorhanden, "
+          f"{len(pending)} offen, {workers} Prozesse")
+    if not pending:
+        return
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    write_header = not os.path.exists(path) or os.path.getsize(path) == 0
+    start_time = time.perf_counter()
+
+    with open(path, "a", newline="", encoding="utf-8") as f, ProcessPoolExecutor(max_workers=workers) as pool:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if write_header:
+            writer.writeheader()
+
+        futures = {pool.submit(run_configuration, run, base_config): run for run in pending}
+        failed = 0
+        for done, future in enumerate(as_completed(futures), start=1):
+            try:
+                row = future.result()
+            except Exception as error:
+                run = futures[future]
+                failed += 1
+                print(f"  FEHLER in {run['scenario']} α={run['alpha']} γ={run['gamma']} ε={run['epsilon']} "
+                      f"Seed={run['seed']}: {type(error).__name__}: {error}")
+                continue
+            writer.writerow(row)
+            f.flush()
+
+            if done % max(1, len(pending) // 20) == 0 or done == len(pending):
+                elapsed = time.perf_counter() - start_time
+                print(f"  {done}/{len(pending)} Läufe ({elapsed:.1f} s, {done / elapsed:.1f} Läufe/s) – "
+                      f"zuletzt {row['scenario']} α={row['alpha']} γ={row['gamma']} ε={row['epsilon']}: "
+                      f"Erfolgsrate {row['final_success_rate'] * 100:.1f}%")
+
+    if failed:
+        print(f"{failed} von {len(pending)} Läufen fehlgeschlagen; sie werden beim nächsten Start wiederholt")
+
+
+# Beste Konfigurationen je Szenario aus der Ergebnistabelle
+def print_best_configurations(path, top=3):
+    with open(path, newline="", encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+
+    print(f"\n" + "=" * 60)
+    print(f"SWEEP-ERGEBNISSE ({len(rows)} Läufe, {path})")
+    print("=" * 60)
+    for scenario in sorted({row["scenario"] for row in rows}):
+        ranked = sorted((row for row in rows if row["scenario"] == scenario),
+                        key=lambda row: (-float(row["final_success_rate"]), float(row["optimality_gap"])))
+        print(f"\n{scenario}:")
+        for row in ranked[:top]:
+            print(f"  α={row['alpha']}, γ={row['gamma']}, ε={row['epsilon']}, Episoden={row['episodes']}, "
+                  f"Seed={row['seed']}: Erfolgsrate {float(row['final_success_rate']) * 100:.1f}%, "
+                  f"Lücke zur Oracle-Schranke {float(row['optimality_gap']):.3f}")
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+if __name__ == "__main__":
+    run_config = RunConfig.from_env()
+    scenarios = run_config.sweep_scenarios.split(",") if run_config.sweep_scenarios else [run_config.env_mode]
+    if run_config.sweep_samples > 0:
+        runs = random_search(scenarios, SWEEP_GRID, run_config.sweep_samples)
+    else:
+        runs = expand_grid(scenarios, SWEEP_GRID)
+    run_sweep(runs, run_config)
+    print_best_configurations(run_config.sweep_results_path)
@@ -6,98 +6,261 @@
 
 import sys
 import os
+import json
+import dataclasses
 import numpy as np
 
 # Projektstruktur für Import anpassen
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), ".")))
 
-# ENV_MODE flexibel setzen (über Umgebungsvariable oder config.py)
-ENV_MODE = os.getenv("ENV_MODE", None)
-if ENV_MODE is None:
-    from config import ENV_MODE as CONFIG_ENV_MODE
-    ENV_MODE = CONFIG_ENV_MODE
-
 # Lokale Module
-from config import EPISODES, MAX_STEPS, EPSILON, ALPHA, GAMMA, SEED
+from config import RunConfig, TARGET_SUCCESS_RATE, SUCCESS_WINDOW, TRAJECTORY_PATH
 
 # Utils
 from utils.common import set_all_seeds, obs_to_state, check_success, setup_export
 from utils.environment import initialize_environment
-from utils.qlearning import initialize_q_table, select_action, update_q_value, save_q_table
-from utils.visualization import create_learning_curve, create_success_curve, create_training_statistics
-from utils.reporting import print_training_results
-from utils.evaluation_export import create_combined_curve_pdf
+from utils.qlearning import (initialize_q_table, select_action, update_q_value, save_q_table,
+                             PrioritizedSweepingLearner)
+from utils.planning import solve_q_star, optimality_gap
+from utils.batch_training import train_batched
+from utils.replay import ExperienceReplayLearner, DynaQLearner
+from utils.evaluation import episodes_to_target
+from utils.convergence import ConvergenceTracker, scheduled_value
+from utils.artifact_cache import cache_key, load_artifacts, store_artifacts
+from utils.trajectory import TrajectoryRecorder
+from utils.reporting import print_training_results, print_optimality_gap, print_sample_efficiency
 
-SHOW_VISUALIZATIONS = os.getenv("SHOW_VISUALIZATIONS", "true").lower() == "true"
+LEARNERS = ("qlearning", "replay", "dyna", "prioritized")
+
+# ============================================================================
+# Hilfsfunktionen
+# ============================================================================
+
+# Lernverfahren mit Wiederverwendung von Übergängen erzeugen (None = klassisches Q-Learning)
+def create_learner(learner_name, n_states, n_actions, config):
+    if learner_name == "replay":
+        return ExperienceReplayLearner(alpha=config.alpha, gamma=config.gamma, seed=config.seed)
+    if learner_name == "dyna":
+        return DynaQLearner(n_states, n_actions, alpha=config.alpha, gamma=config.gamma, seed=config.seed)
+    if learner_name == "prioritized":
+        return PrioritizedSweepingLearner(n_states, n_actions, alpha=config.alpha, gamma=config.gamma)
+    return None
+
+# Metadaten für den Kopf der gespeicherten Q-Tabelle
+def q_table_metadata(config, training_info):
+    return {
+        "grid_size": config.grid_size,
+        "scenario": training_info["scenario"],
+        "learner": training_info["learner"],
+        "alpha": config.alpha,
+        "gamma": config.gamma,
+        "epsilon": config.epsilon,
+        "seed": config.seed,
+        "episodes_run": training_info["episodes_run"],
+        "episodes_max": training_info["episodes_max"],
+        "rewards": dataclasses.asdict(config.rewards)
+    }
+
+# Ergebnisse eines unveränderten Laufs aus dem Artefakt-Cache übernehmen: Q-Tabelle,
+# Kurven und Kennzahlen werden exportiert wie nach einem Training, Plots entfallen
+def restore_cached_run(scenario, config, cached):
+    setup_export()
+    Q = cached["Q"]
+    rewards_per_episode, success_per_episode = cached["rewards"], cached["success"]
+    training_info = {**cached["metrics"], "cached": True}
+
+    print(f"Cache-Treffer für {scenario} ({config.env_mode}): Training und Plots übersprungen")
+    print(f"  Episoden: {training_info['episodes_run']}, Erfolgsrate: {training_info['success_rate']:.1f}%, "
+          f"Ø Reward: {training_info['avg_reward']:.2f}")
+    save_q_table(Q, config.env_mode, q_table_metadata(config, training_info), config.q_export_dtype)
+
+    with open(f"exports/training_info_{scenario}.json", "w", encoding="utf-8") as f:
+        json.dump(training_info, f, indent=2)
+    np.save(f"exports/learning_curve_{scenario}.npy", rewards_per_episode)
+    np.save(f"exports/success_curve_{scenario}.npy", success_per_episode)
+
+    return Q, rewards_per_episode, success_per_episode, np.sum(rewards_per_episode), training_info
 
 # ============================================================================
 # Hauptfunktion
 # ============================================================================
 
-def train_agent(scenario):
+# Training eines Szenarios; liefert Q-Tabelle, Kurven, Gesamtreward und Kennzahlen (training_info).
+# Lernverfahren, Schedules, Datentypen, Cache und Plots kommen aus config (RunConfig); ohne config
+# gelten die Standardwerte aus config.py. env_mode und show_visualizations überschreiben die
+# entsprechenden Felder, falls angegeben.
+def train_agent(scenario, env_mode=None, show_visualizations=None, config=None):
+    config = config if config is not None else RunConfig()
+    if env_mode is not None:
+        config = config.with_overrides(env_mode=env_mode)
+    env_mode = config.env_mode
+    show_visualizations = show_visualizations if show_visualizations is not None else config.show_visualizations
+
+    # Lernverfahren prüfen; Batch-Training nutzt ausschließlich klassisches Q-Learning
+    if config.learner not in LEARNERS:
+        raise ValueError(f"Unbekanntes Lernverfahren {config.learner!r}, erlaubt: {', '.join(LEARNERS)}")
+    if config.batch_envs > 0 and config.learner != "qlearning":
+        raise ValueError(f"BATCH_ENVS={config.batch_envs} unterstützt nur LEARNER=qlearning, "
+                         f"nicht {config.learner}")
+
+    # Unveränderte Läufe (Konfiguration inkl. Trainingsoptionen, Quellcode) aus dem Cache laden;
+    # ein Cache-Treffer würde keine Trajektorien erzeugen, Aufzeichnung trainiert daher immer neu
+    key = cache_key(config, scenario)
+    if config.artifact_cache and config.record_trajectories:
+        print("Trajektorien-Aufzeichnung aktiv: Artefakt-Cache wird für das Laden übergangen")
+    elif config.artifact_cache:
+        cached = load_artifacts(key)
+        if cached is not None:
+            return restore_cached_run(scenario, config, cached)
+
     # Seed für Reproduzierbarkeit setzen
-    set_all_seeds()
+    set_all_seeds(config.seed)
 
     # Initialisierung
-    env, grid_size = initialize_environment(ENV_MODE)
-    Q, n_states, n_actions = initialize_q_table(env)
+    env, grid_size = initialize_environment(env_mode, config)
+    Q, n_states, n_actions = initialize_q_table(env, config.q_dtype)
+    learner = create_learner(config.learner, n_states, n_actions, config)
     setup_export()
 
+    if config.warm_start:
+        Q[:] = solve_q_star(env_mode, config.gamma, grid_size=grid_size, rewards=config.rewards)[0]
+        print("Warmstart: Q-Tabelle mit Q* initialisiert")
+
     # Tracking-Listen
     rewards_per_episode = []
     success_per_episode = []
     steps_per_episode = []
 
-    print(f"Starte Training mit {EPISODES} Episoden...")
-    print(f"Episodes: {EPISODES}")
+    print(f"Starte Training mit {config.episodes} Episoden...")
+    print(f"Episodes: {config.episodes}")
     print("Hyperparameter:")
-    print(f"  Lernrate (α): {ALPHA}")
-    print(f"  Discount Factor (γ): {GAMMA}")
-    print(f"  Epsilon (ε): {EPSILON}")
-    print(f"  Seed: {SEED}")
-
-    for episode in range(EPISODES):
-        obs, _ = env.reset()
-        state = obs_to_state(obs, ENV_MODE, grid_size)
-        total_reward = 0
-        steps = 0
-        success = False
-
-        for step in range(MAX_STEPS):
-            action = select_action(Q, state, EPSILON, n_actions)
-            obs, reward, terminated, truncated, _ = env.step(action)
-            next_state = obs_to_state(obs, ENV_MODE, grid_size)
-            done = terminated or truncated
-
-            update_q_value(Q, state, action, reward, next_state)
-
-            state = next_state
-            total_reward += reward
-            steps += 1
-
-            if check_success(reward, ENV_MODE):
-                success = True
-
-            if done:
+    print(f"  Lernrate (α): {config.alpha}")
+    print(f"  Discount Factor (γ): {config.gamma}")
+    print(f"  Epsilon (ε): {config.epsilon}")
+    print(f"  Seed: {config.seed}")
+    print(f"  Schedules: ε={config.epsilon_schedule}, α={config.alpha_schedule}")
+    print(f"Lernverfahren: {config.learner}")
+
+    tracker = ConvergenceTracker(Q)
+    epsilon, alpha = config.epsilon, config.alpha
+
+    # Batch-Training: Schedules nach Anzahl beendeter Episoden, Konvergenz je Schritt
+    if config.batch_envs > 0:
+        print(f"Batch-Training: {config.batch_envs} parallele Episoden (vektorisierte Umgebung)")
+        Q, rewards_per_episode, success_per_episode, steps_per_episode = train_batched(
+            env_mode, config.episodes, config.batch_envs, alpha=config.alpha, gamma=config.gamma,
+            epsilon=config.epsilon, max_steps=config.max_steps, seed=config.seed, Q=Q, config=config,
+            tracker=tracker)
+        last_episode = len(rewards_per_episode) - 1
+        epsilon = scheduled_value(config.epsilon_schedule, config.epsilon, config.epsilon_min,
+                                  config.epsilon_decay, last_episode, config.episodes)
+        alpha = scheduled_value(config.alpha_schedule, config.alpha, config.alpha_min, config.alpha_decay,
+                                last_episode, config.episodes)
+        if config.early_stopping and tracker.converged:
+            print(f"Early Stopping: Konvergenz nach {len(rewards_per_episode)} Episoden "
+                  f"({tracker.patience} stabile Episoden in Folge)")
+    else:
+        # Schritte der klassischen Trainingsschleife aufzeichnen (Episode = Trainingsepisode)
+        recorder = None
+        if config.record_trajectories:
+            recorder = TrajectoryRecorder(os.path.join(TRAJECTORY_PATH, f"train_{scenario}"),
+                                          metadata={"source": "train", "scenario": scenario, "env_mode": env_mode,
+                                                    "learner": config.learner, "seed": config.seed})
+
+        for episode in range(config.episodes):
+            epsilon = scheduled_value(config.epsilon_schedule, config.epsilon, config.epsilon_min,
+                                      config.epsilon_decay, episode, config.episodes)
+            alpha = scheduled_value(config.alpha_schedule, config.alpha, config.alpha_min, config.alpha_decay,
+                                    episode, config.episodes)
+            if learner is not None:
+                learner.alpha = alpha
+
+            obs, _ = env.reset()
+            state = obs_to_state(obs, env_mode, grid_size)
+            total_reward = 0
+            steps = 0
+            success = False
+
+            for step in range(config.max_steps):
+                action = select_action(Q, state, epsilon, n_actions)
+                obs, reward, terminated, truncated, info = env.step(action)
+                next_state = obs_to_state(obs, env_mode, grid_size)
+                if recorder is not None:
+                    recorder.record(episode, step, state, action, reward, info["outcome"])
+                done = terminated or truncated
+
+                if learner is not None:
+                    learner.observe(Q, state, action, reward, next_state, terminated)
+                else:
+                    update_q_value(Q, state, action, reward, next_state, alpha, config.gamma, terminated)
+
+                state = next_state
+                total_reward += reward
+                steps += 1
+
+                if check_success(reward, env_mode, config.rewards):
+                    success = True
+
+                if done:
+                    break
+
+            rewards_per_episode.append(total_reward)
+            success_per_episode.append(1 if success else 0)
+            steps_per_episode.append(steps)
+            converged = tracker.update(Q, success)
+
+            if (episode + 1) % max(1, config.episodes // 10) == 0:
+                recent_episodes = min(100, episode + 1)
+                recent_success_rate = np.mean(success_per_episode[-recent_episodes:]) * 100
+                print(f"Episode {episode + 1}/{config.episodes}: "
+                      f"Reward={total_reward:.2f}, Steps={steps}, "
+                      f"Erfolgsrate (letzte {recent_episodes}): {recent_success_rate:.1f}%, "
+                      f"max |ΔQ|={tracker.max_delta[-1]:.4f}")
+
+            if config.early_stopping and converged:
+                print(f"Early Stopping: Konvergenz nach {episode + 1} Episoden "
+                      f"({tracker.patience} stabile Episoden in Folge)")
                 break
 
-        rewards_per_episode.append(total_reward)
-        success_per_episode.append(1 if success else 0)
-        steps_per_episode.append(steps)
+        if recorder is not None:
+            recorder.close()
 
-        if (episode + 1) % max(1, EPISODES // 10) == 0:
-            recent_episodes = min(100, episode + 1)
-            recent_success_rate = np.mean(success_per_episode[-recent_episodes:]) * 100
-            print(f"Episode {episode + 1}/{EPISODES}: "
-                  f"Reward={total_reward:.2f}, Steps={steps}, "
-                  f"Erfolgsrate (letzte {recent_episodes}): {recent_success_rate:.1f}%")
+    print_training_results(rewards_per_episode, success_per_episode, steps_per_episode, config)
+    updates = learner.updates if learner is not None else int(np.sum(steps_per_episode))
+    print_sample_efficiency(config.learner, steps_per_episode,
+                            success_per_episode, updates,
+                            episodes_to_target(success_per_episode, TARGET_SUCCESS_RATE, SUCCESS_WINDOW),
+                            TARGET_SUCCESS_RATE, SUCCESS_WINDOW)
+    print_optimality_gap(optimality_gap(Q, env_mode, config.gamma, grid_size, config.rewards, config), env_mode)
 
-    print_training_results(rewards_per_episode, success_per_episode, steps_per_episode)
-    save_q_table(Q, ENV_MODE)
+    # Tatsächlich gelaufene Episoden, Konvergenzstatus und Kennzahlen speichern
+    training_info = {
+        "scenario": scenario,
+        "learner": config.learner,
+        "episodes_run": len(rewards_per_episode),
+        "episodes_max": config.episodes,
+        "early_stopping": config.early_stopping and config.batch_envs == 0,
+        "final_epsilon": epsilon,
+        "final_alpha": alpha,
+        **tracker.summary(),
+        "success_rate": float(np.mean(success_per_episode)) * 100,
+        "total_reward": float(np.sum(rewards_per_episode)),
+        "avg_reward": float(np.mean(rewards_per_episode)),
+        "avg_steps": float(np.mean(steps_per_episode)),
+        "reward_variance": float(np.var(rewards_per_episode)),
+        "cached": False
+    }
+    save_q_table(Q, env_mode, q_table_metadata(config, training_info), config.q_export_dtype)
+    with open(f"exports/training_info_{scenario}.json", "w", encoding="utf-8") as f:
+        json.dump(training_info, f, indent=2)
+    if config.artifact_cache:
+        store_artifacts(key, Q, rewards_per_episode, success_per_episode, steps_per_episode, training_info)
 
-    create_learning_curve(rewards_per_episode, ENV_MODE, show=SHOW_VISUALIZATIONS)
-    create_success_curve(success_per_episode, ENV_MODE, show=SHOW_VISUALIZATIONS)
-    create_training_statistics(rewards_per_episode, success_per_episode, ENV_MODE, show=SHOW_VISUALIZATIONS)
+    # matplotlib erst hier laden, damit der Import von train.py schnell bleibt
+    from utils.visualization import create_learning_curve, create_success_curve, create_training_statistics
+    create_learning_curve(rewards_per_episode, env_mode, show=show_visualizations)
+    create_success_curve(success_per_episode, env_mode, show=show_visualizations)
+    create_training_statistics(rewards_per_episode, success_per_episode, env_mode, show=show_visualizations)
 
     # Erweiterte Konsolenausgabe: Reward-Varianz und durchschnittliche Schritte
     reward_mean = np.mean(rewards_per_episode)
@@ -124,13 +287,12 @@ def train_agent(scenario):
     np.save(f"exports/learning_curve_{scenario}.npy", rewards_per_episode)
     np.save(f"exports/success_curve_{scenario}.npy", success_per_episode)
 
-    return Q, rewards_per_episode, success_per_episode, reward_total
+    return Q, rewards_per_episode, success_per_episode, reward_total, training_info
 
 # ============================================================================
 # Ausführung
 # ============================================================================
 
 if __name__ == "__main__":
-    import os
-    scenario = os.getenv("ENV_MODE", "static")  # oder eine andere Methode, deinen Szenarionamen zu setzen
-    train_agent(scenario)
\ No newline at end of file
+    run_config = RunConfig.from_env()
+    train_agent(run_config.env_mode, config=run_config)
\ No newline at end of file
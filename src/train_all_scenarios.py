@@ -6,15 +6,18 @@
 
 import sys
 import os
+import io
 import time
-import subprocess
-from datetime import datetime
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Projektstruktur für Import anpassen
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
 
+from config import RunConfig
 from utils.common import setup_export
 from utils.evaluation_export import export_results_to_csv, create_combined_curve_pdf  # beide Funktionen
+from train import train_agent
 
 # ============================================================================
 # Konfiguration
@@ -48,120 +51,97 @@ SCENARIOS = {
     }
 }
 
-SHOW_VISUALIZATIONS = False
-PARALLEL_TRAINING = False
+MAX_WORKERS = len(SCENARIOS)  # ein Worker-Prozess je Szenario
 
 # ============================================================================
 # Ausführung des Trainings für ein einzelnes Szenario
 # ============================================================================
 
-def run_training_for_scenario(scenario_name, scenario_config):
+# Training eines Szenarios über train_agent (ohne Plotfenster); Konsolenausgabe wird
+# gepuffert, damit sich die Logs paralleler Worker nicht vermischen
+def run_training_for_scenario(scenario_name, scenario_config, run_config):
+    start_time = time.time()
+    log = io.StringIO()
+    run_config = run_config.with_overrides(env_mode=scenario_config["env_mode"], show_visualizations=False)
+
+    try:
+        with redirect_stdout(log):
+            _, _, _, _, training_info = train_agent(scenario_name, config=run_config)
+        return {"name": scenario_name, "success": True, "duration": time.time() - start_time,
+                "log": log.getvalue(), **training_info}
+    except Exception as e:
+        return {"name": scenario_name, "success": False, "duration": time.time() - start_time,
+                "log": log.getvalue(), "error": repr(e)}
+
+
+# Ausgabe von Kopfzeile und Log eines abgeschlossenen Szenarios
+def print_scenario_result(index, result):
+    scenario_config = SCENARIOS[result["name"]]
     print(f"\n{'=' * 60}")
-    print(f"STARTE TRAINING: {scenario_name.upper()}")
+    print(f"[{index}/{len(SCENARIOS)}] TRAINING: {result['name'].upper()}")
     print(f"{'=' * 60}")
     print(f"Beschreibung: {scenario_config['description']}")
     print(f"Modus: {scenario_config['env_mode']}")
     print(f"Umgebung: {scenario_config['environment']}")
 
-    start_time = time.time()
+    for line in result["log"].splitlines():
+        if line.strip():
+            print(f"  {line}")
 
-    try:
-        # Übergabe von Umgebungsvariablen zur Steuerung des Trainings
-        env = os.environ.copy()
-        env["ENV_MODE"] = scenario_config["env_mode"]
-        env["EXPORT_PDF"] = "False" if not SHOW_VISUALIZATIONS else "True"
-        env["SHOW_VISUALIZATIONS"] = "False" if not SHOW_VISUALIZATIONS else "True"
-
-        # Aufruf des Trainingsscripts mit Übergabe der Konfiguration
-        result = subprocess.run(
-            [sys.executable, "train.py"],
-            capture_output=True,
-            text=True,
-            encoding="utf-8",
-            timeout=1800,
-            env=env
-        )
-
-        duration = time.time() - start_time
-
-        if result.returncode == 0:
-            print(f"✅ Training erfolgreich abgeschlossen ({duration:.1f}s)")
-            print(f"Q-Tabelle gespeichert: q_table_{scenario_config['env_mode']}.npy")
-            output_lines = result.stdout.split('\n')
-            for line in output_lines:
-                if line.strip():
-                    print(f"  {line}")
-        else:
-            print(f"❌ Training fehlgeschlagen ({duration:.1f}s)")
-            print(f"Fehler: {result.stderr}")
-
-        return result.returncode == 0, result.stdout
-
-    except subprocess.TimeoutExpired:
-        print(f"⏰ Training-Timeout nach 30min")
-        return False, ""
-    except Exception as e:
-        print(f"❌ Unerwarteter Fehler: {e}")
-        return False, ""
+    if result["success"]:
+        print(f"✅ Training erfolgreich abgeschlossen ({result['duration']:.1f}s)")
+        print(f"Q-Tabelle gespeichert: q_table_{scenario_config['env_mode']}.npy")
+    else:
+        print(f"❌ Training fehlgeschlagen ({result['duration']:.1f}s)")
+        print(f"Fehler: {result['error']}")
 
 # ============================================================================
 # Hauptfunktion zur Ausführung aller Szenarien
 # ============================================================================
 
-def train_all_scenarios():
+# Training aller Szenarien (run_config: RunConfig, Standardwerte aus config.py)
+def train_all_scenarios(run_config=None):
+    run_config = run_config if run_config is not None else RunConfig()
     print("🏗️  MULTI-SZENARIO TRAINING")
     print(f"Anzahl Szenarien: {len(SCENARIOS)}")
-    print(f"Training-Modus: {'Parallel' if PARALLEL_TRAINING else 'Sequenziell'}")
+    print(f"Training-Modus: {'Parallel' if run_config.parallel_training else 'Sequenziell'}")
 
     # Sicherstellen, dass Exportordner vorhanden ist
     setup_export()
-
-    if PARALLEL_TRAINING:
-        print("⚠️  Parallel Training ist derzeit deaktiviert")
-        return []
-
+    start_time = time.time()
     results = {}
-    scenario_results = []
-
-    for i, (scenario_name, scenario_config) in enumerate(SCENARIOS.items(), 1):
-        print(f"\n[{i}/{len(SCENARIOS)}] Nächstes Szenario: {scenario_name}")
-        success, stdout = run_training_for_scenario(scenario_name, scenario_config)
-        results[scenario_name] = success
-        time.sleep(2)
-
-        # Hilfsfunktion zum Extrahieren numerischer Werte aus der Konsolenausgabe
-        def extract_value(label, text, cast_fn=float):
-            for line in text.splitlines():
-                if label in line:
-                    try:
-                        return cast_fn(line.split(":")[1].split()[0])
-                    except (IndexError, ValueError):
-                        return None
-            return None
-
-        # Sammeln der Metriken pro Szenario
-        scenario_results.append({
-            "name": scenario_name,
-            "success_rate": extract_value("Erfolgreiche Episoden", stdout, lambda x: float(x.split("/")[0]) / float(x.split("/")[1].strip("()")) * 100),
-            "total_reward": extract_value("Gesamtreward", stdout),
-            "avg_reward": extract_value("Durchschnitt", stdout),
-            "avg_steps": extract_value("Durchschnittliche Schritte", stdout),
-            "reward_variance": extract_value("Varianz", stdout)
-        })
+
+    if run_config.parallel_training:
+        print(f"Worker-Prozesse: {MAX_WORKERS}")
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS) as pool:
+            futures = [pool.submit(run_training_for_scenario, name, config, run_config)
+                       for name, config in SCENARIOS.items()]
+            for i, future in enumerate(as_completed(futures), 1):
+                result = future.result()
+                results[result["name"]] = result
+                print_scenario_result(i, result)
+    else:
+        for i, (scenario_name, scenario_config) in enumerate(SCENARIOS.items(), 1):
+            result = run_training_for_scenario(scenario_name, scenario_config, run_config)
+            results[scenario_name] = result
+            print_scenario_result(i, result)
 
     print(f"\n{'=' * 60}")
     print("TRAINING ZUSAMMENFASSUNG")
     print(f"{'=' * 60}")
 
-    # Zusammenfassung in Konsole
-    for scenario_name, success in results.items():
-        status = "✅ Erfolgreich" if success else "❌ Fehlgeschlagen"
-        q_table_exists = os.path.exists(f"q_table_{SCENARIOS[scenario_name]['env_mode']}.npy")
+    # Zusammenfassung in Konsole (Reihenfolge wie SCENARIOS)
+    scenario_results = [results[name] for name in SCENARIOS]
+    for result in scenario_results:
+        status = "✅ Erfolgreich" if result["success"] else "❌ Fehlgeschlagen"
+        q_table_exists = os.path.exists(f"q_table_{SCENARIOS[result['name']]['env_mode']}.npy")
         q_table_status = "Q-Tabelle ✓" if q_table_exists else "Q-Tabelle ✗"
-        print(f"{scenario_name:<20} {status:<15} {q_table_status}")
+        cache_status = "  [Cache]" if result.get("cached") else ""
+        print(f"{result['name']:<20} {status:<15} {q_table_status}  ({result['duration']:.1f}s){cache_status}")
+    print(f"Gesamtdauer: {time.time() - start_time:.1f}s")
 
     # Export als CSV-Datei
-    export_results_to_csv(scenario_results)
+    export_results_to_csv([result for result in scenario_results if result["success"]])
     return scenario_results
 
 # ============================================================================
@@ -169,9 +149,15 @@ def train_all_scenarios():
 # ============================================================================
 
 if __name__ == "__main__":
-    scenario_results = train_all_scenarios()
+    scenario_results = train_all_scenarios(RunConfig.from_env())
 
     # Erzeugung kombinierter PDF-Grafiken für Lernverlauf und Erfolgsquote
-    scenario_names = [result["name"] for result in scenario_results]
-    create_combined_curve_pdf(scenario_names, export_dir="exports", metric="learning")
-    create_combined_curve_pdf(scenario_names, export_dir="exports", metric="success")
+    # (entfällt, wenn alle Szenarien aus dem Cache kamen und die Grafiken existieren)
+    scenario_names = [result["name"] for result in scenario_results if result["success"]]
+    combined_pdfs = [f"exports/combined/train_{metric}_curve_combined.pdf" for metric in ("learning", "success")]
+    all_cached = all(result.get("cached") for result in scenario_results)
+    if all_cached and all(os.path.exists(path) for path in combined_pdfs):
+        print("Kombinierte Grafiken unverändert (alle Szenarien aus dem Cache)")
+    else:
+        create_combined_curve_pdf(scenario_names, export_dir="exports", metric="learning")
+        create_combined_curve_pdf(scenario_names, export_dir="exports", metric="success")
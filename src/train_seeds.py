@@ -0,0 +1,72 @@
+# train_seeds.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import sys
+import os
+import time
+import numpy as np
+
+# Projektstruktur für Import anpassen
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '.')))
+
+# Lokale Module
+from config import RunConfig, SUCCESS_WINDOW
+
+# Utils
+from utils.batch_training import train_multi_seed
+from utils.evaluation import summarize_seeds
+
+# ============================================================================
+# Auswertung
+# ============================================================================
+
+# Gleitende Erfolgsrate je Seed (Fenster SUCCESS_WINDOW, am Anfang kürzer)
+def rolling_success(success, window=SUCCESS_WINDOW):
+    cumulative = np.cumsum(success, axis=1)
+    shifted = np.zeros_like(cumulative)
+    shifted[:, window:] = cumulative[:, :-window]
+    lengths = np.minimum(np.arange(1, success.shape[1] + 1), window)
+    return (cumulative - shifted) / lengths
+
+
+# Ausgabe der Zusammenfassung über alle Seeds
+def print_seed_summary(results, duration, env_mode):
+    n_seeds, episodes = results["rewards"].shape
+    success_summary = summarize_seeds(rolling_success(results["success"]))
+    reward_summary = summarize_seeds(results["rewards"].mean(axis=1))
+    final_success = summarize_seeds(results["success"][:, -SUCCESS_WINDOW:].mean(axis=1))
+
+    print(f"\n" + "=" * 60)
+    print(f"MULTI-SEED TRAINING ({n_seeds} Seeds x {episodes} Episoden, Modus: {env_mode})")
+    print("=" * 60)
+    print(f"\nDauer: {duration:.2f} s")
+    print(f"Ø Reward pro Episode: {reward_summary['mean']:.2f} "
+          f"(95%-KI {reward_summary['ci_low']:.2f} - {reward_summary['ci_high']:.2f})")
+    print(f"Erfolgsrate letzte {SUCCESS_WINDOW} Episoden: {final_success['mean'] * 100:.1f}% "
+          f"(95%-KI {final_success['ci_low'] * 100:.1f}% - {final_success['ci_high'] * 100:.1f}%)")
+
+    print(f"\nGleitende Erfolgsrate (Mittel ± KI über Seeds):")
+    for episode in np.linspace(0, episodes - 1, 6, dtype=int)[1:]:
+        print(f"  Episode {episode + 1}: {success_summary['mean'][episode] * 100:.1f}% "
+              f"± {(success_summary['ci_high'][episode] - success_summary['mean'][episode]) * 100:.1f}")
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+if __name__ == "__main__":
+    run_config = RunConfig.from_env()
+    env_mode = run_config.env_mode
+    start_time = time.perf_counter()
+    results = train_multi_seed(env_mode, run_config.n_seeds, run_config.episodes, alpha=run_config.alpha,
+                               gamma=run_config.gamma, epsilon=run_config.epsilon, max_steps=run_config.max_steps,
+                               seed=run_config.seed, config=run_config)
+    print_seed_summary(results, time.perf_counter() - start_time, env_mode)
+
+    # Kurven je Seed und Q-Tensor speichern
+    os.makedirs("exports", exist_ok=True)
+    np.savez(f"exports/multi_seed_{env_mode}.npz", **results)
+    print(f"\nErgebnisse gespeichert: exports/multi_seed_{env_mode}.npz")
@@ -1,26 +1,38 @@
 # utils/__init__.py
 
-from .common import set_all_seeds, obs_to_state, check_success, setup_export
-from .environment import initialize_environment, initialize_environment_for_scenario
-from .qlearning import (initialize_q_table, select_action, update_q_value,
-                       save_q_table, load_q_table, get_best_action)
-from .evaluation import classify_episode_result, calculate_metrics, check_loop_detection
-from .position import get_position, pos_to_state_grid, state_to_pos_grid
-from .visualization import (create_learning_curve, create_success_curve,
-                           create_training_statistics, create_success_plot,
-                           create_reward_histogram, create_comparison_table,
-                           create_success_rate_comparison, create_stacked_failure_chart)
-from .reporting import print_training_results, print_evaluation_results
-
-__all__ = [
-    'set_all_seeds', 'obs_to_state', 'check_success', 'setup_export',
-    'initialize_environment', 'initialize_environment_for_scenario',
-    'initialize_q_table', 'select_action', 'update_q_value',
-    'save_q_table', 'load_q_table', 'get_best_action',
-    'classify_episode_result', 'calculate_metrics', 'check_loop_detection',
-    'get_position', 'pos_to_state_grid', 'state_to_pos_grid',
-    'create_learning_curve', 'create_success_curve', 'create_training_statistics',
-    'create_success_plot', 'create_reward_histogram', 'create_comparison_table',
-    'create_success_rate_comparison', 'create_stacked_failure_chart',
-    'print_training_results', 'print_evaluation_results'
-]
\ No newline at end of file
+# Untermodule werden erst beim ersten Attributzugriff geladen (PEP 562), damit
+# "from utils.common import ..." nicht matplotlib, pandas und gymnasium mitzieht.
+
+import importlib
+
+_EXPORTS = {
+    'common': ['set_all_seeds', 'obs_to_state', 'check_success', 'setup_export'],
+    'environment': ['initialize_environment', 'initialize_environment_for_scenario'],
+    'qlearning': ['initialize_q_table', 'select_action', 'update_q_value',
+                  'save_q_table', 'load_q_table', 'get_best_action'],
+    'evaluation': ['calculate_metrics'],
+    'position': ['get_position', 'pos_to_state_grid', 'state_to_pos_grid'],
+    'visualization': ['create_learning_curve', 'create_success_curve', 'create_training_statistics',
+                      'create_success_plot', 'create_reward_histogram', 'create_comparison_table',
+                      'create_success_rate_comparison', 'create_stacked_failure_chart'],
+    'reporting': ['print_training_results', 'print_evaluation_results'],
+    'evaluation_export': ['export_results_to_csv', 'create_combined_curve_pdf']
+}
+
+# Exportname -> Untermodul
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULE_OF)
+
+
+# Untermodul beim ersten Zugriff importieren und den Namen im Paket zwischenspeichern
+def __getattr__(name):
+    if name not in _MODULE_OF:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_MODULE_OF[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,100 @@
+# utils/artifact_cache.py
+
+import os
+import json
+import shutil
+import hashlib
+import dataclasses
+from functools import lru_cache
+import numpy as np
+from config import (ARTIFACT_CACHE_PATH, RUNTIME_FIELDS, DEFAULT_START_POS, DEFAULT_GOAL_POS, DEFAULT_OBSTACLES,
+                    CONTAINER_START_POS, CONTAINER_OBSTACLES)
+
+# Quelldateien, deren Inhalt das Trainingsergebnis bestimmt (relativ zu src/)
+SOURCE_FILES = [
+    "config.py", "train.py",
+    "envs/grid_environment.py", "envs/container_environment.py", "envs/tabular_model.py",
+    "envs/vector_grid_environment.py", "envs/vector_container_environment.py", "envs/outcomes.py",
+    "utils/common.py", "utils/environment.py", "utils/qlearning.py", "utils/replay.py",
+    "utils/convergence.py", "utils/batch_training.py", "utils/planning.py"
+]
+SOURCE_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+# ============================================================================
+# Schlüssel
+# ============================================================================
+
+# SHA-256 über die relevanten Quelldateien (einmal pro Prozess)
+@lru_cache(maxsize=None)
+def source_fingerprint():
+    digest = hashlib.sha256()
+    for relative_path in SOURCE_FILES:
+        digest.update(relative_path.encode("utf-8"))
+        with open(os.path.join(SOURCE_ROOT, relative_path), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# Cache-Schlüssel aus Laufkonfiguration (inkl. Seed, ohne RUNTIME_FIELDS), Szenario, Layout,
+# weiteren Trainingsoptionen (options) und Quelldateien
+def cache_key(config, scenario, options=None):
+    settings = {name: value for name, value in dataclasses.asdict(config).items() if name not in RUNTIME_FIELDS}
+    payload = {
+        "config": settings,
+        "scenario": scenario,
+        "layout": {
+            "grid": [DEFAULT_START_POS, DEFAULT_GOAL_POS, DEFAULT_OBSTACLES],
+            "container": [CONTAINER_START_POS, CONTAINER_OBSTACLES]
+        },
+        "options": options or {},
+        "source": source_fingerprint()
+    }
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+# ============================================================================
+# Laden und Speichern
+# ============================================================================
+
+# Artefakte eines Laufs laden; None bei Cache-Fehltreffer
+def load_artifacts(key, cache_path=ARTIFACT_CACHE_PATH):
+    entry = os.path.join(cache_path, key)
+    if not os.path.isdir(entry):
+        return None
+
+    with np.load(os.path.join(entry, "curves.npz")) as curves:
+        rewards, success, steps = curves["rewards"], curves["success"], curves["steps"]
+    with open(os.path.join(entry, "metrics.json"), encoding="utf-8") as f:
+        metrics = json.load(f)
+
+    return {
+        "Q": np.load(os.path.join(entry, "q_table.npy")),
+        "rewards": rewards.tolist(),
+        "success": success.tolist(),
+        "steps": steps.tolist(),
+        "metrics": metrics
+    }
+
+
+# Artefakte eines Laufs speichern; erst in ein temporäres Verzeichnis, dann atomar
+# umbenennen, damit abgebrochene oder parallele Läufe keine halben Einträge hinterlassen
+def store_artifacts(key, Q, rewards, success, steps, metrics, cache_path=ARTIFACT_CACHE_PATH):
+    entry = os.path.join(cache_path, key)
+    if os.path.isdir(entry):
+        return entry
+
+    staging = f"{entry}.tmp-{os.getpid()}"
+    os.makedirs(staging, exist_ok=True)
+    np.save(os.path.join(staging, "q_table.npy"), Q)
+    np.savez(os.path.join(staging, "curves.npz"), rewards=rewards, success=success, steps=steps)
+    with open(os.path.join(staging, "metrics.json"), "w", encoding="utf-8") as f:
+        json.dump(metrics, f, indent=2)
+
+    try:
+        os.rename(staging, entry)
+    except OSError:
+        # Gleicher Schlüssel wurde parallel bereits gespeichert
+        shutil.rmtree(staging, ignore_errors=True)
+    return entry
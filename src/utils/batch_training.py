@@ -0,0 +1,128 @@
+# utils/batch_training.py
+
+import numpy as np
+from config import ALPHA, GAMMA, EPSILON, EPISODES, MAX_STEPS, SEED, N_ACTIONS, MULTI_SEED_COUNT, RunConfig
+from envs.outcomes import OUTCOME_GOAL
+from utils.environment import initialize_vector_environment
+from utils.qlearning import select_actions, update_q_values
+from utils.convergence import scheduled_value
+
+
+# Q-Learning auf einer vektorisierten Umgebung: n_envs Episoden laufen gleichzeitig,
+# Kennzahlen werden je abgeschlossener Episode in Abschlussreihenfolge gesammelt.
+# config (RunConfig) legt Rewards, Abbruchgrenzen und die ε-/α-Schedules fest; alpha und
+# epsilon sind deren Startwerte, fortgeschrieben wird je Schritt nach Anzahl beendeter Episoden.
+# tracker (ConvergenceTracker) wird nach jedem Schritt mit beendeten Episoden aktualisiert;
+# mit config.early_stopping endet das Training, sobald er Konvergenz meldet.
+def train_batched(env_mode, episodes=EPISODES, n_envs=64, alpha=ALPHA, gamma=GAMMA,
+                  epsilon=EPSILON, max_steps=MAX_STEPS, seed=SEED, Q=None, config=None, tracker=None):
+    config = config if config is not None else RunConfig()
+    env = initialize_vector_environment(env_mode, n_envs, max_episode_steps=max_steps, seed=seed, config=config)
+    rng = np.random.default_rng(seed)
+    if Q is None:
+        Q = np.zeros((env.single_observation_space.n, N_ACTIONS))
+    alpha_start, epsilon_start = alpha, epsilon
+
+    rewards_per_episode = []
+    success_per_episode = []
+    steps_per_episode = []
+    episode_rewards = np.zeros(n_envs)
+
+    states, _ = env.reset(seed=seed)
+    while len(rewards_per_episode) < episodes:
+        finished = len(rewards_per_episode)
+        epsilon = scheduled_value(config.epsilon_schedule, epsilon_start, config.epsilon_min,
+                                  config.epsilon_decay, finished, episodes)
+        alpha = scheduled_value(config.alpha_schedule, alpha_start, config.alpha_min, config.alpha_decay,
+                                finished, episodes)
+
+        actions = select_actions(Q, states, epsilon, rng)
+        next_states, rewards, terminated, truncated, infos = env.step(actions)
+
+        # Bootstrapping über abgeschnittene, aber nicht über terminierte Episoden
+        update_q_values(Q, states, actions, rewards, infos["final_obs"], terminated, alpha, gamma)
+
+        episode_rewards += rewards
+        done = np.flatnonzero(terminated | truncated)
+        if len(done) > 0:
+            successes = (infos["outcome"][done] == OUTCOME_GOAL).astype(int).tolist()
+            rewards_per_episode.extend(episode_rewards[done].tolist())
+            success_per_episode.extend(successes)
+            steps_per_episode.extend(infos["episode_steps"][done].tolist())
+            episode_rewards[done] = 0
+
+            if tracker is not None and tracker.update_batch(Q, successes) and config.early_stopping:
+                break
+
+        states = next_states
+
+    return (Q, rewards_per_episode[:episodes], success_per_episode[:episodes],
+            steps_per_episode[:episodes])
+
+
+# Zufallsströme je Seed für select_actions: jeder Aufruf von random(n) liefert je Seed
+# eine Zahl aus dessen eigenem Generator (blockweise vorgezogen, ein Aufruf pro Seed und Block)
+class SeedStreams:
+
+    def __init__(self, seeds, block_size=1024):
+        self.generators = [np.random.default_rng(seed) for seed in seeds]
+        self.block_size = block_size
+        self.block = np.empty((len(seeds), 0))
+        self.position = 0
+
+    def random(self, size):
+        if self.position == self.block.shape[1]:
+            self.block = np.stack([rng.random(self.block_size) for rng in self.generators])
+            self.position = 0
+        values = self.block[:size, self.position]
+        self.position += 1
+        return values
+
+
+# Training von K unabhängigen Seeds im Gleichschritt: Q-Tensor (K, S, A), je Seed ein Slot
+# der vektorisierten Umgebung mit eigenem Layout- und Explorationsstrom. Beide Ströme von
+# Seed k stammen aus SeedSequence(seed).spawn(K)[k], daher ändert eine andere Anzahl Seeds
+# die Ergebnisse der übrigen Seeds nicht. Q-Updates laufen über die flach indizierte
+# Tabelle (K * S, A), Seed k belegt die Zeilen k * S bis (k + 1) * S.
+def train_multi_seed(env_mode, n_seeds=MULTI_SEED_COUNT, episodes=EPISODES, alpha=ALPHA, gamma=GAMMA,
+                     epsilon=EPSILON, max_steps=MAX_STEPS, seed=SEED, config=None):
+    seed_streams = [child.spawn(2) for child in np.random.SeedSequence(seed).spawn(n_seeds)]
+    layout_seeds = [layout_seed for layout_seed, _ in seed_streams]
+    agent_seeds = [agent_seed for _, agent_seed in seed_streams]
+
+    env = initialize_vector_environment(env_mode, n_seeds, max_episode_steps=max_steps, config=config,
+                                        slot_seeds=layout_seeds)
+    streams = SeedStreams(agent_seeds)
+    n_states = env.single_observation_space.n
+    Q = np.zeros((n_seeds, n_states, N_ACTIONS))
+    Q_flat = Q.reshape(n_seeds * n_states, N_ACTIONS)
+    offsets = np.arange(n_seeds) * n_states
+
+    rewards = np.zeros((n_seeds, episodes))
+    success = np.zeros((n_seeds, episodes), dtype=np.int64)
+    steps = np.zeros((n_seeds, episodes), dtype=np.int64)
+    completed = np.zeros(n_seeds, dtype=np.int64)
+    episode_rewards = np.zeros(n_seeds)
+
+    states, _ = env.reset()
+    while completed.min() < episodes:
+        actions = select_actions(Q_flat, states + offsets, epsilon, streams)
+        next_states, step_rewards, terminated, truncated, infos = env.step(actions)
+
+        # Seeds mit vollständigem Episodenbudget lernen nicht weiter
+        active = np.flatnonzero(completed < episodes)
+        update_q_values(Q_flat, states[active] + offsets[active], actions[active], step_rewards[active],
+                        infos["final_obs"][active] + offsets[active], terminated[active], alpha, gamma)
+
+        episode_rewards += step_rewards
+        done = active[(terminated | truncated)[active]]
+        if len(done) > 0:
+            rewards[done, completed[done]] = episode_rewards[done]
+            success[done, completed[done]] = infos["outcome"][done] == OUTCOME_GOAL
+            steps[done, completed[done]] = infos["episode_steps"][done]
+            completed[done] += 1
+        episode_rewards[terminated | truncated] = 0
+
+        states = next_states
+
+    return {"Q": Q, "rewards": rewards, "success": success, "steps": steps}
\ No newline at end of file
@@ -3,7 +3,7 @@
 import random
 import numpy as np
 from pathlib import Path
-from config import SEED, EXPORT_PDF, EXPORT_PATH, GRID_SIZE
+from config import SEED, EXPORT_PDF, EXPORT_PATH, GRID_SIZE, REWARDS
 
 
 # Seed-Konfiguration für Reproduzierbarkeit
@@ -26,13 +26,12 @@ def obs_to_state(obs, env_mode, grid_size=None):
     return obs
 
 
-# Erfolgserkennung je nach Umgebungstyp
-def check_success(reward, env_mode):
-    from config import REWARDS
+# Erfolgserkennung je nach Umgebungstyp (rewards: z.B. RunConfig.rewards)
+def check_success(reward, env_mode, rewards=REWARDS):
     if env_mode == "container":
-        return reward == REWARDS["dropoff"]
+        return reward == rewards["dropoff"]
     else:  # Grid-Environment
-        return reward == REWARDS["goal"]
+        return reward == rewards["goal"]
 
 
 # Erstellung des Export-Ordners
@@ -0,0 +1,88 @@
+# utils/convergence.py
+
+from collections import deque
+import numpy as np
+from config import (SUCCESS_WINDOW, MIN_EPISODES, CONVERGENCE_DELTA, CONVERGENCE_POLICY_CHANGES,
+                    CONVERGENCE_SUCCESS_RATE, CONVERGENCE_PATIENCE)
+
+
+# ============================================================================
+# Schedules
+# ============================================================================
+
+# Wert eines Schedules in Episode episode (0-basiert) von total Episoden
+def scheduled_value(schedule, start, minimum, decay, episode, total):
+    if schedule == "linear":
+        return max(minimum, start - (start - minimum) * episode / max(total - 1, 1))
+    if schedule == "exponential":
+        return max(minimum, start * decay ** episode)
+    return start
+
+
+# ============================================================================
+# Konvergenz-Tracking
+# ============================================================================
+
+# Kennzahlen je Episode: max |ΔQ|, Zustände mit geänderter Greedy-Aktion und gleitende
+# Erfolgsrate. Konvergiert, wenn alle Schwellwerte patience Episoden in Folge gelten.
+class ConvergenceTracker:
+
+    def __init__(self, Q, window=SUCCESS_WINDOW, delta_threshold=CONVERGENCE_DELTA,
+                 policy_threshold=CONVERGENCE_POLICY_CHANGES, success_threshold=CONVERGENCE_SUCCESS_RATE,
+                 patience=CONVERGENCE_PATIENCE, min_episodes=MIN_EPISODES):
+        self.delta_threshold = delta_threshold
+        self.policy_threshold = policy_threshold
+        self.success_threshold = success_threshold
+        self.patience = patience
+        self.min_episodes = min_episodes
+
+        self.previous_Q = Q.copy()
+        self.previous_greedy = Q.argmax(axis=1)
+        self.recent_success = deque(maxlen=window)
+        self.stable_episodes = 0
+        self.episodes = 0
+
+        self.max_delta = []
+        self.policy_changes = []
+        self.success_rate = []
+
+    # Kennzahlen nach einer Episode erfassen; liefert True bei Konvergenz
+    def update(self, Q, success):
+        return self.update_batch(Q, [success])
+
+    # Kennzahlen nach mehreren gleichzeitig beendeten Episoden (Batch-Training): ΔQ und
+    # Policy-Änderungen gelten seit dem letzten Aufruf, jede Episode zählt als ein Schritt
+    # der gleitenden Erfolgsrate und der Geduld
+    def update_batch(self, Q, successes):
+        delta = float(np.max(np.abs(Q - self.previous_Q)))
+        greedy = Q.argmax(axis=1)
+        changes = int(np.count_nonzero(greedy != self.previous_greedy))
+        self.previous_Q[:] = Q
+        self.previous_greedy = greedy
+
+        self.recent_success.extend(successes)
+        rate = sum(self.recent_success) / len(self.recent_success)
+        self.episodes += len(successes)
+
+        self.max_delta.extend([delta] * len(successes))
+        self.policy_changes.extend([changes] * len(successes))
+        self.success_rate.extend([rate] * len(successes))
+
+        stable = (delta <= self.delta_threshold and changes <= self.policy_threshold
+                  and len(self.recent_success) == self.recent_success.maxlen
+                  and rate >= self.success_threshold)
+        self.stable_episodes = self.stable_episodes + len(successes) if stable else 0
+        return self.converged
+
+    @property
+    def converged(self):
+        return self.episodes >= self.min_episodes and self.stable_episodes >= self.patience
+
+    # Zusammenfassung für den Export
+    def summary(self):
+        return {
+            "converged": self.converged,
+            "final_max_delta": self.max_delta[-1] if self.max_delta else None,
+            "final_policy_changes": self.policy_changes[-1] if self.policy_changes else None,
+            "final_success_rate": self.success_rate[-1] if self.success_rate else None
+        }
@@ -3,24 +3,41 @@
 from config import GRID_SIZE
 
 
-# Initialisierung der Umgebung
-def initialize_environment(env_mode):
+# Initialisierung der Umgebung (config: RunConfig, Standard aus config.py; render_mode: None oder "rgb_array")
+def initialize_environment(env_mode, config=None, render_mode=None):
     from envs.grid_environment import GridEnvironment
     from envs.container_environment import ContainerShipEnv
 
-    env = ContainerShipEnv() if env_mode == "container" else GridEnvironment(mode=env_mode)
+    if env_mode == "container":
+        env = ContainerShipEnv(config, render_mode=render_mode)
+    else:
+        env = GridEnvironment(mode=env_mode, config=config, render_mode=render_mode)
     grid_size = env.grid_size  # Kommt jetzt aus GRID_SIZE constant
     print(f"Umgebung initialisiert: {env_mode}-Modus, Grid-Größe: {grid_size}x{grid_size}")
     return env, grid_size
 
 
 # Initialisierung der Umgebung für Szenario-Vergleich
-def initialize_environment_for_scenario(scenario_config):
+def initialize_environment_for_scenario(scenario_config, config=None):
     from envs.grid_environment import GridEnvironment
     from envs.container_environment import ContainerShipEnv
 
     if scenario_config["environment"] == "container":
-        env = ContainerShipEnv()
+        env = ContainerShipEnv(config)
     else:
-        env = GridEnvironment(mode=scenario_config["env_mode"])
-    return env, env.grid_size  # Kommt jetzt aus GRID_SIZE constant
\ No newline at end of file
+        env = GridEnvironment(mode=scenario_config["env_mode"], config=config)
+    return env, env.grid_size  # Kommt jetzt aus GRID_SIZE constant
+
+
+# Initialisierung einer vektorisierten Umgebung mit num_envs parallelen Episoden
+# (slot_seeds: optional ein eigener Layout-Strom je Slot)
+def initialize_vector_environment(env_mode, num_envs, max_episode_steps=None, seed=None, config=None,
+                                  slot_seeds=None):
+    from envs.vector_grid_environment import VectorGridEnvironment
+    from envs.vector_container_environment import VectorContainerShipEnv
+
+    if env_mode == "container":
+        return VectorContainerShipEnv(num_envs, max_episode_steps=max_episode_steps, seed=seed, config=config,
+                                      slot_seeds=slot_seeds)
+    return VectorGridEnvironment(num_envs, mode=env_mode, max_episode_steps=max_episode_steps, seed=seed,
+                                 config=config, slot_seeds=slot_seeds)
\ No newline at end of file
@@ -1,56 +1,71 @@
 # utils/evaluation.py
 
 import numpy as np
-from collections import defaultdict
-from config import REWARDS, LOOP_THRESHOLD
-
-# Klassifikation des Episodenergebnisses
-def classify_episode_result(reward, cause, episode_reward, env_mode):
-    success = False
-
-    if env_mode == "container":
-        if reward == REWARDS["dropoff"]:
-            cause = "Ziel erreicht"
-            success = True
-        elif reward == REWARDS["loop_abort"]:
-            cause = "Schleifenabbruch"
-        elif reward == REWARDS["obstacle"]:
-            cause = "Hindernis-Kollision"
-        elif reward == REWARDS["timeout"]:
-            cause = "Timeout"
-    else:  # Grid-Environment
-        if reward == REWARDS["goal"]:
-            cause = "Ziel erreicht"
-            success = True
-        elif reward == REWARDS["loop_abort"] or reward == (REWARDS["loop_abort"] + REWARDS["step"]):
-            cause = "Schleifenabbruch"
-        elif reward == REWARDS["timeout"] or reward == (REWARDS["timeout"] + REWARDS["step"]):
-            cause = "Timeout"
-        elif reward == REWARDS["obstacle"] or (reward < 0 and reward != REWARDS["step"]):
-            cause = "Hindernis-Kollision"
-
-    return cause, success
-
-# Berechnung der Leistungsmetriken
-def calculate_metrics(scenario_results, eval_episodes):
-    if scenario_results is None:
+from envs.outcomes import OUTCOME_NONE, OUTCOME_GOAL, OUTCOME_OBSTACLE, OUTCOME_LOOP, OUTCOME_TIMEOUT
+
+# Episode (1-basiert), ab der die gleitende Erfolgsrate den Zielwert erreicht; None falls nie
+def episodes_to_target(success_per_episode, target, window):
+    success = np.asarray(success_per_episode, dtype=float)
+    if len(success) < window:
         return None
+    rolling = np.convolve(success, np.ones(window) / window, mode='valid')
+    reached = np.flatnonzero(rolling >= target)
+    return int(reached[0] + window) if len(reached) > 0 else None
+
+
+# Mittelwert und 95%-Konfidenzintervall (1.96 * Standardfehler) über die Seeds (Achse 0)
+def summarize_seeds(curves):
+    curves = np.asarray(curves, dtype=float)
+    n_seeds = len(curves)
+    mean = curves.mean(axis=0)
+    std = curves.std(axis=0, ddof=1) if n_seeds > 1 else np.zeros_like(mean)
+    ci = 1.96 * std / np.sqrt(n_seeds)
+    return {"mean": mean, "std": std, "ci_low": mean - ci, "ci_high": mean + ci}
+
+
+# Wilson-Intervall einer Erfolgsrate (z=1.96: 95%); liefert (untere, obere Grenze)
+def wilson_interval(successes, n, z=1.96):
+    if n == 0:
+        return 0.0, 1.0
+    p = successes / n
+    denominator = 1 + z ** 2 / n
+    center = (p + z ** 2 / (2 * n)) / denominator
+    half_width = z * np.sqrt(p * (1 - p) / n + z ** 2 / (4 * n ** 2)) / denominator
+    return center - half_width, center + half_width
+
 
-    total = eval_episodes
-    return {
-        "success_rate": scenario_results["success_count"] / total,
-        "timeout_rate": scenario_results["timeout_count"] / total,
-        "loop_abort_rate": scenario_results["loop_abort_count"] / total,
-        "obstacle_rate": scenario_results["obstacle_count"] / total,
-        "avg_reward": np.mean(scenario_results["episode_rewards"]),
-        "reward_std": np.std(scenario_results["episode_rewards"]),
-        "avg_steps_to_goal": np.mean(scenario_results["steps_to_goal"]) if scenario_results["steps_to_goal"] else None
-    }
-
-# Schleifenerkennung für Grid-Environment
-def check_loop_detection(visited_states, next_state, env_mode):
-    if env_mode != "container":
-        visited_states[next_state] = visited_states.get(next_state, 0) + 1
-        if visited_states[next_state] >= LOOP_THRESHOLD:
-            return True
-    return False
\ No newline at end of file
+# Konfidenzintervall des Mittelwerts (Normalapproximation, z * Standardfehler)
+def mean_interval(values, z=1.96):
+    values = np.asarray(values, dtype=float)
+    mean = values.mean() if len(values) > 0 else 0.0
+    half_width = z * values.std(ddof=1) / np.sqrt(len(values)) if len(values) > 1 else np.inf
+    return mean - half_width, mean + half_width
+
+
+# Episodendatensätze aus den früheren Zähler-Ergebnissen (success_count, timeout_count,
+# loop_abort_count, obstacle_count, episode_rewards, steps_to_goal) über eval_episodes Episoden
+def _records_from_counts(scenario_results, eval_episodes=None):
+    rewards = np.asarray(scenario_results["episode_rewards"], dtype=float)
+    total = eval_episodes if eval_episodes is not None else len(rewards)
+    counts = [(OUTCOME_GOAL, "success_count"), (OUTCOME_TIMEOUT, "timeout_count"),
+              (OUTCOME_LOOP, "loop_abort_count"), (OUTCOME_OBSTACLE, "obstacle_count")]
+    outcome = np.concatenate([np.full(scenario_results[key], code) for code, key in counts])
+    outcome = np.concatenate([outcome, np.full(total - len(outcome), OUTCOME_NONE)]).astype(np.int64)
+    steps = np.zeros(total, dtype=np.int64)
+    steps[:scenario_results["success_count"]] = scenario_results["steps_to_goal"]
+    reward = np.full(total, rewards.mean() if len(rewards) > 0 else 0.0)
+    reward[:len(rewards)] = rewards
+    return {"outcome": outcome, "reward": reward, "steps": steps, "weight": np.full(total, 1.0 / total)}
+
+
+# Berechnung der Leistungsmetriken (Kennzahlen aus evaluation_engine.episode_metrics).
+# scenario_results: Episodendatensätze (utils/evaluation_engine.py) oder die früheren
+# Zähler-Ergebnisse über eval_episodes Episoden
+def calculate_metrics(scenario_results, eval_episodes=None):
+    from utils.evaluation_engine import episode_metrics
+
+    if scenario_results is None:
+        return None
+    if "outcome" not in scenario_results:
+        scenario_results = _records_from_counts(scenario_results, eval_episodes)
+    return episode_metrics(scenario_results)
@@ -0,0 +1,348 @@
+# utils/evaluation_engine.py
+
+import zlib
+from functools import lru_cache
+import numpy as np
+from config import (RunConfig, EVAL_CHUNK_EPISODES, ADAPTIVE_BATCH_EPISODES, ADAPTIVE_MAX_EPISODES,
+                    SUCCESS_RATE_PRECISION, REWARD_PRECISION)
+from envs.outcomes import (OUTCOME_NONE, OUTCOME_GOAL, OUTCOME_OBSTACLE, OUTCOME_LOOP,
+                           OUTCOME_TIMEOUT, OUTCOME_PICKUP, OUTCOME_LABELS)
+from envs.tabular_model import enumerate_configurations
+from utils.environment import initialize_vector_environment
+from utils.qlearning import compile_policy
+from utils.evaluation import wilson_interval, mean_interval
+
+# Greedy-Evaluation mit spaltenweisen Episodendatensätzen: je Episode (bzw. Startkonfiguration)
+# Ergebnis-Code, Reward, diskontierter Return (config.gamma), Schritte, Abschneidung, Start- und
+# Zielzelle (Container zusätzlich Pickup-Zelle) und Gewicht. Stichprobe und exakte Aufzählung
+# liefern dasselbe Format; alle Kennzahlen entstehen in einem vektorisierten Durchlauf (episode_metrics).
+#
+# Die Schleifengrenze der Auswertung (loop_threshold) verschärft die Schleifengrenze der
+# Grid-Umgebung: Abbruch bei min(grid_loop_threshold, loop_threshold) Besuchen, mit
+# Schleifenstrafe wie in der Umgebung. max_steps schneidet Episoden ohne Strafe ab.
+
+
+# Konfiguration mit der effektiven Schleifengrenze der Auswertung
+def _evaluation_config(config, env_mode, loop_threshold):
+    if env_mode == "container":
+        return config
+    return config.with_overrides(grid_loop_threshold=min(config.grid_loop_threshold, loop_threshold))
+
+
+# Leere Datensätze für n Episoden
+def _empty_records(n, env_mode):
+    records = {
+        "outcome": np.zeros(n, dtype=np.int8),
+        "reward": np.zeros(n),
+        "discounted_return": np.zeros(n),
+        "steps": np.zeros(n, dtype=np.int64),
+        "truncated": np.zeros(n, dtype=bool),
+        "start": np.zeros(n, dtype=np.int64),
+        "goal": np.zeros(n, dtype=np.int64),
+        "weight": np.full(n, 1.0 / n) if n > 0 else np.zeros(0)
+    }
+    if env_mode == "container":
+        records["pickup"] = np.zeros(n, dtype=np.int64)
+    return records
+
+
+# Start-, Ziel- und Pickup-Zellen der laufenden Episoden einer vektorisierten Umgebung
+def _episode_layouts(env, env_mode):
+    if env_mode == "container":
+        return {"start": np.full(env.num_envs, env.start_cell), "goal": env.dropoff_cells.copy(),
+                "pickup": env.pickup_cells.copy()}
+    return {"start": env.start_states.copy(), "goal": env.goal_states.copy()}
+
+
+# ============================================================================
+# Stichprobe
+# ============================================================================
+
+# Greedy-Rollouts von episodes Episoden auf einer vektorisierten Umgebung mit n_envs Slots.
+# Jeder Slot hat ein festes Episodenkontingent, damit kurze Episoden nicht überrepräsentiert sind;
+# Datensätze liegen slotweise (Slot 0 zuerst), unabhängig von der Abschlussreihenfolge.
+# seed: Integer oder np.random.SeedSequence. recorder (TrajectoryRecorder) zeichnet jeden
+# Schritt auf; Episoden-ID = episode_offset + Datensatzzeile.
+def evaluate_rollouts(Q, env_mode, config=None, episodes=None, max_steps=None, loop_threshold=None,
+                      n_envs=64, seed=None, recorder=None, episode_offset=0):
+    config = config if config is not None else RunConfig(env_mode=env_mode)
+    episodes = episodes if episodes is not None else config.eval_episodes
+    max_steps = max_steps if max_steps is not None else config.eval_max_steps
+    loop_threshold = loop_threshold if loop_threshold is not None else config.loop_threshold
+    seed = seed if seed is not None else config.seed
+    actions = compile_policy(Q).actions
+
+    n_envs = max(1, min(n_envs, episodes))
+    env = initialize_vector_environment(env_mode, n_envs, max_episode_steps=max_steps, seed=seed,
+                                        config=_evaluation_config(config, env_mode, loop_threshold))
+    quota = np.full(n_envs, episodes // n_envs)
+    quota[:episodes % n_envs] += 1
+    offsets = np.cumsum(quota) - quota
+
+    records = _empty_records(episodes, env_mode)
+    completed = np.zeros(n_envs, dtype=np.int64)
+    episode_rewards = np.zeros(n_envs)
+    episode_returns = np.zeros(n_envs)
+    written = 0
+
+    states, _ = env.reset(seed=seed)
+    layouts = _episode_layouts(env, env_mode)
+    while written < episodes:
+        chosen = actions[states]
+        next_states, rewards, terminated, truncated, infos = env.step(chosen)
+        episode_rewards += rewards
+        episode_returns += config.gamma ** (infos["episode_steps"] - 1) * rewards
+
+        if recorder is not None:
+            live = np.flatnonzero(completed < quota)
+            recorder.record_batch(episode_offset + offsets[live] + completed[live], infos["episode_steps"][live] - 1,
+                                  states[live], chosen[live], rewards[live], infos["outcome"][live])
+        states = next_states
+
+        done = np.flatnonzero(terminated | truncated)
+        if len(done) == 0:
+            continue
+
+        # Nur Slots mit offenem Kontingent schreiben Datensätze
+        record = done[completed[done] < quota[done]]
+        rows = offsets[record] + completed[record]
+        records["outcome"][rows] = np.where(truncated[record], OUTCOME_TIMEOUT, infos["outcome"][record])
+        records["reward"][rows] = episode_rewards[record]
+        records["discounted_return"][rows] = episode_returns[record]
+        records["steps"][rows] = infos["episode_steps"][record]
+        records["truncated"][rows] = truncated[record]
+        for column, values in layouts.items():
+            records[column][rows] = values[record]
+        written += len(record)
+        completed[record] += 1
+
+        # Neue Episoden der zurückgesetzten Slots
+        episode_rewards[done] = 0
+        episode_returns[done] = 0
+        new_layouts = _episode_layouts(env, env_mode)
+        for column, values in new_layouts.items():
+            layouts[column][done] = values[done]
+
+    return records
+
+
+# Zufallsstrom-Kennung eines Szenarios (stabil über Prozesse und Python-Läufe)
+def scenario_stream(scenario_name):
+    return zlib.crc32(scenario_name.encode("utf-8"))
+
+
+# Anzahl Chunks für episodes Episoden (Chunk-Größe EVAL_CHUNK_EPISODES)
+def count_chunks(episodes, chunk_size=EVAL_CHUNK_EPISODES):
+    return -(-episodes // chunk_size)
+
+
+# Ein Chunk der Stichprobe: Episoden [chunk * chunk_size, ...) mit eigenem Seed aus
+# SeedSequence([seed, stream, chunk]). Die Datensätze hängen nur von Seed, Strom und
+# Chunk ab, nicht davon, welcher Prozess den Chunk wann auswertet.
+def evaluate_chunk(Q, env_mode, config, episodes, chunk, stream=0, max_steps=None, loop_threshold=None,
+                   chunk_size=EVAL_CHUNK_EPISODES, recorder=None):
+    size = min(chunk_size, episodes - chunk * chunk_size)
+    seed = np.random.SeedSequence([config.seed, stream, chunk])
+    return evaluate_rollouts(Q, env_mode, config, size, max_steps, loop_threshold, seed=seed,
+                             recorder=recorder, episode_offset=chunk * chunk_size)
+
+
+# Chunk-Datensätze in Chunk-Reihenfolge zusammenführen; Gewichte gleichverteilt über alle Episoden
+def merge_records(parts):
+    merged = {column: np.concatenate([part[column] for part in parts]) for column in parts[0]}
+    merged["weight"] = np.full(len(merged["outcome"]), 1.0 / len(merged["outcome"]))
+    return merged
+
+
+# Stichprobe über alle Chunks nacheinander; identisch zur parallelen Auswertung derselben Chunks
+def evaluate_sampled(Q, env_mode, config=None, episodes=None, max_steps=None, loop_threshold=None, stream=0,
+                     recorder=None):
+    config = config if config is not None else RunConfig(env_mode=env_mode)
+    episodes = episodes if episodes is not None else config.eval_episodes
+    parts = [evaluate_chunk(Q, env_mode, config, episodes, chunk, stream, max_steps, loop_threshold,
+                            recorder=recorder)
+             for chunk in range(count_chunks(episodes))]
+    return merge_records(parts)
+
+
+# Adaptive Stichprobe: Batches zu batch_size Episoden (je Batch ein eigener Zufallsstrom wie
+# bei evaluate_chunk), bis die Halbbreiten des Wilson-Intervalls der Erfolgsrate und des
+# Intervalls des mittleren Rewards die Zielgenauigkeit erreichen oder max_episodes erreicht sind
+def evaluate_adaptive(Q, env_mode, config=None, max_steps=None, loop_threshold=None, stream=0,
+                      batch_size=ADAPTIVE_BATCH_EPISODES, max_episodes=ADAPTIVE_MAX_EPISODES,
+                      success_precision=SUCCESS_RATE_PRECISION, reward_precision=REWARD_PRECISION, recorder=None):
+    config = config if config is not None else RunConfig(env_mode=env_mode)
+    parts = []
+
+    for chunk in range(count_chunks(max_episodes, batch_size)):
+        parts.append(evaluate_chunk(Q, env_mode, config, max_episodes, chunk, stream, max_steps,
+                                    loop_threshold, batch_size, recorder))
+        records = merge_records(parts)
+        intervals = confidence_intervals(records)
+        if (intervals["success_half_width"] <= success_precision
+                and intervals["reward_half_width"] <= reward_precision):
+            break
+
+    return records
+
+
+# ============================================================================
+# Exakte Aufzählung
+# ============================================================================
+
+# Greedy-Rollouts aller Startkonfigurationen im Gleichschritt über die kompilierten Modelle,
+# mit denselben Abbruchregeln wie die (vektorisierten) Umgebungen. Greedy-Policies sind
+# deterministisch, daher genügt ein Rollout je Konfiguration; Ergebnisse werden je
+# (Policy, Modus, Konfiguration, Grenzen) zwischengespeichert. Mit recorder wird der Cache
+# umgangen (Aufruf über __wrapped__); Episoden-ID = Index der Konfiguration.
+@lru_cache(maxsize=32)
+def _rollout_configurations(actions_bytes, env_mode, config, max_steps, recorder=None):
+    actions = np.frombuffer(actions_bytes, dtype=np.uint8).astype(np.int64)
+    configs = enumerate_configurations(env_mode, config.grid_size, config.rewards)
+    next_state, reward, terminal_code = configs["next_state"], configs["reward"], configs["terminal_code"]
+    n_configs, n_states, _ = next_state.shape
+    n_cells = config.grid_size * config.grid_size
+    container = env_mode == "container"
+
+    # Verlaufsabhängige Abbrüche der Umgebungen
+    if container:
+        env_loop, env_max_steps = config.container_loop_count, config.container_max_steps
+    else:
+        env_loop, env_max_steps = config.grid_loop_threshold, config.grid_max_steps
+    abort_rewards = np.zeros(OUTCOME_TIMEOUT + 1)
+    abort_rewards[OUTCOME_LOOP] = config.rewards["loop_abort"]
+    abort_rewards[OUTCOME_TIMEOUT] = config.rewards["timeout"]
+
+    states = configs["start_state"].astype(np.int64)
+    observations = states.copy()
+    visit_counts = np.zeros((n_configs, n_states), dtype=np.int32)
+    records = _empty_records(n_configs, env_mode)
+    records["outcome"][:] = OUTCOME_TIMEOUT
+    active = np.arange(n_configs)
+
+    for step in range(1, max_steps + 1):
+        current = states[active]
+        chosen = actions[observations[active]]
+        next_states = next_state[active, current, chosen]
+        step_outcomes = terminal_code[active, current, chosen].copy()
+        step_rewards = reward[active, current, chosen].copy()
+
+        if container:
+            # Beobachtung vor Pickup-Ereignis; Schleife und Timeout haben Vorrang
+            next_obs = np.where(step_outcomes == OUTCOME_PICKUP, next_states - n_cells, next_states)
+            visit_counts[active, next_obs] += 1
+            aborts = np.where(visit_counts[active, next_obs] >= env_loop, OUTCOME_LOOP,
+                              np.where(step >= env_max_steps, OUTCOME_TIMEOUT, OUTCOME_NONE))
+            aborted = aborts != OUTCOME_NONE
+            step_outcomes[aborted] = aborts[aborted]
+            step_rewards[aborted] = abort_rewards[aborts[aborted]]
+        else:
+            # Schleife und Timeout nur ohne Ziel/Hindernis; Strafe zusätzlich zum Schritt-Reward
+            next_obs = next_states
+            visit_counts[active, next_obs] += 1
+            step_outcomes[(step_outcomes == OUTCOME_NONE) & (visit_counts[active, next_obs] >= env_loop)] = OUTCOME_LOOP
+            step_outcomes[(step_outcomes == OUTCOME_NONE) & (step >= env_max_steps)] = OUTCOME_TIMEOUT
+            step_rewards += abort_rewards[step_outcomes]
+
+        if recorder is not None:
+            recorder.record_batch(active, np.full(len(active), step - 1), observations[active], chosen,
+                                  step_rewards, step_outcomes)
+
+        records["reward"][active] += step_rewards
+        records["discounted_return"][active] += config.gamma ** (step - 1) * step_rewards
+        records["steps"][active] = step
+        states[active] = next_states
+        observations[active] = next_obs
+
+        done = (step_outcomes != OUTCOME_NONE) & (step_outcomes != OUTCOME_PICKUP)
+        records["outcome"][active[done]] = step_outcomes[done]
+        active = active[~done]
+        if len(active) == 0:
+            break
+
+    # Nach max_steps noch laufende Konfigurationen sind abgeschnitten
+    records["truncated"][active] = True
+    records["start"][:] = configs["start_state"]
+    records["weight"][:] = configs["probability"]
+    if container:
+        records["pickup"][:] = configs["goal"][:, 0]
+        records["goal"][:] = configs["goal"][:, 1]
+    else:
+        records["goal"][:] = configs["goal"]
+
+    for array in records.values():
+        array.setflags(write=False)
+    return records
+
+
+# Exakte Greedy-Evaluation einer Q-Tabelle über alle Startkonfigurationen eines Modus;
+# Gewicht je Datensatz ist die Ziehungswahrscheinlichkeit der Konfiguration
+def evaluate_exact(Q, env_mode, config=None, max_steps=None, loop_threshold=None, recorder=None):
+    config = config if config is not None else RunConfig(env_mode=env_mode)
+    max_steps = max_steps if max_steps is not None else config.eval_max_steps
+    loop_threshold = loop_threshold if loop_threshold is not None else config.loop_threshold
+    policy = compile_policy(Q)
+    rollout = _rollout_configurations if recorder is None else _rollout_configurations.__wrapped__
+    return rollout(policy.actions.tobytes(), env_mode, _evaluation_config(config, env_mode, loop_threshold),
+                   max_steps, recorder)
+
+
+# Einheitlicher Einstieg: adaptiv, exakt über alle Startkonfigurationen oder als feste
+# Stichprobe (stream trennt die Zufallsströme verschiedener Szenarien, siehe scenario_stream).
+# recorder (TrajectoryRecorder, optional) zeichnet alle Schritte der Auswertung auf.
+def evaluate_greedy(Q, env_mode, config=None, exact=True, episodes=None, max_steps=None, loop_threshold=None,
+                    stream=0, adaptive=False, recorder=None):
+    if adaptive:
+        return evaluate_adaptive(Q, env_mode, config, max_steps, loop_threshold, stream, recorder=recorder)
+    if exact:
+        return evaluate_exact(Q, env_mode, config, max_steps, loop_threshold, recorder)
+    return evaluate_sampled(Q, env_mode, config, episodes, max_steps, loop_threshold, stream, recorder)
+
+
+# ============================================================================
+# Kennzahlen
+# ============================================================================
+
+# Kennzahlen (Ergebnisraten, Reward, Schritte bis zum Ziel), gewichtet mit dem Datensatzgewicht.
+# Abgeschnittene Episoden zählen als Timeout, ihr Reward enthält keinen Strafzuschlag.
+def episode_metrics(records):
+    weight, outcome, reward = records["weight"], records["outcome"], records["reward"]
+    success = outcome == OUTCOME_GOAL
+    rates = np.bincount(outcome, weights=weight, minlength=OUTCOME_TIMEOUT + 1)
+    avg_reward = float(weight @ reward)
+    success_rate = float(rates[OUTCOME_GOAL])
+
+    return {
+        "success_rate": success_rate,
+        "timeout_rate": float(rates[OUTCOME_TIMEOUT]),
+        "loop_abort_rate": float(rates[OUTCOME_LOOP]),
+        "obstacle_rate": float(rates[OUTCOME_OBSTACLE]),
+        "avg_reward": avg_reward,
+        "reward_std": float(np.sqrt(weight @ (reward - avg_reward) ** 2)),
+        "avg_steps_to_goal": (float(weight[success] @ records["steps"][success]) / success_rate
+                              if success_rate > 0 else None),
+        "episodes": len(outcome)
+    }
+
+
+# 95%-Intervalle einer Stichprobe: Wilson-Intervall der Erfolgsrate, Normalapproximation
+# für den mittleren Reward, jeweils mit Halbbreite
+def confidence_intervals(records):
+    n = len(records["outcome"])
+    success_low, success_high = wilson_interval(int(np.sum(records["outcome"] == OUTCOME_GOAL)), n)
+    reward_low, reward_high = mean_interval(records["reward"])
+    return {
+        "success_ci": (success_low, success_high),
+        "success_half_width": (success_high - success_low) / 2,
+        "reward_ci": (reward_low, reward_high),
+        "reward_half_width": (reward_high - reward_low) / 2
+    }
+
+
+# Anzahl Datensätze je Ursache (Bezeichnungen aus envs/outcomes.py) und gelöst/fehlgeschlagen
+def outcome_counts(records):
+    counts = np.bincount(records["outcome"], minlength=OUTCOME_TIMEOUT + 1)
+    results_cause = {label: int(counts[code]) for code, label in OUTCOME_LABELS.items() if counts[code] > 0}
+    solved = int(counts[OUTCOME_GOAL])
+    results_solved = {"solved episode": solved, "failed episode": len(records["outcome"]) - solved}
+    return results_cause, results_solved
@@ -3,8 +3,6 @@
 import csv
 import os
 import numpy as np
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_pdf import PdfPages
 
 def export_results_to_csv(results, output_path="exports/evaluation_summary.csv"):
     os.makedirs(os.path.dirname(output_path), exist_ok=True)
@@ -37,6 +35,10 @@ def create_combined_curve_pdf(scenarios, export_dir, metric="learning"):
         export_dir (str): Verzeichnis, in dem die .npy-Dateien liegen und die PDF gespeichert wird.
         metric (str): "learning" oder "success"
     """
+    # matplotlib erst beim Plotten laden; export_results_to_csv braucht es nicht
+    import matplotlib.pyplot as plt
+    from matplotlib.backends.backend_pdf import PdfPages
+
     plt.figure(figsize=(10, 6))
     npy_files_to_delete = []
 
@@ -0,0 +1,109 @@
+# utils/planning.py
+
+import numpy as np
+from config import GAMMA, GRID_SIZE, Rewards, RunConfig
+from envs.outcomes import OUTCOME_GOAL, OUTCOME_OBSTACLE
+from envs.tabular_model import enumerate_configurations
+from utils.evaluation_engine import evaluate_exact
+
+
+# Diskontfaktor je Übergang (0 für terminierende Übergänge im kompilierten Modell)
+def _discounts(terminal_code, gamma):
+    return gamma * ~np.isin(terminal_code, (OUTCOME_GOAL, OUTCOME_OBSTACLE))
+
+
+# Value Iteration über gestapelte Modelle der Form (L, S, A)
+def value_iteration(next_state, reward, terminal_code, gamma=GAMMA, tol=1e-8, max_iterations=10000):
+    layers = np.arange(len(next_state))[:, None, None]
+    discounts = _discounts(terminal_code, gamma)
+    Q = np.zeros(reward.shape)
+
+    for iteration in range(1, max_iterations + 1):
+        Q_new = reward + discounts * Q.max(axis=2)[layers, next_state]
+        delta = np.max(np.abs(Q_new - Q))
+        Q = Q_new
+        if delta < tol:
+            break
+
+    return Q, iteration
+
+
+# Exakte Bewertung deterministischer Policies (L, S) über lineare Gleichungssysteme
+def evaluate_policy_exact(next_state, reward, terminal_code, policy, gamma=GAMMA):
+    n_layers, n_states, _ = next_state.shape
+    layers = np.arange(n_layers)[:, None]
+    states = np.arange(n_states)[None, :]
+
+    transitions = np.zeros((n_layers, n_states, n_states))
+    transitions[layers, states, next_state[layers, states, policy]] = \
+        _discounts(terminal_code, gamma)[layers, states, policy]
+    rewards = reward[layers, states, policy]
+
+    return np.linalg.solve(np.eye(n_states) - transitions, rewards[..., None])[..., 0]
+
+
+# Policy Iteration über gestapelte Modelle der Form (L, S, A)
+def policy_iteration(next_state, reward, terminal_code, gamma=GAMMA, max_iterations=1000):
+    layers = np.arange(len(next_state))[:, None, None]
+    discounts = _discounts(terminal_code, gamma)
+    policy = np.zeros(next_state.shape[:2], dtype=np.int64)
+
+    for iteration in range(1, max_iterations + 1):
+        V = evaluate_policy_exact(next_state, reward, terminal_code, policy, gamma)
+        Q = reward + discounts * V[layers, next_state]
+
+        # Nur echte Verbesserungen übernehmen, damit Gleichstände terminieren
+        current = np.take_along_axis(Q, policy[..., None], axis=2)[..., 0]
+        improved = Q.max(axis=2) > current + 1e-10
+        if not improved.any():
+            break
+        policy = np.where(improved, Q.argmax(axis=2), policy)
+
+    return Q, iteration
+
+
+# Optimale Q-Tabelle für einen Modus im Format von q_table_<mode>.npy.
+# Bei zufälligem Ziel/Hindernissen/Container ist das Layout nicht im Zustand
+# enthalten; dann wird Q* je Layout mit der Ziehungswahrscheinlichkeit gemittelt.
+def solve_q_star(env_mode, gamma=GAMMA, method="value_iteration", grid_size=GRID_SIZE, rewards=Rewards()):
+    configs = enumerate_configurations(env_mode, grid_size, rewards)
+    solver = value_iteration if method == "value_iteration" else policy_iteration
+    Q_layouts, iterations = solver(configs["next_state"], configs["reward"],
+                                   configs["terminal_code"], gamma=gamma)
+    Q_star = np.tensordot(configs["probability"], Q_layouts, axes=1)
+    return Q_star, Q_layouts, iterations
+
+
+# Optimalitätslücke der Greedy-Policy einer Q-Tabelle, exakt über alle Startkonfigurationen.
+# Der Wert der Greedy-Policy ist ihr diskontierter Return unter den Abbruchregeln der Umgebungen
+# (Schleifenabbruch, Timeout; utils/evaluation_engine.py::evaluate_exact), nicht die Lösung des
+# unendlichen Horizonts. Referenz ist die Oracle-Schranke: der Wert der je Layout optimalen
+# Policy ab dem Startzustand, den eine Tabelle ohne Layout im Zustand nicht erreichen kann.
+# config (RunConfig) liefert die Abbruchgrenzen; gamma, grid_size und rewards haben Vorrang.
+def optimality_gap(Q, env_mode, gamma=GAMMA, grid_size=GRID_SIZE, rewards=Rewards(), config=None):
+    config = (config if config is not None else RunConfig()).with_overrides(
+        env_mode=env_mode, gamma=gamma, grid_size=grid_size, rewards=rewards)
+    configs = enumerate_configurations(env_mode, grid_size, rewards)
+    Q_layouts, _ = value_iteration(configs["next_state"], configs["reward"], configs["terminal_code"], gamma=gamma)
+
+    # Rollout bis zum Timeout der Umgebung mit deren eigener Schleifengrenze
+    if env_mode == "container":
+        max_steps = config.container_max_steps
+    else:
+        max_steps = config.grid_max_steps
+    records = evaluate_exact(Q, env_mode, config, max_steps=max_steps, loop_threshold=config.grid_loop_threshold)
+
+    n_layers = len(Q_layouts)
+    greedy = np.broadcast_to(np.argmax(Q, axis=1), (n_layers, Q.shape[0]))
+    oracle_values = Q_layouts.max(axis=2)[np.arange(n_layers), configs["start_state"]]
+    greedy_values = np.take_along_axis(Q_layouts, greedy[..., None], axis=2)[..., 0]
+    agreement = np.mean(greedy_values >= Q_layouts.max(axis=2) - 1e-9, axis=1)
+
+    probability = configs["probability"]
+    policy_values = records["discounted_return"]
+    return {
+        "optimal_value": float(probability @ oracle_values),
+        "policy_value": float(probability @ policy_values),
+        "gap": float(probability @ (oracle_values - policy_values)),
+        "action_agreement": float(probability @ agreement)
+    }
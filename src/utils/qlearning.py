@@ -1,14 +1,32 @@
 # utils/qlearning.py
 
+import os
+import json
+import heapq
+import hashlib
+import itertools
+from collections import namedtuple
+from datetime import datetime
 import numpy as np
-from config import ALPHA, GAMMA, ENV_MODE, N_ACTIONS
+from config import (ALPHA, GAMMA, ENV_MODE, N_ACTIONS, GRID_SIZE, PLANNING_STEPS, PRIORITY_THRESHOLD,
+                    Q_DTYPE, Q_EXPORT_DTYPE)
 
-# Initialisierung der Q-Tabelle
-def initialize_q_table(env):
+# Version des Q-Tabellen-Formats (JSON-Kopf neben der .npy-Datei)
+Q_TABLE_FORMAT_VERSION = 1
+
+# Kompilierte Greedy-Policy einer eingefrorenen Q-Tabelle: Aktion (uint8), Wert und
+# Abstand zwischen bester und zweitbester Aktion je Zustand
+CompiledPolicy = namedtuple("CompiledPolicy", ["actions", "values", "action_gap"])
+
+# Ganzzahlige Speicherformate (symmetrisch quantisiert mit einer Skala je Tabelle)
+QUANTIZED_DTYPES = ("int8", "int16")
+
+# Initialisierung der Q-Tabelle (dtype: float64, float32 oder float16)
+def initialize_q_table(env, dtype=Q_DTYPE):
     n_states = env.observation_space.n if hasattr(env.observation_space, 'n') else np.prod(env.observation_space.nvec)
     n_actions = N_ACTIONS
-    Q = np.zeros((n_states, n_actions))
-    print(f"Q-Tabelle initialisiert: {n_states} Zustände, {n_actions} Aktionen")
+    Q = np.zeros((n_states, n_actions), dtype=dtype)
+    print(f"Q-Tabelle initialisiert: {n_states} Zustände, {n_actions} Aktionen ({Q.dtype})")
     return Q, n_states, n_actions
 
 # Epsilon-greedy Aktionsauswahl
@@ -18,27 +36,284 @@ def select_action(Q, state, epsilon, n_actions=N_ACTIONS):
     else:
         return np.argmax(Q[state])
 
-# Q-Wert Update (Q-Learning)
-def update_q_value(Q, state, action, reward, next_state, alpha=ALPHA, gamma=GAMMA):
-    Q[state, action] += alpha * (reward + gamma * np.max(Q[next_state]) - Q[state, action])
+# Q-Wert Update (Q-Learning); nach terminierten Übergängen (done) ohne Bootstrapping,
+# gleiche Regel wie update_q_values und die Replay-Lernverfahren
+def update_q_value(Q, state, action, reward, next_state, alpha=ALPHA, gamma=GAMMA, done=False):
+    future = 0.0 if done else gamma * np.max(Q[next_state])
+    Q[state, action] += alpha * (reward + future - Q[state, action])
+
+# Epsilon-greedy Aktionsauswahl für ein Array von Zuständen (rng: Generator oder np.random)
+def select_actions(Q, states, epsilon, rng=None, n_actions=N_ACTIONS):
+    rng = np.random if rng is None else rng
+    explore = rng.random(len(states)) < epsilon
+    random_actions = (rng.random(len(states)) * n_actions).astype(np.int64)
+    return np.where(explore, random_actions, Q[states].argmax(axis=1))
+
+# Q-Learning Update für Arrays von Übergängen; liefert die TD-Fehler.
+# Doppelte (s, a)-Paare werden zusammengefasst: mittlerer TD-Fehler mit Schrittweite
+# 1 - (1 - alpha)^k, wie k aufeinanderfolgende Updates mit gleichem Ziel.
+def update_q_values(Q, states, actions, rewards, next_states, dones, alpha=ALPHA, gamma=GAMMA):
+    targets = rewards + gamma * ~np.asarray(dones, dtype=bool) * Q[next_states].max(axis=1)
+    td_errors = targets - Q[states, actions]
+
+    pairs, inverse, counts = np.unique(states * Q.shape[1] + actions, return_inverse=True, return_counts=True)
+    if len(pairs) == len(td_errors):
+        Q[states, actions] += alpha * td_errors
+    else:
+        mean_td = np.bincount(inverse, weights=td_errors) / counts
+        unique_states, unique_actions = np.divmod(pairs, Q.shape[1])
+        Q[unique_states, unique_actions] += (1 - (1 - alpha) ** counts) * mean_td
+
+    return td_errors
+
+# Pfad der Metadaten-Datei zu einer Q-Tabelle (q_table_<mode>.json neben q_table_<mode>.npy)
+def get_q_table_metadata_path(env_mode=ENV_MODE):
+    return f"q_table_{env_mode}.json"
+
+# SHA-256 einer Datei (blockweise gelesen)
+def file_checksum(filepath, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+# Symmetrische Quantisierung auf int8/int16: Q ≈ Q_int * scale, scale = max|Q| / max(dtype)
+def quantize_q_table(Q, dtype):
+    limit = np.iinfo(dtype).max
+    max_abs = float(np.max(np.abs(Q))) if Q.size > 0 else 0.0
+    scale = max_abs / limit if max_abs > 0 else 1.0
+    Q_int = np.clip(np.rint(np.asarray(Q, dtype=np.float64) / scale), -limit, limit).astype(dtype)
+    return Q_int, scale
 
-# Speicherung der Q-Tabelle
-def save_q_table(Q, env_mode=ENV_MODE):
+# Rückwandlung einer quantisierten Tabelle in float64
+def dequantize_q_table(Q_int, scale):
+    return Q_int.astype(np.float64) * scale
+
+# Q-Tabelle im Speicherformat storage_dtype kodieren; liefert Tabelle und Skala (None bei Gleitkomma)
+def encode_q_table(Q, storage_dtype):
+    if storage_dtype in QUANTIZED_DTYPES:
+        return quantize_q_table(Q, storage_dtype)
+    return np.asarray(Q, dtype=storage_dtype), None
+
+# Anteil der Zustände mit gleicher Greedy-Aktion wie in der Referenztabelle
+def greedy_agreement(Q_reference, Q_candidate):
+    return float(np.mean(np.argmax(Q_reference, axis=1) == np.argmax(Q_candidate, axis=1)))
+
+# Vergleich aller Speicherformate mit der Referenztabelle: Größe, maximaler Fehler
+# und Greedy-Übereinstimmung, um das kleinste verhaltenstreue Format zu wählen
+def compare_storage_formats(Q, dtypes=("float64", "float32", "float16", "int16", "int8")):
+    reference = np.asarray(Q, dtype=np.float64)
+    results = []
+    for dtype in dtypes:
+        encoded, scale = encode_q_table(reference, dtype)
+        decoded = dequantize_q_table(encoded, scale) if scale is not None else encoded.astype(np.float64)
+        results.append({
+            "dtype": dtype,
+            "bytes": int(encoded.nbytes),
+            "scale": scale,
+            "max_error": float(np.max(np.abs(decoded - reference))) if reference.size > 0 else 0.0,
+            "greedy_agreement": greedy_agreement(reference, decoded)
+        })
+    return results
+
+# Speicherung der Q-Tabelle: .npy-Nutzdaten plus JSON-Kopf mit Form, Datentyp,
+# Prüfsumme und optionalen Trainingsangaben (metadata, z.B. Hyperparameter, Seed, Episoden).
+# storage_dtype wählt das Speicherformat; bei int8/int16 steht die Skala im Kopf. Verliert das
+# Speicherformat Genauigkeit gegenüber der Trainingstabelle, steht dort auch die Greedy-Übereinstimmung
+# mit ihr (verlustfreie Umwandlungen, z.B. float16 -> float32, wären trivial 100%).
+def save_q_table(Q, env_mode=ENV_MODE, metadata=None, storage_dtype=Q_EXPORT_DTYPE):
     filepath = f"q_table_{env_mode}.npy"
-    np.save(filepath, Q)
-    print(f"Q-Tabelle gespeichert: {filepath}")
+    encoded, scale = encode_q_table(Q, storage_dtype)
+    np.save(filepath, encoded)
+
+    header = {
+        "format_version": Q_TABLE_FORMAT_VERSION,
+        "env_mode": env_mode,
+        "shape": list(encoded.shape),
+        "dtype": str(encoded.dtype),
+        "source_dtype": str(Q.dtype),
+        "n_states": int(encoded.shape[0]),
+        "n_actions": int(encoded.shape[1]),
+        "grid_size": GRID_SIZE,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "sha256": file_checksum(filepath),
+        **(metadata or {})
+    }
+    if scale is not None:
+        header["scale"] = scale
+        header["greedy_agreement"] = greedy_agreement(Q, dequantize_q_table(encoded, scale))
+    elif not np.can_cast(Q.dtype, encoded.dtype, casting="safe"):
+        header["greedy_agreement"] = greedy_agreement(Q, encoded)
+
+    with open(get_q_table_metadata_path(env_mode), "w", encoding="utf-8") as f:
+        json.dump(header, f, indent=2, default=str)
+    print(f"Q-Tabelle gespeichert: {filepath} ({encoded.dtype})")
+    if "greedy_agreement" in header:
+        print(f"  Greedy-Übereinstimmung mit {Q.dtype}: {header['greedy_agreement']:.1%}")
+
+# Metadaten einer Q-Tabelle; ältere Dateien ohne JSON-Kopf liefern Form und Datentyp
+# aus dem .npy-Header (ohne die Daten zu lesen). None, falls keine Tabelle existiert.
+def load_q_table_metadata(env_mode=ENV_MODE):
+    metadata_path = get_q_table_metadata_path(env_mode)
+    if os.path.exists(metadata_path):
+        with open(metadata_path, encoding="utf-8") as f:
+            return json.load(f)
 
-# Laden der Q-Tabelle
-def load_q_table(env_mode=ENV_MODE):
+    filepath = f"q_table_{env_mode}.npy"
+    if not os.path.exists(filepath):
+        return None
+    Q = np.load(filepath, mmap_mode="r")
+    return {"env_mode": env_mode, "shape": list(Q.shape), "dtype": str(Q.dtype),
+            "n_states": int(Q.shape[0]), "n_actions": int(Q.shape[1])}
+
+# Abweichungen einer gespeicherten Tabelle Q (Datei filepath) von ihrem Kopf: Form und Datentyp,
+# mit checksum zusätzlich die Prüfsumme (liest die ganze Datei, daher nicht beim normalen Laden)
+def q_table_header_errors(Q, metadata, filepath, checksum=False):
+    errors = []
+    if "shape" in metadata and list(Q.shape) != list(metadata["shape"]):
+        errors.append(f"Form {list(Q.shape)} statt {metadata['shape']}")
+    if "dtype" in metadata and str(Q.dtype) != metadata["dtype"]:
+        errors.append(f"Datentyp {Q.dtype} statt {metadata['dtype']}")
+    if checksum and "sha256" in metadata and file_checksum(filepath) != metadata["sha256"]:
+        errors.append("Prüfsumme stimmt nicht überein")
+    return errors
+
+# Prüfung der Q-Tabelle gegen Form, Datentyp und Prüfsumme im Kopf (None: kein Kopf mit Prüfsumme)
+def verify_q_table(env_mode=ENV_MODE):
+    metadata = load_q_table_metadata(env_mode)
+    if metadata is None or "sha256" not in metadata:
+        return None
+    filepath = f"q_table_{env_mode}.npy"
+    return not q_table_header_errors(np.load(filepath, mmap_mode="r"), metadata, filepath, checksum=True)
+
+# Laden der Q-Tabelle; standardmäßig speicherabgebildet (schreibgeschützt), sodass große
+# Tabellen sofort geöffnet und über den Page-Cache zwischen Prozessen geteilt werden.
+# Mit verify (Standard) werden Form und Datentyp gegen den JSON-Kopf geprüft, bei Abweichung None;
+# die Prüfsumme liest die ganze Datei und bleibt verify_q_table vorbehalten.
+# Quantisierte Tabellen (Skala im Kopf) werden transparent nach float64 dekodiert.
+def load_q_table(env_mode=ENV_MODE, mmap=True, verify=True):
     filepath = f"q_table_{env_mode}.npy"
     try:
-        Q = np.load(filepath)
-        print(f"Q-Tabelle geladen: {filepath}")
-        return Q
+        Q = np.load(filepath, mmap_mode="r" if mmap else None)
     except FileNotFoundError:
         print(f"FEHLER: Q-Tabelle nicht gefunden: {filepath}")
         return None
 
+    metadata = load_q_table_metadata(env_mode)
+    if verify:
+        errors = q_table_header_errors(Q, metadata, filepath)
+        if errors:
+            print(f"FEHLER: Q-Tabelle passt nicht zum Kopf {get_q_table_metadata_path(env_mode)}: "
+                  f"{'; '.join(errors)}")
+            return None
+
+    if np.issubdtype(Q.dtype, np.integer):
+        if "scale" not in metadata:
+            raise ValueError(f"Quantisierte Q-Tabelle {filepath} ({Q.dtype}) ohne Skala: "
+                             f"Kopf {get_q_table_metadata_path(env_mode)} fehlt oder ist unvollständig")
+        Q = dequantize_q_table(Q, metadata["scale"])
+
+    print(f"Q-Tabelle geladen: {filepath}")
+    return Q
+
 # Bestimmung der optimalen Aktion für einen Zustand
 def get_best_action(Q, state):
-    return np.argmax(Q[state])
\ No newline at end of file
+    return np.argmax(Q[state])
+
+# Greedy-Policy einmalig je geladener Q-Tabelle kompilieren; die Evaluation braucht
+# danach pro Schritt nur einen Tabellenzugriff statt argmax über die Aktionen
+def compile_policy(Q):
+    Q = np.asarray(Q)
+    actions = np.argmax(Q, axis=1).astype(np.uint8)
+    values = np.take_along_axis(Q, actions[:, None].astype(np.int64), axis=1)[:, 0].astype(np.float64)
+    if Q.shape[1] > 1:
+        second = np.partition(Q, -2, axis=1)[:, -2]
+        action_gap = values - second
+    else:
+        action_gap = np.zeros(len(values))
+    for array in (actions, values, action_gap):
+        array.setflags(write=False)
+    return CompiledPolicy(actions, values, action_gap)
+
+# Indizierte Max-Prioritätswarteschlange über (s, a)-Paare: heapq mit Eintragsverzeichnis,
+# veraltete Einträge werden beim Erhöhen der Priorität markiert und beim Entnehmen übersprungen
+class IndexedPriorityQueue:
+
+    def __init__(self):
+        self.heap = []
+        self.entries = {}
+        self.counter = itertools.count()
+
+    def __len__(self):
+        return len(self.entries)
+
+    # Einfügen bzw. Priorität erhöhen (niedrigere Prioritäten ändern bestehende Einträge nicht)
+    def push(self, key, priority):
+        entry = self.entries.get(key)
+        if entry is not None:
+            if -entry[0] >= priority:
+                return
+            entry[2] = None
+        entry = [-priority, next(self.counter), key]
+        self.entries[key] = entry
+        heapq.heappush(self.heap, entry)
+
+    # Schlüssel mit höchster Priorität entnehmen
+    def pop(self):
+        while self.heap:
+            _, _, key = heapq.heappop(self.heap)
+            if key is not None:
+                del self.entries[key]
+                return key
+        raise KeyError("pop from empty priority queue")
+
+# Prioritized Sweeping: gelerntes Tabellenmodell, Vorgänger-Index je Zustand und
+# Warteschlange der Bellman-Fehler; Planungsupdates gehen zu den größten Wertänderungen
+# und werden rückwärts über die Vorgänger weitergereicht
+class PrioritizedSweepingLearner:
+
+    def __init__(self, n_states, n_actions, planning_steps=PLANNING_STEPS, theta=PRIORITY_THRESHOLD,
+                 alpha=ALPHA, gamma=GAMMA):
+        self.n_actions = n_actions
+        self.planning_steps = planning_steps
+        self.theta = theta
+        self.alpha = alpha
+        self.gamma = gamma
+        self.updates = 0
+
+        self.model_next = np.zeros((n_states, n_actions), dtype=np.int64)
+        self.model_reward = np.zeros((n_states, n_actions))
+        self.model_done = np.zeros((n_states, n_actions), dtype=bool)
+        self.predecessors = [set() for _ in range(n_states)]
+        self.queue = IndexedPriorityQueue()
+
+    # Bellman-Fehler eines Paares gemäß Modell
+    def _model_error(self, Q, state, action):
+        next_state = self.model_next[state, action]
+        future = 0.0 if self.model_done[state, action] else self.gamma * np.max(Q[next_state])
+        return self.model_reward[state, action] + future - Q[state, action]
+
+    def observe(self, Q, state, action, reward, next_state, done):
+        self.model_next[state, action] = next_state
+        self.model_reward[state, action] = reward
+        self.model_done[state, action] = done
+        self.predecessors[next_state].add(state * self.n_actions + action)
+
+        priority = abs(self._model_error(Q, state, action))
+        if priority > self.theta:
+            self.queue.push(state * self.n_actions + action, priority)
+
+        for _ in range(self.planning_steps):
+            if len(self.queue) == 0:
+                break
+            s, a = divmod(self.queue.pop(), self.n_actions)
+            Q[s, a] += self.alpha * self._model_error(Q, s, a)
+            self.updates += 1
+
+            # Vorgänger von s neu priorisieren
+            for pair in self.predecessors[s]:
+                ps, pa = divmod(pair, self.n_actions)
+                priority = abs(self._model_error(Q, ps, pa))
+                if priority > self.theta:
+                    self.queue.push(pair, priority)
\ No newline at end of file
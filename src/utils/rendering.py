@@ -0,0 +1,132 @@
+# utils/rendering.py
+
+import pygame
+from config import CELL_SIZE
+
+COLORS = {
+    'background': (224, 247, 255),
+    'grid_line': (200, 200, 200),
+    'text': (0, 0, 0)
+}
+
+ACTION_SYMBOLS = ['↑', '→', '↓', '←']
+AGENT_SYMBOL = "🚢"
+LANDMARK_SYMBOLS = ["🧭", "📦", "🏁", "🪨"]
+
+
+# Landmarken eines Layouts als {Position: Symbol}; bei Überschneidung gilt die
+# Reihenfolge Start, Pickup, Dropoff, Ziel, Hindernis (wie früher in draw_grid)
+def layout_symbols(env):
+    landmarks = [("🧭", [getattr(env, "start_pos", None)]),
+                 ("📦", [getattr(env, "pickup_pos", None)]),
+                 ("🏁", [getattr(env, "dropoff_pos", None)]),
+                 ("🏁", [getattr(env, "goal_pos", None)]),
+                 ("🪨", getattr(env, "obstacles", []))]
+
+    symbols = {}
+    for symbol, positions in landmarks:
+        for pos in positions:
+            if pos is not None:
+                symbols.setdefault(tuple(pos), symbol)
+    return symbols
+
+
+# ============================================================================
+# GridRenderer Klasse
+# ============================================================================
+
+# Zeichnet Grid, Policy-Pfeile und Agenten mit vorgerenderten Symbolen. Die Pfeilebene
+# wird je kompilierter Policy einmal gerendert, der Hintergrund je Layout daraus abgeleitet;
+# pro Frame werden nur die Zellen neu gezeichnet, die ein Agent verlassen oder betreten hat.
+class GridRenderer:
+
+    def __init__(self, grid_size, cell_size=CELL_SIZE, font_name="Segoe UI Emoji", font_size=40):
+        self.grid_size = grid_size
+        self.cell_size = cell_size
+        self.size = grid_size * cell_size
+
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = pygame.font.SysFont(font_name, font_size)
+        symbols = ACTION_SYMBOLS + LANDMARK_SYMBOLS + [AGENT_SYMBOL, "?"]
+        self.glyphs = {symbol: font.render(symbol, True, COLORS['text']) for symbol in symbols}
+
+        # Leere Zelle mit Gitterlinie
+        self.empty_cell = pygame.Surface((cell_size, cell_size))
+        self.empty_cell.fill(COLORS['background'])
+        pygame.draw.rect(self.empty_cell, COLORS['grid_line'], self.empty_cell.get_rect(), 1)
+
+        self._arrow_layers = {}
+        self._background = None
+        self._background_key = None
+        self._agent_cells = set()
+
+    # Rechteck der Zelle pos = (Zeile, Spalte)
+    def cell_rect(self, pos):
+        return pygame.Rect(pos[1] * self.cell_size, pos[0] * self.cell_size, self.cell_size, self.cell_size)
+
+    # Symbol zentriert in die Zelle pos zeichnen
+    def _blit_glyph(self, surface, symbol, pos):
+        glyph = self.glyphs[symbol]
+        surface.blit(glyph, glyph.get_rect(center=self.cell_rect(pos).center))
+
+    # Grid mit dem Greedy-Pfeil jeder Zelle (Container: unbeladene Zustände); einmal je Policy
+    def _arrow_layer(self, policy):
+        key = id(policy)
+        if key not in self._arrow_layers:
+            layer = pygame.Surface((self.size, self.size))
+            actions = policy.actions.tolist()
+            for cell in range(self.grid_size * self.grid_size):
+                pos = divmod(cell, self.grid_size)
+                layer.blit(self.empty_cell, self.cell_rect(pos))
+                symbol = ACTION_SYMBOLS[actions[cell]] if cell < len(actions) else "?"
+                self._blit_glyph(layer, symbol, pos)
+            # Die Policy bleibt referenziert, damit id(policy) nicht neu vergeben wird
+            self._arrow_layers[key] = (policy, layer)
+        return self._arrow_layers[key][1]
+
+    # Hintergrund (Pfeile + Landmarken) für Layout und Policy; wird nur bei Änderung neu gebaut
+    def _layout_background(self, env, policy):
+        symbols = layout_symbols(env)
+        key = (id(policy), tuple(sorted(symbols.items())))
+        if key != self._background_key:
+            background = self._arrow_layer(policy).copy()
+            for pos, symbol in symbols.items():
+                background.blit(self.empty_cell, self.cell_rect(pos))
+                self._blit_glyph(background, symbol, pos)
+            self._background = background
+            self._background_key = key
+            return background, True
+        return self._background, False
+
+    # Nächsten Frame vollständig zeichnen (z. B. nach Wechsel der Zielfläche)
+    def invalidate(self):
+        self._background_key = None
+
+    # Frame zeichnen; liefert die geänderten Rechtecke für pygame.display.update.
+    # agent_positions ist eine Liste von (Zeile, Spalte), eine pro Schiff; surface muss
+    # den vorherigen Frame enthalten, da unveränderte Zellen nicht neu gezeichnet werden.
+    def draw(self, surface, env, policy, agent_positions):
+        background, changed = self._layout_background(env, policy)
+        previous = self._agent_cells
+        current = {tuple(pos) for pos in agent_positions}
+
+        if changed:
+            surface.blit(background, (0, 0))
+            dirty = [surface.get_rect()]
+            entered = current
+        else:
+            left = previous - current
+            entered = current - previous
+            dirty = [self.cell_rect(pos) for pos in left | entered]
+            for pos in left:
+                surface.blit(background, self.cell_rect(pos), self.cell_rect(pos))
+
+        # Agentenzellen zeigen nur das Schiff (wie früher in draw_grid): leere Zelle statt
+        # Pfeil bzw. Landmarke darunter, sonst überlagern sich die Symbole
+        for pos in entered:
+            surface.blit(self.empty_cell, self.cell_rect(pos))
+            self._blit_glyph(surface, AGENT_SYMBOL, pos)
+
+        self._agent_cells = current
+        return dirty
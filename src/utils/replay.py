@@ -0,0 +1,118 @@
+# utils/replay.py
+
+import numpy as np
+from config import ALPHA, GAMMA, SEED, REPLAY_CAPACITY, REPLAY_BATCH_SIZE, PLANNING_STEPS
+from utils.qlearning import update_q_values
+
+
+# ============================================================================
+# Replay-Puffer
+# ============================================================================
+
+# Ringpuffer fester Kapazität mit vorallokierten Arrays (O(1)-Einfügen, vektorisiertes Ziehen)
+class ReplayBuffer:
+
+    def __init__(self, capacity=REPLAY_CAPACITY):
+        self.capacity = capacity
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.position = 0
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # Einzelnen Übergang einfügen (überschreibt den ältesten bei vollem Puffer)
+    def add(self, state, action, reward, next_state, done):
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    # Array von Übergängen einfügen (z.B. aus einer vektorisierten Umgebung)
+    def add_batch(self, states, actions, rewards, next_states, dones):
+        idx = (self.position + np.arange(len(states))) % self.capacity
+        self.states[idx] = states
+        self.actions[idx] = actions
+        self.rewards[idx] = rewards
+        self.next_states[idx] = next_states
+        self.dones[idx] = dones
+        self.position = (self.position + len(states)) % self.capacity
+        self.size = min(self.size + len(states), self.capacity)
+
+    # Gleichverteiltes Ziehen von batch_size Übergängen (mit Zurücklegen)
+    def sample(self, batch_size, rng):
+        idx = rng.integers(0, self.size, size=batch_size)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx], self.dones[idx]
+
+
+# ============================================================================
+# Lernverfahren mit Wiederverwendung von Übergängen
+# ============================================================================
+
+# Q-Learning mit Experience Replay: pro echtem Schritt ein Batch-Update aus dem Puffer
+class ExperienceReplayLearner:
+
+    def __init__(self, capacity=REPLAY_CAPACITY, batch_size=REPLAY_BATCH_SIZE,
+                 alpha=ALPHA, gamma=GAMMA, seed=SEED):
+        self.buffer = ReplayBuffer(capacity)
+        self.batch_size = batch_size
+        self.alpha = alpha
+        self.gamma = gamma
+        self.rng = np.random.default_rng(seed)
+        self.updates = 0
+
+    def observe(self, Q, state, action, reward, next_state, done):
+        self.buffer.add(state, action, reward, next_state, done)
+        update_q_values(Q, *self.buffer.sample(self.batch_size, self.rng), self.alpha, self.gamma)
+        self.updates += self.batch_size
+
+
+# Dyna-Q: direktes Update, gelerntes Tabellenmodell (letzter beobachteter Übergang je (s, a))
+# und planning_steps simulierte Updates aus bereits besuchten Paaren pro echtem Schritt
+class DynaQLearner:
+
+    def __init__(self, n_states, n_actions, planning_steps=PLANNING_STEPS,
+                 alpha=ALPHA, gamma=GAMMA, seed=SEED):
+        self.n_actions = n_actions
+        self.planning_steps = planning_steps
+        self.alpha = alpha
+        self.gamma = gamma
+        self.rng = np.random.default_rng(seed)
+        self.updates = 0
+
+        self.model_next = np.zeros((n_states, n_actions), dtype=np.int64)
+        self.model_reward = np.zeros((n_states, n_actions))
+        self.model_done = np.zeros((n_states, n_actions), dtype=bool)
+        self.known = np.zeros(n_states * n_actions, dtype=bool)
+        self.pairs = np.zeros(n_states * n_actions, dtype=np.int64)
+        self.n_pairs = 0
+
+    def observe(self, Q, state, action, reward, next_state, done):
+        target = reward + (0.0 if done else self.gamma * np.max(Q[next_state]))
+        Q[state, action] += self.alpha * (target - Q[state, action])
+
+        # Modell aktualisieren und neue Paare für die Planung registrieren
+        self.model_next[state, action] = next_state
+        self.model_reward[state, action] = reward
+        self.model_done[state, action] = done
+        pair = state * self.n_actions + action
+        if not self.known[pair]:
+            self.known[pair] = True
+            self.pairs[self.n_pairs] = pair
+            self.n_pairs += 1
+
+        # Planung: simulierte Übergänge aus dem Modell als ein Batch-Update
+        states, actions = np.divmod(self.pairs[self.rng.integers(0, self.n_pairs, size=self.planning_steps)],
+                                    self.n_actions)
+        update_q_values(Q, states, actions, self.model_reward[states, actions],
+                        self.model_next[states, actions], self.model_done[states, actions],
+                        self.alpha, self.gamma)
+        self.updates += 1 + self.planning_steps
@@ -1,24 +1,28 @@
 # utils/reporting.py
 
 import numpy as np
-from config import EPISODES, ENV_MODE, ALPHA, GAMMA, EPSILON, SEED, EXPORT_PDF, EXPORT_PATH
+from config import EXPORT_PDF, EXPORT_PATH, RunConfig
 
 
 # Ausgabe der Trainingsergebnisse
-def print_training_results(rewards_per_episode, success_per_episode, steps_per_episode):
+def print_training_results(rewards_per_episode, success_per_episode, steps_per_episode, config=None):
+    config = config if config is not None else RunConfig()
+    episodes = len(success_per_episode)
     total_successes = sum(success_per_episode)
     avg_reward = np.mean(rewards_per_episode)
     avg_steps = np.mean(steps_per_episode)
 
     print(f"\n" + "=" * 60)
-    print(f"TRAININGSERGEBNISSE ({EPISODES} Episoden, Modus: {ENV_MODE})")
+    print(f"TRAININGSERGEBNISSE ({episodes} Episoden, Modus: {config.env_mode})")
     print("=" * 60)
 
     print(f"\nErfolgsstatistik:")
-    print(f"  Erfolgreiche Episoden: {total_successes}/{EPISODES} ({(total_successes / EPISODES) * 100:.1f}%)")
+    print(f"  Erfolgreiche Episoden: {total_successes}/{episodes} ({(total_successes / episodes) * 100:.1f}%)")
+    if episodes < config.episodes:
+        print(f"  Vorzeitig beendet: {episodes} von {config.episodes} Episoden")
 
     # Erfolgsrate in verschiedenen Phasen
-    phase_size = min(500, EPISODES // 4)
+    phase_size = min(500, episodes // 4)
     if len(success_per_episode) >= phase_size * 2:
         early_success = np.mean(success_per_episode[:phase_size]) * 100
         late_success = np.mean(success_per_episode[-phase_size:]) * 100
@@ -38,10 +42,10 @@ def print_training_results(rewards_per_episode, success_per_episode, steps_per_e
     print(f"  Maximum: {max(steps_per_episode)}")
 
     print(f"\nHyperparameter:")
-    print(f"  Lernrate (α): {ALPHA}")
-    print(f"  Discount Factor (γ): {GAMMA}")
-    print(f"  Epsilon (ε): {EPSILON}")
-    print(f"  Seed: {SEED}")
+    print(f"  Lernrate (α): {config.alpha}")
+    print(f"  Discount Factor (γ): {config.gamma}")
+    print(f"  Epsilon (ε): {config.epsilon}")
+    print(f"  Seed: {config.seed}")
 
     if EXPORT_PDF:
         print(f"\nPDF-Exports gespeichert in: {EXPORT_PATH}")
@@ -74,4 +78,39 @@ def print_evaluation_results(results_cause, results_solved, rewards_all, episode
     print(f"  Median: {np.median(rewards_all):.2f}")
 
     if EXPORT_PDF:
-        print(f"\nPDF-Exports gespeichert in: {EXPORT_PATH}")
\ No newline at end of file
+        print(f"\nPDF-Exports gespeichert in: {EXPORT_PATH}")
+
+
+# Ausgabe der 95%-Konfidenzintervalle einer Stichprobe (utils/evaluation_engine.py::confidence_intervals)
+def print_confidence_intervals(intervals, episodes):
+    success_low, success_high = intervals["success_ci"]
+    reward_low, reward_high = intervals["reward_ci"]
+    print(f"\nKonfidenzintervalle (95%, {episodes} Episoden):")
+    print(f"  Erfolgsrate: [{success_low:.1%}, {success_high:.1%}] (±{intervals['success_half_width']:.1%})")
+    print(f"  Ø Reward: [{reward_low:.2f}, {reward_high:.2f}] (±{intervals['reward_half_width']:.2f})")
+
+
+# Ausgabe der Optimalitätslücke gegenüber der Oracle-Schranke (utils/planning.py)
+def print_optimality_gap(gap, env_mode):
+    print(f"\nOptimalitätslücke zur Oracle-Schranke ({env_mode}):")
+    print(f"  Oracle-Schranke (Layout bekannt): {gap['optimal_value']:.3f}")
+    print(f"  Wert Greedy-Policy (mit Schleifen- und Timeout-Abbruch): {gap['policy_value']:.3f}")
+    print(f"  Lücke: {gap['gap']:.3f}")
+    print(f"  Optimale Aktionen: {gap['action_agreement'] * 100:.1f}%")
+
+
+# Ausgabe der Sample-Effizienz (echte Umgebungsschritte bis zur Zielerfolgsrate)
+def print_sample_efficiency(learner_name, steps_per_episode, success_per_episode, updates,
+                            target_episode, target_rate, window):
+    real_steps = int(np.sum(steps_per_episode))
+
+    print(f"\nSample-Effizienz (Lernverfahren: {learner_name}):")
+    print(f"  Echte Umgebungsschritte: {real_steps}")
+    print(f"  Q-Updates: {updates} ({updates / max(real_steps, 1):.1f} pro echtem Schritt)")
+    if target_episode is None:
+        print(f"  Konvergenz (gleitende Erfolgsrate ≥ {target_rate * 100:.0f}%, {window} Episoden): "
+              f"nicht erreicht")
+    else:
+        steps_to_target = int(np.sum(steps_per_episode[:target_episode]))
+        print(f"  Konvergenz (gleitende Erfolgsrate ≥ {target_rate * 100:.0f}%, {window} Episoden): "
+              f"nach {target_episode} Episoden / {steps_to_target} echten Schritten")
\ No newline at end of file
@@ -0,0 +1,165 @@
+# utils/trajectory.py
+
+import os
+import json
+from datetime import datetime
+import numpy as np
+from config import TRAJECTORY_CHUNK_STEPS
+
+TRAJECTORY_FORMAT_VERSION = 1
+
+# Spalten je aufgezeichnetem Schritt; jede Spalte ist eine rohe Binärdatei <name>.bin
+TRAJECTORY_COLUMNS = {
+    "episode": np.int64,
+    "step": np.int32,
+    "state": np.int32,
+    "action": np.int8,
+    "reward": np.float64,
+    "outcome": np.int8
+}
+
+
+# ============================================================================
+# Aufzeichnung
+# ============================================================================
+
+# Schritte werden in vorallokierte Spaltenpuffer geschrieben und blockweise an die
+# Spaltendateien angehängt. close() sortiert die Zeilen stabil nach Episode (vektorisierte
+# Schleifen zeichnen verschränkt auf) und schreibt den Episodenindex (Episode, Offset, Länge)
+# sowie den JSON-Kopf trajectory.json.
+class TrajectoryRecorder:
+
+    def __init__(self, path, chunk_size=TRAJECTORY_CHUNK_STEPS, metadata=None):
+        os.makedirs(path, exist_ok=True)
+        self.path = path
+        self.chunk_size = chunk_size
+        self.metadata = metadata or {}
+        self.buffers = {name: np.empty(chunk_size, dtype=dtype) for name, dtype in TRAJECTORY_COLUMNS.items()}
+        self.files = {name: open(os.path.join(path, f"{name}.bin"), "wb") for name in TRAJECTORY_COLUMNS}
+        self.size = 0
+        self.rows = 0
+
+    # Einzelnen Schritt aufzeichnen (skalare Schleifen)
+    def record(self, episode, step, state, action, reward, outcome):
+        if self.size == self.chunk_size:
+            self.flush()
+        i = self.size
+        buffers = self.buffers
+        buffers["episode"][i] = episode
+        buffers["step"][i] = step
+        buffers["state"][i] = state
+        buffers["action"][i] = action
+        buffers["reward"][i] = reward
+        buffers["outcome"][i] = outcome
+        self.size = i + 1
+
+    # Mehrere Schritte auf einmal aufzeichnen (vektorisierte Schleifen, gleich lange Arrays)
+    def record_batch(self, episodes, steps, states, actions, rewards, outcomes):
+        n = len(episodes)
+        if self.size + n > self.chunk_size:
+            self.flush()
+        if n > self.chunk_size:
+            for name, values in zip(TRAJECTORY_COLUMNS, (episodes, steps, states, actions, rewards, outcomes)):
+                np.asarray(values, dtype=TRAJECTORY_COLUMNS[name]).tofile(self.files[name])
+            self.rows += n
+            return
+
+        rows = slice(self.size, self.size + n)
+        buffers = self.buffers
+        buffers["episode"][rows] = episodes
+        buffers["step"][rows] = steps
+        buffers["state"][rows] = states
+        buffers["action"][rows] = actions
+        buffers["reward"][rows] = rewards
+        buffers["outcome"][rows] = outcomes
+        self.size += n
+
+    # Gepufferte Schritte an die Spaltendateien anhängen
+    def flush(self):
+        for name, buffer in self.buffers.items():
+            buffer[:self.size].tofile(self.files[name])
+        self.rows += self.size
+        self.size = 0
+
+    # Dateien abschließen: nach Episode sortieren, Index und Kopf schreiben
+    def close(self):
+        self.flush()
+        for file in self.files.values():
+            file.close()
+
+        episodes = _column(self.path, "episode", self.rows)
+        if np.any(episodes[1:] < episodes[:-1]):
+            order = np.argsort(episodes, kind="stable")
+            del episodes
+            for name in TRAJECTORY_COLUMNS:
+                sorted_column = _column(self.path, name, self.rows)[order]
+                sorted_column.tofile(os.path.join(self.path, f"{name}.bin"))
+            episodes = _column(self.path, "episode", self.rows)
+
+        episode_ids, offsets, lengths = np.unique(episodes, return_index=True, return_counts=True)
+        index = np.stack([episode_ids, offsets, lengths], axis=1).astype(np.int64)
+        np.save(os.path.join(self.path, "index.npy"), index)
+
+        header = {
+            "format_version": TRAJECTORY_FORMAT_VERSION,
+            "rows": int(self.rows),
+            "episodes": int(len(episode_ids)),
+            "columns": {name: np.dtype(dtype).name for name, dtype in TRAJECTORY_COLUMNS.items()},
+            "created": datetime.now().isoformat(timespec="seconds"),
+            **self.metadata
+        }
+        with open(os.path.join(self.path, "trajectory.json"), "w", encoding="utf-8") as f:
+            json.dump(header, f, indent=2, default=str)
+        print(f"Trajektorien gespeichert: {self.path} ({self.rows} Schritte, {len(episode_ids)} Episoden)")
+
+    # Verwendung als Kontextmanager (close() beim Verlassen)
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# ============================================================================
+# Laden
+# ============================================================================
+
+# Spalte name als schreibgeschützte Speicherabbildung (leeres Array bei 0 Zeilen)
+def _column(path, name, rows):
+    dtype = TRAJECTORY_COLUMNS[name]
+    if rows == 0:
+        return np.zeros(0, dtype=dtype)
+    return np.memmap(os.path.join(path, f"{name}.bin"), dtype=dtype, mode="r", shape=(rows,))
+
+
+# JSON-Kopf einer Aufzeichnung
+def load_trajectory_metadata(path):
+    with open(os.path.join(path, "trajectory.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+# Episodenindex (Episode, Offset, Länge) je Zeile
+def load_trajectory_index(path):
+    return np.load(os.path.join(path, "index.npy"))
+
+
+# Alle Spalten speicherabgebildet; Daten werden erst beim Zugriff gelesen
+def load_trajectories(path):
+    rows = load_trajectory_metadata(path)["rows"]
+    return {name: _column(path, name, rows) for name in TRAJECTORY_COLUMNS}
+
+
+# Eine Episode laden; liest über den Index nur deren Bytes aus jeder Spaltendatei
+def load_episode(path, episode):
+    index = load_trajectory_index(path)
+    position = np.searchsorted(index[:, 0], episode)
+    if position == len(index) or index[position, 0] != episode:
+        raise KeyError(f"Episode {episode} nicht aufgezeichnet: {path}")
+
+    _, offset, length = index[position]
+    columns = {}
+    for name, dtype in TRAJECTORY_COLUMNS.items():
+        itemsize = np.dtype(dtype).itemsize
+        columns[name] = np.fromfile(os.path.join(path, f"{name}.bin"), dtype=dtype, count=int(length),
+                                    offset=int(offset) * itemsize)
+    return columns
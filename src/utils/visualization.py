@@ -227,7 +227,8 @@ def create_comparison_table(all_metrics):
             "Schleifen (%)": f"{metrics['loop_abort_rate'] * 100:.1f}",
             "Hindernisse (%)": f"{metrics['obstacle_rate'] * 100:.1f}",
             "Ø Reward": f"{metrics['avg_reward']:.2f}",
-            "Ø Schritte": f"{metrics['avg_steps_to_goal']:.1f}" if metrics['avg_steps_to_goal'] else "N/A"
+            "Ø Schritte": f"{metrics['avg_steps_to_goal']:.1f}" if metrics['avg_steps_to_goal'] else "N/A",
+            "Episoden": metrics.get("episodes", "N/A")
         })
 
     df = pd.DataFrame(data)
@@ -23,67 +23,18 @@ from envs.container_environment import ContainerShipEnv
 
 # Utils
 from utils.common import set_all_seeds, obs_to_state, setup_export
-from utils.qlearning import load_q_table, get_best_action
+from utils.qlearning import load_q_table, compile_policy
 from utils.position import get_position
+from utils.rendering import GridRenderer
 
 
 # ============================================================================
 # Visualisierung
 # ============================================================================
 
-# Darstellung des Grids mit Agent und Policy
-def draw_grid(screen, font, env, agent_pos, Q):
-    colors = {
-        'background': (224, 247, 255),
-        'grid_line': (200, 200, 200),
-        'text': (0, 0, 0)
-    }
-
-    actions_map = {0: '↑', 1: '→', 2: '↓', 3: '←'}
-
-    screen.fill(colors['background'])
-
-    # Grid zeichnen
-    for i in range(env.grid_size):
-        for j in range(env.grid_size):
-            rect = pygame.Rect(j * CELL_SIZE, i * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, colors['grid_line'], rect, 1)
-            pos = (i, j)
-
-            # Symbol bestimmen
-            if pos == agent_pos:
-                symbol = "🚢"
-            elif hasattr(env, 'start_pos') and pos == env.start_pos:
-                symbol = "🧭"
-            elif hasattr(env, "pickup_pos") and pos == env.pickup_pos:
-                symbol = "📦"
-            elif hasattr(env, "dropoff_pos") and pos == env.dropoff_pos:
-                symbol = "🏁"
-            elif hasattr(env, "goal_pos") and pos == env.goal_pos:
-                symbol = "🏁"
-            elif pos in getattr(env, "obstacles", []):
-                symbol = "🪨"
-            else:
-                # Policy-Pfeil
-                if ENV_MODE == "container":
-                    state = obs_to_state((i, j, 0), ENV_MODE, env.grid_size)
-                else:
-                    state = env.pos_to_state((i, j))
-
-                if state < Q.shape[0]:
-                    action = get_best_action(Q, state)
-                    symbol = actions_map[action]
-                else:
-                    symbol = "?"
-
-            # Symbol zeichnen
-            text_surface = font.render(symbol, True, colors['text'])
-            text_rect = text_surface.get_rect(
-                center=(j * CELL_SIZE + CELL_SIZE // 2, i * CELL_SIZE + CELL_SIZE // 2)
-            )
-            screen.blit(text_surface, text_rect)
-
-    pygame.display.flip()
+# Darstellung des Grids mit Agent und Policy; aktualisiert nur die geänderten Zellen
+def draw_grid(screen, renderer, env, agent_pos, policy):
+    pygame.display.update(renderer.draw(screen, env, policy, [agent_pos]))
 
 
 # Speicherung des Screenshots
@@ -110,10 +61,11 @@ def run_agent():
     Q = load_q_table(ENV_MODE)
 
     if Q is None:
-        print(f"FEHLER: Q-Tabelle nicht gefunden: {Q_TABLE_PATH}")
+        print(f"FEHLER: Q-Tabelle nicht gefunden: {get_q_table_path(ENV_MODE)}")
         print("Bitte führen Sie zuerst das Training aus.")
         sys.exit(1)
 
+    policy = compile_policy(Q)
     setup_export()
 
     # Pygame
@@ -121,7 +73,7 @@ def run_agent():
     screen_size = CELL_SIZE * env.grid_size
     screen = pygame.display.set_mode((screen_size, screen_size))
     pygame.display.set_caption(f"Agent Policy - {ENV_MODE}")
-    font = pygame.font.SysFont("Segoe UI Emoji", 40)
+    renderer = GridRenderer(env.grid_size)
 
     # Episode starten
     obs, _ = env.reset()
@@ -133,7 +85,7 @@ def run_agent():
     print(f"Start: {agent_pos}")
 
     # Ersten Frame zeichnen
-    draw_grid(screen, font, env, agent_pos, Q)
+    draw_grid(screen, renderer, env, agent_pos, policy)
     time.sleep(1.0)
 
     # Hauptschleife
@@ -150,7 +102,7 @@ def run_agent():
 
         # Aktion ausführen
         state = obs_to_state(obs, ENV_MODE, env.grid_size)
-        action = get_best_action(Q, state)
+        action = policy.actions[state]
         obs, reward, terminated, truncated, _ = env.step(action)
 
         # Update
@@ -161,7 +113,7 @@ def run_agent():
         print(f"Schritt {step_count}: {agent_pos}, Reward: {reward}")
 
         # Zeichnen
-        draw_grid(screen, font, env, agent_pos, Q)
+        draw_grid(screen, renderer, env, agent_pos, policy)
         time.sleep(FRAME_DELAY)
 
         # Ende prüfen
@@ -0,0 +1,7 @@
+# tests/conftest.py
+
+import os
+import sys
+
+# Module liegen unter src/ und importieren sich gegenseitig ohne Paketpräfix
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "src")))
@@ -0,0 +1,161 @@
+# test_environments.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import numpy as np
+import pytest
+
+from config import N_ACTIONS, RunConfig
+from envs.grid_environment import GridEnvironment
+from envs.container_environment import ContainerShipEnv
+from envs.vector_grid_environment import VectorGridEnvironment
+from envs.vector_container_environment import VectorContainerShipEnv
+from envs.outcomes import OUTCOME_NONE, OUTCOME_PICKUP
+
+
+GRID_MODES = ["static", "random_start", "random_goal", "random_obstacles"]
+NUM_ENVS = 4
+STEPS = 400
+
+
+# ============================================================================
+# Hilfsfunktionen
+# ============================================================================
+
+# Skalare GridEnvironment mit dem aktuellen Layout des Vektor-Slots slot
+def grid_env_for_slot(vector_env, slot, config):
+    env = GridEnvironment(mode=vector_env.mode, config=config)
+    env._initialize_environment()
+    env.start_pos = env.state_to_pos(int(vector_env.start_states[slot]))
+    env.goal_pos = env.state_to_pos(int(vector_env.goal_states[slot]))
+    env.obstacles = [env.state_to_pos(int(cell)) for cell in vector_env.obstacle_cells[slot]]
+    env.agent_pos = env.start_pos
+    env.state = env.pos_to_state(env.start_pos)
+    return env
+
+
+# Skalare ContainerShipEnv mit dem aktuellen Pickup-/Dropoff-Layout des Vektor-Slots slot
+def container_env_for_slot(vector_env, slot, config):
+    env = ContainerShipEnv(config)
+    env._initialize_environment()
+    env.pickup_pos = divmod(int(vector_env.pickup_cells[slot]), env.grid_size)
+    env.dropoff_pos = divmod(int(vector_env.dropoff_cells[slot]), env.grid_size)
+    return env
+
+
+# Zustandsindex der Container-Beobachtung (x, y, beladen) wie in der Q-Tabelle
+def container_state(env, obs):
+    return env.pos_to_state((obs[0], obs[1])) + env.grid_size * env.grid_size * obs[2]
+
+
+# Vektor-Rollout mit zufälligen Aktionen gegen je eine skalare Umgebung pro Slot
+def assert_matches_scalar_rollouts(vector_env, make_scalar, to_state, seed):
+    rng = np.random.default_rng(seed)
+    vector_env.reset(seed=seed)
+    scalar_envs = [make_scalar(vector_env, slot) for slot in range(NUM_ENVS)]
+    finished = 0
+
+    for _ in range(STEPS):
+        actions = rng.integers(0, N_ACTIONS, size=NUM_ENVS)
+        _, rewards, terminated, truncated, infos = vector_env.step(actions)
+
+        for slot, env in enumerate(scalar_envs):
+            obs, reward, done, _, info = env.step(int(actions[slot]))
+            assert infos["final_obs"][slot] == to_state(env, obs)
+            assert rewards[slot] == pytest.approx(reward)
+            assert terminated[slot] == done
+            assert infos["outcome"][slot] == info["outcome"]
+            assert not truncated[slot]
+
+            if done:
+                finished += 1
+                scalar_envs[slot] = make_scalar(vector_env, slot)
+
+    assert finished > 0
+
+
+# ============================================================================
+# Vektor-Umgebungen gegen skalare Rollouts
+# ============================================================================
+
+@pytest.mark.parametrize("mode", GRID_MODES)
+@pytest.mark.parametrize("seed", [0, 7])
+def test_vector_grid_matches_scalar_rollouts(mode, seed):
+    config = RunConfig(env_mode=mode)
+    vector_env = VectorGridEnvironment(NUM_ENVS, mode=mode, config=config,
+                                       slot_seeds=np.random.SeedSequence(seed).spawn(NUM_ENVS))
+    assert_matches_scalar_rollouts(vector_env, lambda env, slot: grid_env_for_slot(env, slot, config),
+                                   lambda env, obs: obs, seed)
+
+
+@pytest.mark.parametrize("seed", [0, 7])
+def test_vector_container_matches_scalar_rollouts(seed):
+    config = RunConfig(env_mode="container")
+    vector_env = VectorContainerShipEnv(NUM_ENVS, config=config,
+                                        slot_seeds=np.random.SeedSequence(seed).spawn(NUM_ENVS))
+    assert_matches_scalar_rollouts(vector_env, lambda env, slot: container_env_for_slot(env, slot, config),
+                                   container_state, seed)
+
+
+# Gleiche slot_seeds ergeben je Slot dieselbe Layoutfolge, unabhängig von der Anzahl der Slots
+@pytest.mark.parametrize("mode", ["random_goal", "random_obstacles"])
+def test_slot_streams_do_not_depend_on_num_envs(mode):
+    config = RunConfig(env_mode=mode)
+    slot_seeds = np.random.SeedSequence(3).spawn(NUM_ENVS)
+    wide = VectorGridEnvironment(NUM_ENVS, mode=mode, config=config, slot_seeds=slot_seeds)
+    narrow = VectorGridEnvironment(1, mode=mode, config=config, slot_seeds=slot_seeds[:1])
+    wide.reset()
+    narrow.reset()
+    assert wide.goal_states[0] == narrow.goal_states[0]
+    assert np.array_equal(wide.obstacle_cells[0], narrow.obstacle_cells[0])
+
+
+# ============================================================================
+# Kompilierte Modelle gegen env.step
+# ============================================================================
+
+@pytest.mark.parametrize("mode", GRID_MODES)
+def test_compiled_grid_model_matches_step(mode):
+    env = GridEnvironment(mode=mode, config=RunConfig(env_mode=mode))
+    env.reset(seed=11)
+    model = env.compile_model()
+    layout = (env.start_pos, env.goal_pos, env.obstacles)
+
+    for state in range(env.grid_size * env.grid_size):
+        for action in range(N_ACTIONS):
+            env._initialize_environment()
+            env.start_pos, env.goal_pos, env.obstacles = layout
+            env.agent_pos = env.state_to_pos(state)
+            env.state = state
+
+            next_state, reward, terminated, _, info = env.step(action)
+            assert model.next_state[state, action] == next_state
+            assert model.reward[state, action] == pytest.approx(reward)
+            assert model.terminal_code[state, action] == info["outcome"]
+            assert (model.terminal_code[state, action] != OUTCOME_NONE) == terminated
+
+
+def test_compiled_container_model_matches_step():
+    env = ContainerShipEnv(RunConfig(env_mode="container"))
+    env.reset(seed=11)
+    model = env.compile_model()
+    layout = (env.pickup_pos, env.dropoff_pos)
+    n_cells = env.grid_size * env.grid_size
+
+    for state in range(2 * n_cells):
+        for action in range(N_ACTIONS):
+            env._initialize_environment()
+            env.pickup_pos, env.dropoff_pos = layout
+            env.agent_pos = divmod(state % n_cells, env.grid_size)
+            env.container_loaded = bool(state // n_cells)
+
+            _, reward, terminated, _, info = env.step(action)
+            # Das Modell führt den tatsächlichen Folgezustand (nach Pickup beladen)
+            true_state = env.pos_to_state(env.agent_pos) + n_cells * int(env.container_loaded)
+            assert model.next_state[state, action] == true_state
+            assert model.reward[state, action] == pytest.approx(reward)
+            assert model.terminal_code[state, action] == info["outcome"]
+            code = model.terminal_code[state, action]
+            assert (code != OUTCOME_NONE and code != OUTCOME_PICKUP) == terminated
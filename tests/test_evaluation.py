@@ -0,0 +1,105 @@
+# test_evaluation.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import numpy as np
+import pytest
+
+from config import GRID_SIZE, N_ACTIONS, RunConfig
+from utils.qlearning import save_q_table
+from utils.planning import solve_q_star
+from utils.evaluation import calculate_metrics
+from utils.evaluation_engine import evaluate_exact, evaluate_sampled, episode_metrics, confidence_intervals
+from compare_scenarios import SCENARIOS, evaluate_scenarios_parallel
+
+
+# ============================================================================
+# Hilfsfunktionen
+# ============================================================================
+
+# Zufällige, aber feste Q-Tabelle
+def random_q_table(env_mode, seed=0):
+    n_states = GRID_SIZE * GRID_SIZE * (2 if env_mode == "container" else 1)
+    return np.random.default_rng(seed).standard_normal((n_states, N_ACTIONS))
+
+
+# Verrauschte optimale Q-Tabelle (Greedy-Policy mit gemischten Ergebnissen)
+def noisy_optimal_q_table(env_mode, noise, seed=0):
+    Q_star = solve_q_star(env_mode)[0]
+    return Q_star + noise * np.random.default_rng(seed).standard_normal(Q_star.shape)
+
+
+# ============================================================================
+# Exakte gegen gesampelte Evaluation
+# ============================================================================
+
+@pytest.mark.parametrize("env_mode, noise", [("random_start", 1.0), ("random_goal", 0.5), ("container", 0.5)])
+def test_exact_evaluation_within_sampled_interval(env_mode, noise):
+    config = RunConfig(env_mode=env_mode, eval_episodes=1000)
+    Q = noisy_optimal_q_table(env_mode, noise)
+
+    exact = episode_metrics(evaluate_exact(Q, env_mode, config))
+    sampled = evaluate_sampled(Q, env_mode, config)
+    intervals = confidence_intervals(sampled)
+
+    success_low, success_high = intervals["success_ci"]
+    reward_low, reward_high = intervals["reward_ci"]
+    assert success_low <= exact["success_rate"] <= success_high
+    assert reward_low <= exact["avg_reward"] <= reward_high
+
+
+# Gewichte der exakten Evaluation summieren sich zu eins
+@pytest.mark.parametrize("env_mode", ["static", "random_obstacles", "container"])
+def test_exact_weights_are_distribution(env_mode):
+    records = evaluate_exact(random_q_table(env_mode), env_mode, RunConfig(env_mode=env_mode))
+    assert records["weight"].sum() == pytest.approx(1.0)
+
+
+# ============================================================================
+# Kennzahlen
+# ============================================================================
+
+def test_calculate_metrics_matches_episode_metrics():
+    records = evaluate_exact(noisy_optimal_q_table("random_start", 1.0), "random_start",
+                             RunConfig(env_mode="random_start"))
+    assert calculate_metrics(records) == episode_metrics(records)
+
+
+# Frühere Zähler-Ergebnisse liefern dieselben Kennzahlen wie vor den Episodendatensätzen
+def test_calculate_metrics_accepts_counts():
+    results = {"success_count": 2, "timeout_count": 1, "loop_abort_count": 1, "obstacle_count": 0,
+               "episode_rewards": [10.0, 8.0, -10.0, -5.0], "steps_to_goal": [4, 6]}
+    metrics = calculate_metrics(results, 4)
+
+    assert metrics["success_rate"] == pytest.approx(0.5)
+    assert metrics["timeout_rate"] == pytest.approx(0.25)
+    assert metrics["loop_abort_rate"] == pytest.approx(0.25)
+    assert metrics["obstacle_rate"] == 0.0
+    assert metrics["avg_reward"] == pytest.approx(np.mean(results["episode_rewards"]))
+    assert metrics["reward_std"] == pytest.approx(np.std(results["episode_rewards"]))
+    assert metrics["avg_steps_to_goal"] == pytest.approx(5.0)
+    assert calculate_metrics(None, 4) is None
+
+
+# ============================================================================
+# Parallele Evaluation
+# ============================================================================
+
+# Ergebnis unabhängig von der Anzahl der Worker (eigener Zufallsstrom je Chunk)
+def test_parallel_evaluation_independent_of_workers(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    for name, scenario_config in SCENARIOS.items():
+        env_mode = scenario_config["env_mode"]
+        save_q_table(random_q_table(env_mode, seed=len(name)), env_mode)
+
+    run_config = RunConfig(exact_evaluation=False, eval_episodes=600)
+    single = evaluate_scenarios_parallel(run_config, workers=1)
+    pooled = evaluate_scenarios_parallel(run_config, workers=2)
+
+    assert set(single) == set(SCENARIOS) == set(pooled)
+    for name in SCENARIOS:
+        assert single[name].keys() == pooled[name].keys()
+        for column in single[name]:
+            assert np.array_equal(single[name][column], pooled[name][column])
@@ -0,0 +1,48 @@
+# tests/test_q_updates.py
+
+import numpy as np
+import pytest
+
+from utils.qlearning import update_q_value, update_q_values
+
+ALPHA = 0.3
+GAMMA = 0.9
+
+
+# Q-Tabelle mit zufälligen Werten (feste Saat)
+def random_q(n_states=12, n_actions=4, seed=0):
+    return np.random.default_rng(seed).normal(size=(n_states, n_actions))
+
+
+# Ein Batch-Schritt entspricht den skalaren Updates nacheinander. Doppelte (s, a)-Paare
+# haben gleiche Ziele, Folgezustände werden im Batch nicht selbst aktualisiert.
+@pytest.mark.parametrize("dones", [[False] * 6, [True, False, True, True, False, False]])
+def test_batched_step_matches_sequential_updates(dones):
+    states = np.array([0, 1, 1, 2, 1, 3])
+    actions = np.array([2, 0, 0, 1, 0, 3])
+    rewards = np.array([-1.0, 5.0, 5.0, -10.0, 5.0, 0.5])
+    next_states = np.array([7, 8, 8, 9, 8, 10])
+    dones = np.array(dones)
+    dones[[1, 2, 4]] = dones[1]
+
+    Q_batched = random_q()
+    Q_sequential = Q_batched.copy()
+    update_q_values(Q_batched, states, actions, rewards, next_states, dones, ALPHA, GAMMA)
+    for s, a, r, s_next, done in zip(states, actions, rewards, next_states, dones):
+        update_q_value(Q_sequential, s, a, r, s_next, ALPHA, GAMMA, done)
+
+    np.testing.assert_allclose(Q_batched, Q_sequential)
+
+
+# Terminierte Übergänge bootstrappen in beiden Pfaden nicht
+def test_terminal_transition_ignores_next_state():
+    Q_scalar = random_q()
+    Q_batched = Q_scalar.copy()
+    expected = Q_scalar[4, 1] + ALPHA * (10.0 - Q_scalar[4, 1])
+
+    update_q_value(Q_scalar, 4, 1, 10.0, 5, ALPHA, GAMMA, done=True)
+    update_q_values(Q_batched, np.array([4]), np.array([1]), np.array([10.0]), np.array([5]),
+                    np.array([True]), ALPHA, GAMMA)
+
+    assert Q_scalar[4, 1] == pytest.approx(expected)
+    assert Q_batched[4, 1] == pytest.approx(expected)
@@ -0,0 +1,74 @@
+# test_rendering.py
+
+# ============================================================================
+# Imports
+# ============================================================================
+
+import os
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+pygame = pytest.importorskip("pygame")
+
+from config import N_ACTIONS
+from utils.qlearning import compile_policy
+from utils.rendering import GridRenderer, AGENT_SYMBOL
+
+
+GRID_SIZE = 5
+CELL_SIZE = 40
+LAYOUT = SimpleNamespace(start_pos=(0, 0), goal_pos=(4, 4), obstacles=[(1, 1), (2, 3), (3, 1)])
+# Weg über Start, Hindernis und Ziel (Landmarken-Zellen)
+PATH = [(0, 0), (0, 1), (1, 1), (2, 1), (2, 2), (2, 3), (3, 3), (4, 3), (4, 4)]
+
+
+# ============================================================================
+# Hilfsfunktionen
+# ============================================================================
+
+def make_renderer():
+    return GridRenderer(GRID_SIZE, cell_size=CELL_SIZE, font_size=20)
+
+
+# Vollständig neu gezeichneter Frame für die Agentenposition pos
+def full_frame(policy, pos):
+    surface = pygame.Surface((GRID_SIZE * CELL_SIZE,) * 2)
+    make_renderer().draw(surface, LAYOUT, policy, [pos])
+    return pygame.surfarray.array3d(surface)
+
+
+# ============================================================================
+# Dirty-Rect-Zeichnen
+# ============================================================================
+
+# Inkrementelle Frames entsprechen vollständig neu gezeichneten Frames
+def test_incremental_frames_match_full_redraw():
+    policy = compile_policy(np.random.default_rng(0).standard_normal((GRID_SIZE * GRID_SIZE, N_ACTIONS)))
+    renderer = make_renderer()
+    surface = pygame.Surface((GRID_SIZE * CELL_SIZE,) * 2)
+
+    for pos in PATH:
+        renderer.draw(surface, LAYOUT, policy, [pos])
+        assert np.array_equal(pygame.surfarray.array3d(surface), full_frame(policy, pos))
+
+
+# Auf einer Landmarke zeigt die Agentenzelle nur das Schiff auf leerer Zelle
+@pytest.mark.parametrize("pos", [(0, 0), (1, 1), (4, 4)])
+def test_agent_cell_hides_landmark(pos):
+    policy = compile_policy(np.zeros((GRID_SIZE * GRID_SIZE, N_ACTIONS)))
+    renderer = make_renderer()
+    surface = pygame.Surface((GRID_SIZE * CELL_SIZE,) * 2)
+    renderer.draw(surface, LAYOUT, policy, [(2, 2)])
+    dirty = renderer.draw(surface, LAYOUT, policy, [pos])
+
+    expected = renderer.empty_cell.copy()
+    glyph = renderer.glyphs[AGENT_SYMBOL]
+    expected.blit(glyph, glyph.get_rect(center=expected.get_rect().center))
+
+    rect = renderer.cell_rect(pos)
+    assert rect in dirty
+    assert np.array_equal(pygame.surfarray.array3d(surface.subsurface(rect)),
+                          pygame.surfarray.array3d(expected))